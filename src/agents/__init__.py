@@ -1,7 +1,9 @@
 """Agent orchestration and execution"""
 
+from .approvals import ApprovalQueue
 from .context_manager import ContextManager
 from .core_agent import CoreAgent
+from .memory_store import MemoryStore
 from .skills_manager import SkillsManager
 
-__all__ = ["CoreAgent", "SkillsManager", "ContextManager"]
+__all__ = ["CoreAgent", "SkillsManager", "ContextManager", "MemoryStore", "ApprovalQueue"]
@@ -0,0 +1,266 @@
+"""Human approval gate for sensitive MCP actions"""
+
+import json
+import logging
+import math
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from ..config import get_settings, get_vault_path
+from ..extraction import ExtractionPipeline
+from ..mcp_servers import EmailMCPServer, FileMCPServer, MCPServer
+from .memory_store import MemoryStore
+
+logger = logging.getLogger(__name__)
+
+# Memory store namespace holding one parked continuation per pending approval
+APPROVALS_NAMESPACE = "approvals"
+NOTE_PREFIX = "APPROVAL_"
+
+
+class ApprovalQueue:
+    """Parks sensitive actions until a human approves or rejects them in the vault
+
+    ``park`` stores the request as a serialized continuation (server name plus
+    request payload) in the memory store, writes an approval note to
+    ``Pending_Approval/`` and returns immediately, so nothing waits on the
+    human. Moving the note to ``Approved/`` or ``Rejected/`` records the
+    decision; ``check_decisions`` notices it and resumes the continuation
+    through the server's circuit breaker. Checking costs one ``stat`` per
+    decision folder while nothing moves, however many approvals are pending.
+    """
+
+    def __init__(self, memory: MemoryStore, vault_path: Path | None = None):
+        self.settings = get_settings()
+        self.memory = memory
+        self.vault_path = vault_path or get_vault_path()
+        self.pending_path = self.vault_path / "Pending_Approval"
+        self.approved_path = self.vault_path / "Approved"
+        self.rejected_path = self.vault_path / "Rejected"
+        self.done_path = self.vault_path / "Done"
+        for path in (self.pending_path, self.approved_path, self.rejected_path, self.done_path):
+            path.mkdir(parents=True, exist_ok=True)
+
+        self.servers: dict[str, MCPServer] = {}
+        self._folder_mtimes: dict[Path, int] = {}
+        self._next_expiry = math.inf
+
+    def register(self, server: MCPServer) -> None:
+        """Route a server's sensitive actions through this queue"""
+        self.servers[server.name] = server
+        server.approvals = self
+
+    def pending(self) -> dict[str, dict[str, Any]]:
+        """Parked continuations by approval id"""
+        return self.memory.get_namespace(APPROVALS_NAMESPACE)
+
+    async def park(self, server_name: str, request: dict[str, Any]) -> dict[str, Any]:
+        """Park a request for approval and return without waiting for the decision"""
+        now = datetime.now()
+        approval_id = f"{now.strftime('%Y%m%dT%H%M%S')}_{uuid.uuid4().hex[:8]}"
+        expires = now + timedelta(hours=self.settings.approval_timeout_hours)
+        continuation = {
+            "server": server_name,
+            "request": request,
+            "created": now.isoformat(),
+            "expires": expires.isoformat(),
+            "expires_at": time.time() + (expires - now).total_seconds(),
+        }
+        try:
+            self.memory.set(APPROVALS_NAMESPACE, approval_id, continuation)
+            note = self._note_path(self.pending_path, approval_id)
+            with open(note, "w", encoding="utf-8") as f:
+                f.write(self._render_note(approval_id, continuation, status="pending"))
+        except Exception as e:
+            logger.error(f"Failed to park action for approval: {e}")
+            self.memory.delete(APPROVALS_NAMESPACE, approval_id)
+            return {"status": "error", "error": str(e)}
+
+        self._next_expiry = min(self._next_expiry, continuation["expires_at"])
+        logger.info(f"{server_name} action {request.get('action')} awaiting approval: {note.name}")
+        return {"status": "pending_approval", "approval_id": approval_id, "note": str(note)}
+
+    @staticmethod
+    def _note_path(folder: Path, approval_id: str) -> Path:
+        return folder / f"{NOTE_PREFIX}{approval_id}.md"
+
+    def _render_note(
+        self,
+        approval_id: str,
+        continuation: dict[str, Any],
+        status: str,
+        outcome: dict[str, Any] | None = None,
+    ) -> str:
+        request = continuation["request"]
+        action = request.get("action", "unknown")
+        lines = [
+            "---",
+            "type: approval_request",
+            f"approval_id: {approval_id}",
+            f"action: {action}",
+            f"server: {continuation['server']}",
+            f"created: {continuation['created']}",
+            f"expires: {continuation['expires']}",
+            f"status: {status}",
+            "---",
+            "",
+            f"# Approval: {action}",
+            "",
+            "## Details",
+            "",
+        ]
+        for key, value in request.items():
+            if key == "action":
+                continue
+            rendered = value if isinstance(value, str) else json.dumps(value)
+            if "\n" in rendered:
+                lines.extend([f"**{key}**:", "", "```", rendered, "```", ""])
+            else:
+                lines.extend([f"**{key}**: {rendered}", ""])
+
+        if outcome is None:
+            lines.extend([
+                "## To Approve",
+                "",
+                "Move this file to `/Approved` folder.",
+                "",
+                "## To Reject",
+                "",
+                "Move this file to `/Rejected` folder.",
+                "",
+            ])
+        else:
+            lines.extend([
+                "## Outcome",
+                "",
+                f"**Resolved**: {datetime.now().isoformat()}",
+                "",
+                f"**Result**: {json.dumps(outcome)}",
+                "",
+            ])
+        return "\n".join(lines)
+
+    def _folder_changed(self, folder: Path) -> bool:
+        """Whether notes were added to or removed from ``folder`` since the last look"""
+        try:
+            mtime = folder.stat().st_mtime_ns
+        except OSError:
+            return False
+        if self._folder_mtimes.get(folder) == mtime:
+            return False
+        # Recorded before the caller lists the folder, so a note arriving mid-scan
+        # bumps the mtime again and is picked up next time
+        self._folder_mtimes[folder] = mtime
+        return True
+
+    def _changed_notes(self, folder: Path) -> list[Path]:
+        if not self._folder_changed(folder):
+            return []
+        # The continuation may have been parked by another process moments ago
+        self.memory.refresh()
+        return sorted(folder.glob(f"{NOTE_PREFIX}*.md"))
+
+    async def check_decisions(self) -> int:
+        """Resume approved actions, drop rejected or expired ones; return how many resolved"""
+        resolved = 0
+        for folder, approved in ((self.approved_path, True), (self.rejected_path, False)):
+            for note in self._changed_notes(folder):
+                approval_id = note.stem[len(NOTE_PREFIX):]
+                continuation = self.memory.get(APPROVALS_NAMESPACE, approval_id)
+                if continuation is None:
+                    logger.debug(f"No pending action for approval note {note.name}")
+                    continue
+                server = self.servers.get(continuation["server"])
+                if approved and server is not None and not server.breaker.available:
+                    # Leave it approved and look at the folder again on the next check
+                    self._folder_mtimes.pop(folder, None)
+                    continue
+                await self._resolve(approval_id, continuation, note, approved)
+                resolved += 1
+
+        # Another process may have parked actions with earlier deadlines
+        if self._folder_changed(self.pending_path):
+            self.memory.refresh()
+            self._refresh_expiry()
+        if time.time() >= self._next_expiry:
+            resolved += await self._expire()
+        return resolved
+
+    async def _expire(self) -> int:
+        """Auto-reject approvals that have waited past their deadline"""
+        now = time.time()
+        expired = 0
+        upcoming = []
+        for approval_id, continuation in self.pending().items():
+            if continuation["expires_at"] > now:
+                upcoming.append(continuation["expires_at"])
+                continue
+            note = self._note_path(self.pending_path, approval_id)
+            await self._resolve(approval_id, continuation, note, approved=False, reason="expired")
+            expired += 1
+        self._next_expiry = min(upcoming, default=math.inf)
+        return expired
+
+    async def _resolve(
+        self,
+        approval_id: str,
+        continuation: dict[str, Any],
+        note: Path,
+        approved: bool,
+        reason: str = "rejected",
+    ) -> None:
+        # Drop the continuation first so a crash mid-resume never runs the action twice
+        self.memory.delete(APPROVALS_NAMESPACE, approval_id)
+        request = continuation["request"]
+
+        if approved:
+            server = self.servers.get(continuation["server"])
+            if server is None:
+                outcome = {"status": "error", "error": f"Unknown server: {continuation['server']}"}
+            else:
+                try:
+                    outcome = await server.call(request)
+                except Exception as e:
+                    outcome = {"status": "error", "error": str(e)}
+            status = "executed" if outcome.get("status") == "success" else "failed"
+            logger.info(f"Approved action {request.get('action')} {status}: {approval_id}")
+        else:
+            outcome = {"status": reason}
+            status = reason
+            logger.info(f"Action {request.get('action')} {reason}: {approval_id}")
+
+        archive = self.done_path / datetime.now().strftime("%Y-%m")
+        try:
+            archive.mkdir(parents=True, exist_ok=True)
+            with open(self._note_path(archive, approval_id), "w", encoding="utf-8") as f:
+                f.write(self._render_note(approval_id, continuation, status, outcome))
+            note.unlink(missing_ok=True)
+        except OSError as e:
+            logger.error(f"Failed to archive approval note {note.name}: {e}")
+
+    def _refresh_expiry(self) -> int:
+        pending = self.pending()
+        self._next_expiry = min((c["expires_at"] for c in pending.values()), default=math.inf)
+        return len(pending)
+
+    def load(self) -> int:
+        """Pick up continuations parked before a restart; return how many are pending"""
+        count = self._refresh_expiry()
+        if count:
+            logger.info(f"{count} action(s) awaiting approval")
+        return count
+
+
+def create_action_servers(
+    approvals: ApprovalQueue, extraction: ExtractionPipeline | None = None
+) -> dict[str, MCPServer]:
+    """Build the agent's MCP servers with sensitive actions gated by ``approvals``"""
+    servers: dict[str, MCPServer] = {
+        server.name: server for server in (EmailMCPServer(), FileMCPServer(extraction))
+    }
+    for server in servers.values():
+        approvals.register(server)
+    return servers
@@ -4,9 +4,11 @@ import json
 import logging
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any
 
-from ..config import get_vault_path
+from ..config import get_data_path, get_vault_path
+from .memory_store import MemoryStore
+from .vault_cache import VaultCache, get_vault_cache
 
 logger = logging.getLogger(__name__)
 
@@ -14,11 +16,13 @@ logger = logging.getLogger(__name__)
 class ContextManager:
     """Manages agent context, memory, and Obsidian vault integration"""
 
-    def __init__(self):
+    def __init__(self, cache: VaultCache | None = None):
+        self.cache = cache or get_vault_cache()
         self.vault_path = get_vault_path()
         self.memory_path = self.vault_path / "Memory"
         self.brain_path = self.vault_path / "Brain"
         self._ensure_vault_structure()
+        self.memory = MemoryStore(get_data_path() / "memory.db")
 
     def _ensure_vault_structure(self) -> None:
         """Ensure Obsidian vault directories exist"""
@@ -29,35 +33,66 @@ class ContextManager:
         logger.info(f"Vault structure ready at {self.vault_path}")
 
     def load_context(self, context_name: str) -> dict[str, Any]:
-        """Load context from Memory directory"""
-        context_file = self.memory_path / f"{context_name}.md"
-        if not context_file.exists():
-            logger.warning(f"Context file not found: {context_file}")
+        """Load context from the memory store"""
+        data = self.memory.get_namespace(context_name)
+        if not data:
+            data = self._import_legacy_context(context_name)
+        if not data:
+            logger.warning(f"Context not found: {context_name}")
+            return {}
+        return {
+            "name": context_name,
+            "data": data,
+            "content": self.memory.render_markdown(context_name),
+        }
+
+    def _import_legacy_context(self, context_name: str) -> dict[str, Any]:
+        """Import a ``Memory/<name>.md`` note written as a header plus a JSON dump"""
+        doc = self.cache.get(self.memory_path / f"{context_name}.md")
+        if doc is None:
             return {}
-
         try:
-            with open(context_file, "r", encoding="utf-8") as f:
-                content = f.read()
-            return {"name": context_name, "content": content}
-        except Exception as e:
-            logger.error(f"Failed to load context: {e}")
+            start = doc.text.find("{")
+            data = json.loads(doc.text[start:]) if start != -1 else None
+        except ValueError as e:
+            logger.error(f"Failed to import legacy context {context_name}: {e}")
             return {}
+        if not isinstance(data, dict):
+            return {}
+        self.memory.replace(context_name, data)
+        logger.info(f"Imported legacy context into memory store: {context_name}")
+        return data
+
+    def get_fact(self, context_name: str, key: str, default: Any = None) -> Any:
+        """Read a single field of a context"""
+        return self.memory.get(context_name, key, default)
 
     def save_context(self, context_name: str, data: dict[str, Any]) -> bool:
-        """Save context to Memory directory"""
+        """Replace a context in the memory store and export it to the Memory directory"""
         try:
-            context_file = self.memory_path / f"{context_name}.md"
-            with open(context_file, "w", encoding="utf-8") as f:
-                f.write(f"# {context_name}\n\n")
-                f.write(f"Updated: {datetime.now().isoformat()}\n\n")
-                f.write(json.dumps(data, indent=2))
-
+            self.memory.replace(context_name, data)
+            self._export(context_name)
             logger.info(f"Context saved: {context_name}")
             return True
         except Exception as e:
             logger.error(f"Failed to save context: {e}")
             return False
 
+    def update_context(self, context_name: str, fields: dict[str, Any]) -> bool:
+        """Update some fields of a context without rewriting the others"""
+        try:
+            self.memory.update(context_name, fields)
+            self._export(context_name)
+            logger.info(f"Context updated: {context_name} ({', '.join(fields)})")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to update context: {e}")
+            return False
+
+    def _export(self, context_name: str) -> None:
+        path = self.memory.export_markdown(context_name, self.memory_path)
+        self.cache.invalidate(path)
+
     def log_decision(self, decision: str, reasoning: str) -> bool:
         """Log agent decision to Brain directory"""
         try:
@@ -69,6 +104,7 @@ class ContextManager:
                 f.write(f"**Time**: {timestamp}\n\n")
                 f.write(f"**Decision**: {decision}\n\n")
                 f.write(f"**Reasoning**:\n{reasoning}\n")
+            self.cache.invalidate(log_file)
 
             logger.info(f"Decision logged: {decision}")
             return True
@@ -80,11 +116,13 @@ class ContextManager:
         """Get recent agent decisions from Brain directory"""
         decisions = []
         try:
-            for log_file in sorted(
-                self.brain_path.glob("decision_*.md"), reverse=True
-            )[:limit]:
-                with open(log_file, "r", encoding="utf-8") as f:
-                    decisions.append({"file": log_file.name, "content": f.read()})
+            log_files = self.cache.list_notes(self.brain_path, "decision_*.md")
+            for log_file in reversed(log_files[-limit:] if limit > 0 else []):
+                doc = self.cache.get(log_file)
+                if doc is not None:
+                    decisions.append(
+                        {"file": log_file.name, "content": doc.text, "fields": doc.fields}
+                    )
         except Exception as e:
             logger.error(f"Failed to retrieve decisions: {e}")
 
@@ -3,19 +3,50 @@
 import asyncio
 import logging
 import re
+from pathlib import Path
 from typing import Any, Optional
 from datetime import datetime, timedelta
 
 import google.genai as genai # pyright: ignore[reportMissingImports]
+from google.genai import types  # pyright: ignore[reportMissingImports]
 from google.api_core import exceptions
 
+from ..circuit_breaker import CircuitBreaker, CircuitOpenError, CircuitState
 from ..config import get_settings
-from ..watchers import FileSystemWatcher, GmailWatcher, WhatsAppWatcher
+from ..events import EventConsumer, open_event_log
+from ..extraction import ExtractionPipeline
+from ..watchers import (
+    ApprovalWatcher,
+    FileSystemWatcher,
+    GmailWatcher,
+    VaultWatcher,
+    WatcherRuntime,
+    WhatsAppWatcher,
+)
+from .approvals import ApprovalQueue, create_action_servers
 from .context_manager import ContextManager
+from .load_shedder import LoadShedder, ShedDecision
+from .prompt_builder import PromptBuilder
 from .skills_manager import SkillsManager
+from .vault_cache import get_vault_cache
 
 logger = logging.getLogger(__name__)
 
+# Default Gemini quota (adjust based on your tier); shared by all worker processes
+RATE_LIMIT_PER_MINUTE = 5  # Conservative for free tier
+RATE_LIMIT_PER_DAY = 100  # Adjust based on your quota
+
+DOCUMENT_SUMMARY_PROMPT = """You are summarising {name} ({format}) one part at a time.
+
+Summary so far:
+{summary}
+
+Part {index} of {total}:
+{chunk}
+
+Rewrite the summary to cover everything so far in at most {limit} characters. Keep names,
+dates, amounts and requested actions. Reply with the summary only."""
+
 
 class RateLimiter:
     """Rate limiter to prevent exceeding API quotas"""
@@ -59,35 +90,86 @@ class RateLimiter:
 class CoreAgent:
     """Main agent orchestrator with Gemini AI"""
 
-    def __init__(self):
+    def __init__(
+        self,
+        client: Any | None = None,
+        rate_limiter: RateLimiter | None = None,
+        durable_events: bool = True,
+    ):
         self.settings = get_settings()
-        self.client = genai.Client(api_key=self.settings.gemini_api_key)
-        self.context_manager = ContextManager()
-        self.skills_manager = SkillsManager()
+        # Any object exposing ``models.generate_content`` works here (e.g. the benchmark stub)
+        self.client = client if client is not None else genai.Client(
+            api_key=self.settings.gemini_api_key
+        )
+        self.vault_cache = get_vault_cache()
+        self.context_manager = ContextManager(self.vault_cache)
+        self.skills_manager = SkillsManager(self.vault_cache)
+        self.prompt_builder = PromptBuilder(self.skills_manager)
 
         # Initialize rate limiter (adjust limits based on your tier)
-        self.rate_limiter = RateLimiter(
-            max_requests_per_minute=5,   # Conservative for free tier
-            max_requests_per_day=100     # Adjust based on your quota
+        self.rate_limiter = rate_limiter or RateLimiter(
+            max_requests_per_minute=RATE_LIMIT_PER_MINUTE,
+            max_requests_per_day=RATE_LIMIT_PER_DAY,
         )
 
+        # Fail fast while Gemini is unavailable and shed or defer events under load
+        self.llm_breaker = CircuitBreaker("gemini")
+        self.load_shedder = LoadShedder(self.context_manager.memory)
+
+        # Document text extraction; large documents are summarised chunk by chunk
+        self.extraction = ExtractionPipeline()
+
+        # MCP servers for actions; sensitive ones are parked until a human approves
+        self.approvals = ApprovalQueue(self.context_manager.memory)
+        self.mcp_servers = create_action_servers(self.approvals, self.extraction)
+
         # Initialize watchers
         self.gmail_watcher = GmailWatcher()
         self.whatsapp_watcher = WhatsAppWatcher()
-        self.fs_watcher = FileSystemWatcher()
+        self.fs_watcher = FileSystemWatcher(self.extraction)
+        self.vault_watcher = VaultWatcher(self.vault_cache)
+        self.approval_watcher = ApprovalWatcher(self.approvals)
+        self.watcher_runtime = WatcherRuntime(
+            [
+                self.gmail_watcher,
+                self.whatsapp_watcher,
+                self.fs_watcher,
+                self.vault_watcher,
+                self.approval_watcher,
+            ]
+        )
+
+        # Durable event log: watcher events are appended here before dispatch.
+        # Worker processes skip it because the supervisor owns the log.
+        self.event_log = open_event_log() if durable_events else None
+        self.event_consumer = EventConsumer(self.event_log, "agent") if durable_events else None
+        self.event_queue: asyncio.Queue[tuple[int, dict[str, Any]]] = asyncio.Queue()
+        if durable_events:
+            for watcher in (self.gmail_watcher, self.whatsapp_watcher, self.fs_watcher):
+                watcher.on_event = self.submit_event
 
         self.is_running = False
         self.conversation_history: list[dict[str, str]] = []
 
+        # Pauses used by the retry paths (seconds); benchmarks and replays set these to 0
+        self.retry_base_delay = 20.0
+        self.loop_delay = 1.0
+        self.error_delay = 5.0
+
     async def _call_gemini_with_retry(
         self,
         prompt: str,
         max_retries: int = 3,
-        base_delay: float = 20.0
+        base_delay: float | None = None,
+        cached_content: str | None = None,
     ) -> Optional[str]:
         """Call Gemini API with exponential backoff retry logic"""
-        
+        if base_delay is None:
+            base_delay = self.retry_base_delay
+
         for attempt in range(max_retries):
+            # Raises CircuitOpenError without touching the quota while Gemini is down
+            self.llm_breaker.before_call()
             try:
                 # Wait for rate limiter
                 await self.rate_limiter.acquire()
@@ -95,14 +177,21 @@ class CoreAgent:
                 # Make the API call
                 response = await asyncio.to_thread(
                     self.client.models.generate_content,
-                    model="gemini-2.5-flash",
-                    contents=prompt
+                    model=self.settings.gemini_model,
+                    contents=prompt,
+                    config=(
+                        types.GenerateContentConfig(cached_content=cached_content)
+                        if cached_content
+                        else None
+                    ),
                 )
+                self.llm_breaker.record_success()
                 
                 return response.text
                 
             except exceptions.ResourceExhausted as e:
                 error_msg = str(e)
+                self.llm_breaker.record_failure()
                 
                 # Extract retry delay from error if available
                 match = re.search(r'retry in ([\d.]+)s', error_msg)
@@ -111,6 +200,12 @@ class CoreAgent:
                     delay = max(suggested_delay, base_delay * (2 ** attempt))
                 else:
                     delay = base_delay * (2 ** attempt)
+
+                # Don't sit on an event for a long quota window: open the circuit instead
+                if delay > self.settings.llm_max_retry_delay:
+                    self.llm_breaker.trip(delay)
+                if not self.llm_breaker.available:
+                    raise self.llm_breaker.open_error() from e
                 
                 if attempt < max_retries - 1:
                     logger.warning(
@@ -127,6 +222,9 @@ class CoreAgent:
             
             except Exception as e:
                 logger.error(f"Unexpected error calling Gemini: {e}")
+                self.llm_breaker.record_failure()
+                if not self.llm_breaker.available:
+                    raise self.llm_breaker.open_error() from e
                 if attempt < max_retries - 1:
                     delay = base_delay * (2 ** attempt)
                     logger.info(f"Retrying in {delay:.1f}s...")
@@ -160,38 +258,45 @@ class CoreAgent:
         """Use Gemini for reasoning about a task"""
         logger.info(f"Agent thinking about: {task}")
 
-        self.conversation_history.append({"role": "user", "content": task})
+        # The turn joins the history only once it is answered, so a deferred task
+        # leaves no trace and concurrent calls never remove each other's turns
+        turn = {"role": "user", "content": task}
 
+        cache_name = None
         try:
-            system_prompt = f"""You are {self.settings.agent_name}, a {self.settings.agent_role}.
-You work autonomously to handle personal and business tasks.
-Be concise, actionable, and proactive.
-Available skills: {', '.join(self.skills_manager.list_available_skills())}"""
-
-            # Format conversation for Gemini
-            conversation_text = "\n".join(
-                [f"{msg['role']}: {msg['content']}" for msg in self.conversation_history]
+            # The static prefix is served from a context cache when one is available
+            cache_name = await self.prompt_builder.context_cache(
+                self.client, self.settings.gemini_model
             )
+            if cache_name:
+                prompt = self.prompt_builder.build_suffix(self.conversation_history, turn)
+            else:
+                prompt = self.prompt_builder.build(self.conversation_history, turn)
 
-            full_prompt = f"{system_prompt}\n\nConversation:\n{conversation_text}"
-            
             # Use retry-enabled API call
-            assistant_message = await self._call_gemini_with_retry(full_prompt)
+            assistant_message = await self._call_gemini_with_retry(
+                prompt, cached_content=cache_name
+            )
             
             if not assistant_message:
                 assistant_message = "Unable to process due to API limits. Please try again later."
             
-            self.conversation_history.append(
-                {"role": "assistant", "content": assistant_message}
+            self.conversation_history.extend(
+                [turn, {"role": "assistant", "content": assistant_message}]
             )
 
             return assistant_message
-            
+
+        except CircuitOpenError:
+            # Nothing was answered; let the caller defer the task
+            raise
         except Exception as e:
             logger.error(f"Error during reasoning: {e}")
+            if cache_name:
+                self.prompt_builder.invalidate_context_cache()
             error_message = f"Error: {e}"
-            self.conversation_history.append(
-                {"role": "assistant", "content": error_message}
+            self.conversation_history.extend(
+                [turn, {"role": "assistant", "content": error_message}]
             )
             return error_message
 
@@ -218,16 +323,61 @@ Available skills: {', '.join(self.skills_manager.list_available_skills())}"""
                     logger.info(f"Task completed: {task}")
                     break
 
-                await asyncio.sleep(1)
-                
+                await asyncio.sleep(self.loop_delay)
+
+            except CircuitOpenError:
+                raise
             except Exception as e:
                 logger.error(f"Error in Ralph Wiggum loop: {e}")
                 # Continue to next attempt instead of crashing
-                await asyncio.sleep(5)
+                await asyncio.sleep(self.error_delay)
 
         if attempt >= max_retries:
             logger.warning(f"Task did not complete within {max_retries} attempts: {task}")
 
+    async def summarize_document(self, digest: str, name: str) -> str | None:
+        """Summarise an extracted document chunk by chunk; None if the excerpt is enough
+
+        Each prompt holds one chunk plus the running summary, so prompt size is
+        bounded by ``extraction_chunk_chars`` whatever the document size. At
+        most ``extraction_summary_chunks`` calls are spent per document, and
+        never more than one minute's quota less one call for the task itself,
+        so a long document can't hold up the queue behind the rate limiter.
+        Summaries are cached by content digest.
+        """
+        document = self.extraction.get(digest)
+        if document is None or document.chars <= self.settings.extraction_excerpt_chars:
+            return None
+        if document.summary is not None:
+            return document.summary
+
+        limit = self.settings.extraction_summary_chars
+        max_chunks = min(
+            self.settings.extraction_summary_chunks,
+            max(1, self.rate_limiter.max_per_minute - 1),
+        )
+        summary = ""
+        for index, chunk in enumerate(self.extraction.iter_chunks(digest), 1):
+            if index > max_chunks:
+                summary += f"\n(Parts {index}-{document.chunks} were not summarised.)"
+                break
+            prompt = DOCUMENT_SUMMARY_PROMPT.format(
+                name=name,
+                format=document.format,
+                summary=summary or "(nothing yet)",
+                index=index,
+                total=document.chunks,
+                chunk=chunk,
+                limit=limit,
+            )
+            summary = ((await self._call_gemini_with_retry(prompt)) or summary)[:limit]
+
+        if document.truncated:
+            summary += f"\n(Only the first {document.chars} characters were extracted.)"
+        self.extraction.set_summary(digest, summary)
+        logger.info(f"Summarised {name} from {document.chunks} chunk(s)")
+        return summary
+
     async def process_event(self, event: dict[str, Any]) -> None:
         """Process an incoming event from watchers"""
         event_type = event.get("type")
@@ -235,11 +385,114 @@ Available skills: {', '.join(self.skills_manager.list_available_skills())}"""
 
         logger.info(f"Processing event: {event_type}")
 
+        if "document" in event_data and "digest" in event_data:
+            # Large documents reach the prompt as a summary, never as full text
+            name = Path(event_data.get("path", "document")).name
+            try:
+                summary = await self.summarize_document(event_data["digest"], name)
+            except CircuitOpenError:
+                raise
+            except Exception as e:
+                # The excerpt still gives the task something to work with
+                logger.error(f"Could not summarise {name}, using its excerpt: {e}")
+                summary = None
+            if summary is not None:
+                event_data = {k: v for k, v in event_data.items() if k != "excerpt"}
+                event_data["summary"] = summary
+
         task_description = f"Handle {event_type} event: {event_data}"
         await self.ralph_wiggum_loop(task_description, max_retries=3)
 
+    async def handle_event(self, event: dict[str, Any], backlog: int = 0) -> ShedDecision:
+        """Process, defer or drop an event depending on load; return what was done"""
+        decision = self.load_shedder.decide(event, backlog, self.llm_breaker.state)
+        if decision is ShedDecision.PROCESS:
+            try:
+                await self.process_event(event)
+            except CircuitOpenError as e:
+                self.load_shedder.defer(event, reason=str(e))
+                decision = ShedDecision.DEFER
+        elif decision is ShedDecision.DEFER:
+            reason = f"backlog {backlog}, gemini circuit {self.llm_breaker.state.value}"
+            self.load_shedder.defer(event, reason=reason)
+        elif decision is ShedDecision.DROP:
+            logger.warning(
+                f"Dropped {event.get('source')} {event.get('type')} event (backlog {backlog})"
+            )
+        self.load_shedder.record(decision)
+        return decision
+
+    async def resume_deferred(self) -> int:
+        """Re-queue deferred events once the queue is empty and Gemini is reachable"""
+        if self.event_log is None:
+            # Without a log there is nowhere to re-queue to; the supervisor does it
+            return 0
+        if not self.event_queue.empty() or not self.llm_breaker.available:
+            return 0
+        # A half-open circuit gets a single event as its probe
+        closed = self.llm_breaker.state is CircuitState.CLOSED
+        events = self.load_shedder.take_deferred(self.settings.shed_resume_batch if closed else 1)
+        for event in events:
+            await self.submit_event(event)
+        if events:
+            logger.info(f"Re-queued {len(events)} deferred event(s)")
+        return len(events)
+
+    async def execute_action(self, server_name: str, request: dict[str, Any]) -> dict[str, Any]:
+        """Run an MCP action; sensitive ones return ``pending_approval`` immediately"""
+        server = self.mcp_servers.get(server_name)
+        if server is None:
+            return {"status": "error", "error": f"Unknown MCP server: {server_name}"}
+        return await server.submit(request)
+
+    async def submit_event(self, event: dict[str, Any]) -> int:
+        """Durably log a watcher event, then queue it for processing"""
+        if self.event_log is None:
+            raise ValueError("submit_event needs an agent created with durable_events=True")
+        if event.get("type") == "file_change" and "path" in event.get("data", {}):
+            # The watched directories may be inside the vault
+            self.vault_cache.invalidate(event["data"]["path"])
+        offset = self.event_log.append(event)
+        await self.event_queue.put((offset, event))
+        return offset
+
+    def _requeue_pending_events(self) -> int:
+        """Queue events logged but not acknowledged before the last shutdown"""
+        count = 0
+        for offset, event in self.event_consumer.pending():
+            self.event_queue.put_nowait((offset, event))
+            count += 1
+        if count:
+            logger.info(f"Redelivering {count} unacknowledged event(s) from the event log")
+        return count
+
+    async def _consume_events(self) -> None:
+        """Process logged events in order and acknowledge each once handled"""
+        while self.is_running:
+            offset, event = await self.event_queue.get()
+            try:
+                if self.event_consumer.is_duplicate(event):
+                    logger.info(f"Skipping already processed event at offset {offset}")
+                    self.event_consumer.ack(offset, event)
+                elif await self.handle_event(event, self.event_queue.qsize()) is ShedDecision.DEFER:
+                    # Not marked as processed: it runs when re-queued from Needs_Action
+                    self.event_consumer.ack(offset)
+                else:
+                    self.event_consumer.ack(offset, event)
+            except Exception as e:
+                logger.error(f"Failed to process event at offset {offset}: {e}")
+                if self.event_consumer.fail(offset, event, str(e)):
+                    self.event_queue.put_nowait((offset, event))
+            finally:
+                self.event_queue.task_done()
+
     async def run(self) -> None:
         """Main agent loop"""
+        if self.event_log is None:
+            raise ValueError(
+                "run() needs an agent created with durable_events=True; "
+                "worker agents are driven through handle_event"
+            )
         if not await self.initialize():
             logger.error("Agent initialization failed")
             return
@@ -247,28 +500,35 @@ Available skills: {', '.join(self.skills_manager.list_available_skills())}"""
         self.is_running = True
         logger.info(f"{self.settings.agent_name} started")
 
-        # Start watchers
-        watcher_tasks = [
-            asyncio.create_task(self.gmail_watcher.watch()),
-            asyncio.create_task(self.whatsapp_watcher.watch()),
-            asyncio.create_task(self.fs_watcher.watch()),
-        ]
+        for server in self.mcp_servers.values():
+            await server.start()
+        self._requeue_pending_events()
+        consumer_task = asyncio.create_task(self._consume_events())
+
+        # All watchers share one scheduler task
+        watcher_task = asyncio.create_task(self.watcher_runtime.run())
 
         try:
             # Keep agent running
             while self.is_running:
                 await asyncio.sleep(1)
+                await asyncio.to_thread(self.event_log.sync)
+                await asyncio.to_thread(self.event_consumer.trim_log)
+                await self.resume_deferred()
         except KeyboardInterrupt:
             logger.info("Agent interrupted by user")
         finally:
             self.stop()
-            for task in watcher_tasks:
-                task.cancel()
+            watcher_task.cancel()
+            consumer_task.cancel()
+            self.event_consumer.close()
+            self.event_log.close()
 
     def stop(self) -> None:
         """Stop the agent"""
         self.is_running = False
-        self.gmail_watcher.stop()
-        self.whatsapp_watcher.stop()
-        self.fs_watcher.stop()
+        self.watcher_runtime.stop()
+        for server in self.mcp_servers.values():
+            server.stop()
+        self.extraction.close()
         logger.info(f"{self.settings.agent_name} stopped")
\ No newline at end of file
@@ -0,0 +1,210 @@
+"""Backlog-aware load shedding with deferral to the Needs_Action folder"""
+
+import logging
+import re
+from datetime import datetime
+from enum import Enum, IntEnum
+from pathlib import Path
+from typing import Any
+
+from ..circuit_breaker import CircuitState
+from ..config import get_settings, get_vault_path
+from ..events import idempotency_key
+from .memory_store import MemoryStore
+
+logger = logging.getLogger(__name__)
+
+# Memory store namespace: Needs_Action note name -> deferred events it stands for
+DEFERRED_NAMESPACE = "deferred_events"
+NOTE_FIELD_CHARS = 500
+
+
+class Priority(IntEnum):
+    LOW = 0
+    NORMAL = 1
+    HIGH = 2
+
+
+class ShedDecision(str, Enum):
+    PROCESS = "process"
+    DEFER = "defer"
+    DROP = "drop"
+    SKIP = "skip"
+
+
+def parse_priorities(spec: str) -> dict[str, Priority]:
+    """Parse ``"gmail=high,filesystem:file_change=low"`` into a lookup table"""
+    priorities: dict[str, Priority] = {}
+    for item in spec.split(","):
+        if "=" not in item:
+            continue
+        key, _, level = item.partition("=")
+        try:
+            priorities[key.strip()] = Priority[level.strip().upper()]
+        except KeyError:
+            logger.warning(f"Ignoring unknown event priority {level.strip()!r} for {key.strip()}")
+    return priorities
+
+
+def _slug(value: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", value).strip("_")[:80] or "unknown"
+
+
+class LoadShedder:
+    """Decides whether to process, defer or drop an event under load
+
+    Thresholds apply by priority, looked up per ``source:type`` or ``source``:
+
+    - low: deferred once the backlog reaches ``shed_defer_backlog`` or the LLM
+      circuit is not closed, dropped at ``shed_drop_backlog``
+    - normal: deferred at ``shed_drop_backlog`` or while the LLM circuit is open
+    - high: always processed
+
+    Deferred events become notes in ``Needs_Action/`` (``EMAIL_<id>.md``,
+    ``WHATSAPP_<sender>.md``, ``FILE_<name>.md``) and the original events are
+    kept in the memory store until ``take_deferred`` hands them back for
+    reprocessing. Deleting a note discards its events. Dropped events stay
+    in the durable event log, so they can still be replayed.
+    """
+
+    def __init__(self, memory: MemoryStore, vault_path: Path | None = None):
+        self.settings = get_settings()
+        self.memory = memory
+        self.needs_action_path = (vault_path or get_vault_path()) / "Needs_Action"
+        self.needs_action_path.mkdir(parents=True, exist_ok=True)
+        self.priorities = parse_priorities(self.settings.event_priorities)
+        self.counts = {decision.value: 0 for decision in ShedDecision}
+
+    def priority(self, event: dict[str, Any]) -> Priority:
+        source = event.get("source", "")
+        return self.priorities.get(
+            f"{source}:{event.get('type')}", self.priorities.get(source, Priority.NORMAL)
+        )
+
+    def decide(
+        self, event: dict[str, Any], backlog: int, llm_state: CircuitState = CircuitState.CLOSED
+    ) -> ShedDecision:
+        """Pick what to do with ``event`` given the queued backlog and LLM circuit state"""
+        if self._is_needs_action_echo(event):
+            return ShedDecision.SKIP
+        priority = self.priority(event)
+        if priority is Priority.HIGH:
+            return ShedDecision.PROCESS
+        if priority is Priority.LOW:
+            if backlog >= self.settings.shed_drop_backlog:
+                return ShedDecision.DROP
+            if backlog >= self.settings.shed_defer_backlog or llm_state is not CircuitState.CLOSED:
+                return ShedDecision.DEFER
+            return ShedDecision.PROCESS
+        if backlog >= self.settings.shed_drop_backlog or llm_state is CircuitState.OPEN:
+            return ShedDecision.DEFER
+        return ShedDecision.PROCESS
+
+    def record(self, decision: ShedDecision) -> None:
+        """Count what finally happened to an event"""
+        self.counts[decision.value] += 1
+
+    def _needs_action_file(self, event: dict[str, Any]) -> Path | None:
+        """The Needs_Action file a ``file_change`` event is about, if any"""
+        if event.get("type") != "file_change":
+            return None
+        path = Path(event.get("data", {}).get("path", "")).absolute()
+        return path if path.parent == self.needs_action_path.absolute() else None
+
+    def _is_needs_action_echo(self, event: dict[str, Any]) -> bool:
+        # The filesystem watcher may watch Needs_Action: ignore the notes written
+        # here and files that were already handled and removed
+        path = self._needs_action_file(event)
+        if path is None:
+            return False
+        record = self.memory.get(DEFERRED_NAMESPACE, path.name)
+        return (record is not None and record.get("owned", False)) or not path.exists()
+
+    def _note_name(self, event: dict[str, Any]) -> str:
+        data = event.get("data", {})
+        source = event.get("source")
+        if source == "gmail":
+            return f"EMAIL_{_slug(str(data.get('id') or event.get('id')))}.md"
+        if source == "whatsapp":
+            return f"WHATSAPP_{_slug(str(data.get('from', 'unknown')))}.md"
+        if event.get("type") == "file_change":
+            return f"FILE_{_slug(Path(data.get('path', 'unknown')).name)}.md"
+        return f"TASK_{_slug(str(event.get('id') or event.get('type')))}.md"
+
+    def defer(self, event: dict[str, Any], reason: str) -> Path:
+        """Park an event as a Needs_Action note and remember it for later"""
+        existing = self._needs_action_file(event)
+        if existing is not None:
+            # Already a Needs_Action file: remember the event, don't write a copy
+            name, owned = existing.name, False
+        else:
+            name, owned = self._note_name(event), True
+        note = self.needs_action_path / name
+
+        key = idempotency_key(event)
+
+        def add_event(record: dict[str, Any]) -> dict[str, Any]:
+            if all(idempotency_key(e) != key for e in record["events"]):
+                record["events"].append(event)
+            return record
+
+        # Record first so the watcher's echo of the note is recognised. Workers defer
+        # into the same notes, so the append must not go through a cached read
+        record = self.memory.modify(
+            DEFERRED_NAMESPACE, name, add_event, default={"owned": owned, "events": []}
+        )
+        if owned:
+            with open(note, "w", encoding="utf-8") as f:
+                f.write(self._render_note(record["events"], reason))
+        logger.info(f"Deferred {event.get('source')} {event.get('type')} to {name} ({reason})")
+        return note
+
+    def _render_note(self, events: list[dict[str, Any]], reason: str) -> str:
+        first = events[0]
+        lines = [
+            "---",
+            "type: deferred_event",
+            f"source: {first.get('source')}",
+            f"event_type: {first.get('type')}",
+            f"priority: {self.priority(first).name.lower()}",
+            f"deferred: {datetime.now().isoformat()}",
+            f"reason: {reason}",
+            f"events: {len(events)}",
+            "---",
+            "",
+            f"# Deferred {first.get('type')}",
+            "",
+            "Deferred while the agent was under load. It is re-queued automatically once "
+            "load drops; delete this note to discard it.",
+            "",
+        ]
+        for event in events:
+            lines.extend([f"## {event.get('timestamp', '')}", ""])
+            for key, value in event.get("data", {}).items():
+                text = str(value).replace("\n", " ")
+                if len(text) > NOTE_FIELD_CHARS:
+                    text = text[:NOTE_FIELD_CHARS] + "..."
+                lines.extend([f"**{key}**: {text}", ""])
+        return "\n".join(lines)
+
+    def pending_count(self) -> int:
+        return len(self.memory.get_namespace(DEFERRED_NAMESPACE))
+
+    def take_deferred(self, limit: int) -> list[dict[str, Any]]:
+        """Remove up to ``limit`` notes' worth of deferred events and return the events"""
+        events: list[dict[str, Any]] = []
+        for name in sorted(self.memory.get_namespace(DEFERRED_NAMESPACE)):
+            if len(events) >= limit:
+                break
+            # The listing may be stale; only the process whose pop succeeds gets the events
+            record = self.memory.pop(DEFERRED_NAMESPACE, name)
+            if record is None:
+                continue
+            note = self.needs_action_path / name
+            if not note.exists():
+                logger.info(f"Deferred note {name} was removed, discarding its events")
+                continue
+            if record.get("owned", False):
+                note.unlink(missing_ok=True)
+            events.extend(record["events"])
+        return events
@@ -0,0 +1,236 @@
+"""Keyed fact store backed by SQLite"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS facts (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (namespace, key)
+) WITHOUT ROWID
+"""
+
+
+class MemoryStore:
+    """Facts stored one row per (namespace, key) in a WAL-mode SQLite database
+
+    Rows are upserted individually, so concurrent writers (other tasks or
+    worker processes) updating different keys never overwrite each other.
+    Reads go through an in-process cache of the stored JSON; a cached lookup
+    is a dict hit plus a decode, so callers always get their own copy and
+    mutating a result never changes the cache without a write.
+    Writes from other processes are picked up by checking SQLite's
+    ``data_version`` at most once per ``refresh_interval`` seconds, so a
+    cached read may be that stale: changes derived from an existing value
+    must go through ``modify`` or ``pop``, which read the database inside
+    the write transaction.
+    """
+
+    def __init__(self, db_path: Path, refresh_interval: float = 1.0):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.refresh_interval = refresh_interval
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            self.db_path, timeout=5.0, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(SCHEMA)
+
+        # namespace -> key -> JSON text; complete only for namespaces in _loaded_namespaces
+        self._facts: dict[str, dict[str, str]] = {}
+        self._loaded_namespaces: set[str] = set()
+        self._data_version = self._read_data_version()
+        self._checked_at = time.monotonic()
+
+    def _read_data_version(self) -> int:
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _maybe_refresh(self) -> None:
+        """Drop the cache if another connection committed since the last check"""
+        now = time.monotonic()
+        if now - self._checked_at < self.refresh_interval:
+            return
+        self._checked_at = now
+        version = self._read_data_version()
+        if version != self._data_version:
+            self._data_version = version
+            self._facts.clear()
+            self._loaded_namespaces.clear()
+
+    def refresh(self) -> None:
+        """Check for writes from other connections now instead of on the next interval"""
+        with self._lock:
+            self._checked_at = float("-inf")
+            self._maybe_refresh()
+
+    def get(self, namespace: str, key: str, default: Any = None) -> Any:
+        """Read a single fact"""
+        with self._lock:
+            self._maybe_refresh()
+            encoded = self._facts.get(namespace, {}).get(key)
+            if encoded is None:
+                if namespace in self._loaded_namespaces:
+                    return default
+                row = self._conn.execute(
+                    "SELECT value FROM facts WHERE namespace = ? AND key = ?", (namespace, key)
+                ).fetchone()
+                if row is None:
+                    return default
+                encoded = row[0]
+                self._facts.setdefault(namespace, {})[key] = encoded
+        return json.loads(encoded)
+
+    def get_namespace(self, namespace: str) -> dict[str, Any]:
+        """Read every fact in a namespace"""
+        with self._lock:
+            self._maybe_refresh()
+            if namespace not in self._loaded_namespaces:
+                rows = self._conn.execute(
+                    "SELECT key, value FROM facts WHERE namespace = ?", (namespace,)
+                ).fetchall()
+                self._facts[namespace] = dict(rows)
+                self._loaded_namespaces.add(namespace)
+            facts = list(self._facts[namespace].items())
+        return {key: json.loads(encoded) for key, encoded in facts}
+
+    def update(self, namespace: str, values: dict[str, Any]) -> None:
+        """Upsert some facts in a namespace, leaving other keys untouched"""
+        self._write(namespace, values, replace=False)
+
+    def replace(self, namespace: str, values: dict[str, Any]) -> None:
+        """Make ``values`` the complete contents of a namespace"""
+        self._write(namespace, values, replace=True)
+
+    def set(self, namespace: str, key: str, value: Any) -> None:
+        """Upsert one fact"""
+        self._write(namespace, {key: value}, replace=False)
+
+    def modify(
+        self, namespace: str, key: str, fn: Callable[[Any], Any], default: Any = None
+    ) -> Any:
+        """Atomically set a fact to ``fn(current)`` and return the new value
+
+        ``current`` (``default`` if the fact is missing) is read from the
+        database inside the write transaction, never from the cache, so
+        read-modify-writes from other connections queue behind each other
+        instead of overwriting each other. Returning None deletes the fact.
+        """
+        with self._lock:
+            with self._transaction():
+                current = self._select(namespace, key)
+                value = fn(json.loads(current) if current is not None else default)
+                if value is None:
+                    encoded = None
+                    self._conn.execute(
+                        "DELETE FROM facts WHERE namespace = ? AND key = ?", (namespace, key)
+                    )
+                else:
+                    encoded = json.dumps(value)
+                    self._upsert([(namespace, key, encoded, datetime.now().isoformat())])
+            if encoded is None:
+                self._facts.get(namespace, {}).pop(key, None)
+            else:
+                self._facts.setdefault(namespace, {})[key] = encoded
+        return value
+
+    def pop(self, namespace: str, key: str, default: Any = None) -> Any:
+        """Remove a fact and return its value; of concurrent callers only one gets it"""
+        with self._lock:
+            with self._transaction():
+                current = self._select(namespace, key)
+                if current is not None:
+                    self._conn.execute(
+                        "DELETE FROM facts WHERE namespace = ? AND key = ?", (namespace, key)
+                    )
+            self._facts.get(namespace, {}).pop(key, None)
+        return json.loads(current) if current is not None else default
+
+    def delete(self, namespace: str, key: str) -> None:
+        """Remove one fact"""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM facts WHERE namespace = ? AND key = ?", (namespace, key)
+            )
+            self._facts.get(namespace, {}).pop(key, None)
+
+    def _write(self, namespace: str, values: dict[str, Any], replace: bool) -> None:
+        now = datetime.now().isoformat()
+        encoded = {key: json.dumps(value) for key, value in values.items()}
+        rows = [(namespace, key, text, now) for key, text in encoded.items()]
+        with self._lock:
+            with self._transaction():
+                if replace:
+                    self._conn.execute("DELETE FROM facts WHERE namespace = ?", (namespace,))
+                self._upsert(rows)
+
+            if replace:
+                self._facts[namespace] = {}
+                self._loaded_namespaces.add(namespace)
+            self._facts.setdefault(namespace, {}).update(encoded)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        # IMMEDIATE takes the write lock up front so concurrent writers queue;
+        # callers hold self._lock
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def _select(self, namespace: str, key: str) -> str | None:
+        row = self._conn.execute(
+            "SELECT value FROM facts WHERE namespace = ? AND key = ?", (namespace, key)
+        ).fetchone()
+        return row[0] if row is not None else None
+
+    def _upsert(self, rows: list[tuple[str, str, str, str]]) -> None:
+        self._conn.executemany(
+            "INSERT INTO facts (namespace, key, value, updated_at) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(namespace, key) DO UPDATE SET "
+            "value = excluded.value, updated_at = excluded.updated_at",
+            rows,
+        )
+
+    def namespaces(self) -> list[str]:
+        """List namespaces that hold at least one fact"""
+        with self._lock:
+            rows = self._conn.execute("SELECT DISTINCT namespace FROM facts").fetchall()
+        return [row[0] for row in rows]
+
+    def render_markdown(self, namespace: str) -> str:
+        """Render a namespace as an Obsidian note with bold key/value fields"""
+        lines = [f"# {namespace}", "", f"Updated: {datetime.now().isoformat()}", ""]
+        for key, value in sorted(self.get_namespace(namespace).items()):
+            rendered = value if isinstance(value, str) else json.dumps(value)
+            lines.append(f"**{key}**: {rendered}")
+            lines.append("")
+        return "\n".join(lines)
+
+    def export_markdown(self, namespace: str, directory: Path) -> Path:
+        """Write a namespace to ``<directory>/<namespace>.md`` for Obsidian"""
+        path = Path(directory) / f"{namespace}.md"
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.render_markdown(namespace))
+        return path
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
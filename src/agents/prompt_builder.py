@@ -0,0 +1,200 @@
+"""Prompt assembly with a cached static prefix"""
+
+import asyncio
+import logging
+import time
+from pathlib import Path
+from typing import Any
+
+from google.genai import types  # pyright: ignore[reportMissingImports]
+
+from ..config import get_settings, get_vault_path
+from .skills_manager import SkillsManager
+
+logger = logging.getLogger(__name__)
+
+# Gemini rejects context caches below a minimum token count (~1024 tokens for Flash)
+MIN_CACHE_CHARS = 4 * 1024
+CONVERSATION_HEADER = "\n\nConversation:\n"
+
+
+class PromptBuilder:
+    """Builds agent prompts from a precomputed prefix and formatted history
+
+    The static prefix (identity, skills catalog) is only rebuilt when one of
+    its inputs changes, which costs two ``stat`` calls per prompt instead of
+    a directory listing and file read. Conversation lines are formatted once
+    and appended as history grows. When the client supports it and the
+    prefix plus the handbook excerpt is large enough, that text is uploaded
+    as a Gemini context cache so repeated calls only send the conversation.
+    The handbook is never sent inline: without a cache it would make every
+    prompt larger.
+    """
+
+    def __init__(self, skills_manager: SkillsManager):
+        self.settings = get_settings()
+        self.skills_manager = skills_manager
+        self.handbook_path = get_vault_path() / "Company_Handbook.md"
+
+        self._prefix = ""
+        self._cacheable_prefix = ""
+        self._prefix_key: tuple[Any, ...] | None = None
+        self._lines: list[str] = []
+        self._history_id: int | None = None
+        self._last_entry: dict[str, str] | None = None
+
+        self._cache_name: str | None = None
+        self._cache_key: tuple[Any, ...] | None = None
+        self._cache_expires = 0.0
+        self._cache_failed_key: tuple[Any, ...] | None = None
+
+    @staticmethod
+    def _stat_key(path: Path) -> tuple[int, int] | None:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _inputs_key(self) -> tuple[Any, ...]:
+        # Adding, removing or renaming a skill bumps the directory mtime
+        return (
+            self.settings.agent_name,
+            self.settings.agent_role,
+            self._stat_key(self.skills_manager.skills_path),
+            self._stat_key(self.handbook_path),
+        )
+
+    def _read_handbook(self) -> str:
+        limit = self.settings.prompt_handbook_chars
+        if limit <= 0:
+            return ""
+        doc = self.skills_manager.cache.get(self.handbook_path)
+        return doc.text[:limit] if doc is not None else ""
+
+    def static_prefix(self) -> str:
+        """Return the inline system prompt prefix, rebuilding it only if its inputs changed"""
+        self._refresh_prefix()
+        return self._prefix
+
+    def cacheable_prefix(self) -> str:
+        """Return the text for a context cache: the inline prefix plus the handbook excerpt"""
+        self._refresh_prefix()
+        return self._cacheable_prefix
+
+    def _refresh_prefix(self) -> None:
+        key = self._inputs_key()
+        if key == self._prefix_key:
+            return
+        # A watched cache serves listings and notes without a stat until its next
+        # revalidation; drop them so the rebuild can't store stale inputs under the new key
+        self.skills_manager.cache.invalidate(self.skills_manager.skills_path)
+        self.skills_manager.cache.invalidate(self.handbook_path)
+
+        segments = [
+            f"You are {self.settings.agent_name}, a {self.settings.agent_role}.",
+            "You work autonomously to handle personal and business tasks.",
+            "Be concise, actionable, and proactive.",
+            f"Available skills: {', '.join(self.skills_manager.list_available_skills())}",
+        ]
+        self._prefix = "\n".join(segments)
+        handbook = self._read_handbook()
+        if handbook:
+            segments.append(f"\nCompany handbook (excerpt):\n{handbook}")
+        self._cacheable_prefix = "\n".join(segments)
+        self._prefix_key = key
+        logger.debug(
+            f"Prompt prefix rebuilt ({len(self._prefix)} chars inline, "
+            f"{len(self._cacheable_prefix)} cacheable)"
+        )
+
+    @staticmethod
+    def _format(msg: dict[str, str]) -> str:
+        return f"{msg['role']}: {msg['content']}"
+
+    def conversation(
+        self, history: list[dict[str, str]], pending: dict[str, str] | None = None
+    ) -> str:
+        """Format the conversation, reusing lines formatted on earlier calls
+
+        ``pending`` is a turn that is not in ``history`` yet (the task being
+        asked about); it is formatted on every call and never cached.
+        """
+        # History is append-only; a different or shorter list, or a replaced
+        # last entry, means it was edited, so start over
+        if (
+            self._history_id != id(history)
+            or len(history) < len(self._lines)
+            or (self._lines and history[len(self._lines) - 1] is not self._last_entry)
+        ):
+            self._lines = []
+            self._history_id = id(history)
+        for msg in history[len(self._lines):]:
+            self._lines.append(self._format(msg))
+        self._last_entry = history[len(self._lines) - 1] if self._lines else None
+        lines = [*self._lines, self._format(pending)] if pending is not None else self._lines
+        return "\n".join(lines)
+
+    def build(
+        self, history: list[dict[str, str]], pending: dict[str, str] | None = None
+    ) -> str:
+        """Full prompt: static prefix followed by the conversation"""
+        return "".join(
+            (self.static_prefix(), CONVERSATION_HEADER, self.conversation(history, pending))
+        )
+
+    def build_suffix(
+        self, history: list[dict[str, str]], pending: dict[str, str] | None = None
+    ) -> str:
+        """Prompt body to send when the prefix lives in a context cache"""
+        return "".join((CONVERSATION_HEADER.lstrip("\n"), self.conversation(history, pending)))
+
+    def invalidate_context_cache(self) -> None:
+        """Forget the current context cache so the next call recreates it"""
+        self._cache_key = None
+
+    async def context_cache(self, client: Any, model: str) -> str | None:
+        """Return a Gemini context cache name holding the prefix, creating it if needed
+
+        Returns None when caching is disabled, unsupported by the client, the
+        prefix is too small to be cached, or creating the cache failed; the
+        caller then sends ``build`` (which has no handbook) instead.
+        """
+        if not self.settings.gemini_context_cache or not hasattr(client, "caches"):
+            return None
+
+        prefix = self.cacheable_prefix()
+        key = (model, self._prefix_key)
+        if len(prefix) < MIN_CACHE_CHARS or key == self._cache_failed_key:
+            return None
+        # Refresh a little before the TTL runs out
+        if key == self._cache_key and time.monotonic() < self._cache_expires - 60:
+            return self._cache_name
+
+        ttl = self.settings.gemini_context_cache_ttl
+        try:
+            cache = await asyncio.to_thread(
+                client.caches.create,
+                model=model,
+                config=types.CreateCachedContentConfig(
+                    system_instruction=prefix,
+                    ttl=f"{ttl}s",
+                    display_name=f"{self.settings.agent_name}-prefix",
+                ),
+            )
+        except Exception as e:
+            logger.warning(f"Context cache unavailable, sending prefix inline: {e}")
+            self._cache_failed_key = key
+            return None
+
+        stale = self._cache_name
+        self._cache_name = cache.name
+        self._cache_key = key
+        self._cache_expires = time.monotonic() + ttl
+        logger.info(f"Created context cache {cache.name} for prompt prefix")
+        if stale:
+            try:
+                await asyncio.to_thread(client.caches.delete, name=stale)
+            except Exception as e:
+                logger.debug(f"Could not delete stale context cache {stale}: {e}")
+        return self._cache_name
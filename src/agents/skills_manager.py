@@ -6,6 +6,7 @@ from pathlib import Path
 from typing import Any, Callable
 
 from ..config import get_vault_path
+from .vault_cache import VaultCache, get_vault_cache
 
 logger = logging.getLogger(__name__)
 
@@ -13,7 +14,8 @@ logger = logging.getLogger(__name__)
 class SkillsManager:
     """Manages and executes agent skills"""
 
-    def __init__(self):
+    def __init__(self, cache: VaultCache | None = None):
+        self.cache = cache or get_vault_cache()
         self.vault_path = get_vault_path()
         self.skills_path = self.vault_path / "Skills"
         self.skills_path.mkdir(parents=True, exist_ok=True)
@@ -47,21 +49,19 @@ class SkillsManager:
 
     def get_skill_definition(self, skill_name: str) -> dict[str, Any]:
         """Get skill definition from Skills directory"""
-        skill_file = self.skills_path / f"{skill_name}.md"
-        if not skill_file.exists():
-            return {}
-
-        try:
-            with open(skill_file, "r", encoding="utf-8") as f:
-                content = f.read()
-            return {"name": skill_name, "definition": content}
-        except Exception as e:
-            logger.error(f"Failed to load skill definition: {e}")
+        doc = self.cache.get(self.skills_path / f"{skill_name}.md")
+        if doc is None:
             return {}
+        return {
+            "name": skill_name,
+            "definition": doc.text,
+            "fields": doc.fields,
+            "frontmatter": doc.frontmatter,
+        }
 
     def list_available_skills(self) -> list[str]:
         """List all available skills"""
-        skills = [f.stem for f in self.skills_path.glob("*.md")]
+        skills = [f.stem for f in self.cache.list_notes(self.skills_path)]
         logger.info(f"Available skills: {len(skills)}")
         return skills
 
@@ -0,0 +1,286 @@
+"""Parsed Markdown cache shared by everything that reads the vault"""
+
+import logging
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from ..config import get_settings
+
+logger = logging.getLogger(__name__)
+
+HEADING_RE = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$")
+FIELD_RE = re.compile(r"^\s*[-*]?\s*\*\*([^*]+?)\*\*\s*:\s*(.*)$")
+WIKILINK_RE = re.compile(r"\[\[([^\]|#]+)(?:#[^\]|]*)?(?:\|[^\]]*)?\]\]")
+
+# Rough per-entry bookkeeping cost on top of the text itself
+ENTRY_OVERHEAD = 512
+
+
+@dataclass
+class VaultDocument:
+    """A Markdown note parsed into the parts the agent looks up"""
+
+    path: Path
+    mtime_ns: int
+    size: int
+    text: str
+    frontmatter: dict[str, Any] = field(default_factory=dict)
+    headings: list[tuple[int, str]] = field(default_factory=list)
+    fields: dict[str, str] = field(default_factory=dict)
+    links: list[str] = field(default_factory=list)
+
+    @property
+    def title(self) -> str:
+        """First top-level heading, or the file name"""
+        for level, text in self.headings:
+            if level == 1:
+                return text
+        return self.path.stem
+
+    @property
+    def body(self) -> str:
+        """Text after the frontmatter block"""
+        if not self.frontmatter:
+            return self.text
+        end = self.text.find("\n---", 3)
+        return self.text[end + 4:].lstrip("\n") if end != -1 else self.text
+
+    @property
+    def nbytes(self) -> int:
+        return 2 * len(self.text) + ENTRY_OVERHEAD
+
+
+def _parse_scalar(value: str) -> Any:
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+        return value[1:-1]
+    if value.startswith("[") and value.endswith("]"):
+        return [_parse_scalar(v) for v in value[1:-1].split(",") if v.strip()]
+    lowered = value.lower()
+    if lowered in ("true", "false"):
+        return lowered == "true"
+    if lowered in ("", "null", "~"):
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+def parse_frontmatter(lines: list[str]) -> tuple[dict[str, Any], int]:
+    """Parse a leading ``---`` block of flat ``key: value`` pairs and ``- item`` lists
+
+    Returns the parsed mapping and the index of the first line after the block.
+    """
+    if not lines or lines[0].strip() != "---":
+        return {}, 0
+    data: dict[str, Any] = {}
+    current: str | None = None
+    for index, line in enumerate(lines[1:], start=1):
+        stripped = line.strip()
+        if stripped == "---":
+            return data, index + 1
+        if not stripped or stripped.startswith("#"):
+            continue
+        if stripped.startswith("- ") and current is not None:
+            if not isinstance(data.get(current), list):
+                data[current] = []
+            data[current].append(_parse_scalar(stripped[2:]))
+        elif ":" in stripped:
+            key, _, value = stripped.partition(":")
+            current = key.strip()
+            data[current] = _parse_scalar(value)
+    # No closing delimiter: not frontmatter after all
+    return {}, 0
+
+
+def parse_document(path: Path, text: str, mtime_ns: int, size: int) -> VaultDocument:
+    """Parse Markdown text into a ``VaultDocument``"""
+    lines = text.splitlines()
+    frontmatter, start = parse_frontmatter(lines)
+    doc = VaultDocument(
+        path=path, mtime_ns=mtime_ns, size=size, text=text, frontmatter=frontmatter
+    )
+
+    in_code = False
+    for line in lines[start:]:
+        if line.lstrip().startswith("```"):
+            in_code = not in_code
+            continue
+        if in_code:
+            continue
+        heading = HEADING_RE.match(line)
+        if heading:
+            doc.headings.append((len(heading.group(1)), heading.group(2)))
+            continue
+        bold = FIELD_RE.match(line)
+        if bold:
+            doc.fields.setdefault(bold.group(1).strip(), bold.group(2).strip())
+        doc.links.extend(link.strip() for link in WIKILINK_RE.findall(line))
+    return doc
+
+
+class VaultCache:
+    """LRU cache of parsed vault notes, bounded by approximate memory use
+
+    Entries are keyed by path and validated against ``(mtime_ns, size)``.
+    Until a watcher takes over invalidation, every lookup costs one ``stat``.
+    Once ``watched`` is set (see ``VaultWatcher``), lookups are plain dict
+    hits and changes are picked up by ``invalidate`` and ``revalidate``.
+    Directory listings are cached the same way, keyed by directory mtime.
+    """
+
+    def __init__(self, max_bytes: int | None = None):
+        settings = get_settings()
+        self.max_bytes = max_bytes if max_bytes is not None else settings.vault_cache_bytes
+        self.watched = False
+
+        self._lock = threading.RLock()
+        self._docs: OrderedDict[Path, VaultDocument] = OrderedDict()
+        self._listings: dict[tuple[Path, str], tuple[int, list[Path]]] = {}
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _stat(path: Path) -> tuple[int, int] | None:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def get(self, path: Path) -> VaultDocument | None:
+        """Return the parsed note at ``path``, or None if it cannot be read"""
+        path = Path(path).absolute()
+        with self._lock:
+            doc = self._docs.get(path)
+            if doc is not None and (
+                self.watched or self._stat(path) == (doc.mtime_ns, doc.size)
+            ):
+                self._docs.move_to_end(path)
+                self.hits += 1
+                return doc
+
+            self.misses += 1
+        key = self._stat(path)
+        if key is None:
+            self.invalidate(path)
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                text = f.read()
+        except (OSError, UnicodeDecodeError) as e:
+            logger.error(f"Failed to read vault note {path}: {e}")
+            return None
+        doc = parse_document(path, text, *key)
+        self._store(doc)
+        return doc
+
+    def _store(self, doc: VaultDocument) -> None:
+        with self._lock:
+            self._drop(doc.path)
+            if doc.nbytes > self.max_bytes:
+                return
+            self._docs[doc.path] = doc
+            self._bytes += doc.nbytes
+            while self._bytes > self.max_bytes:
+                _, evicted = self._docs.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self.evictions += 1
+
+    def _drop(self, path: Path) -> None:
+        doc = self._docs.pop(path, None)
+        if doc is not None:
+            self._bytes -= doc.nbytes
+
+    def list_notes(self, directory: Path, pattern: str = "*.md") -> list[Path]:
+        """Sorted paths in ``directory`` matching ``pattern``"""
+        directory = Path(directory).absolute()
+        key = (directory, pattern)
+        with self._lock:
+            cached = self._listings.get(key)
+            if cached is not None and (
+                self.watched or self._dir_mtime(directory) == cached[0]
+            ):
+                return list(cached[1])
+
+        mtime = self._dir_mtime(directory)
+        paths = sorted(directory.glob(pattern)) if mtime is not None else []
+        with self._lock:
+            if mtime is not None:
+                self._listings[key] = (mtime, paths)
+            else:
+                self._listings.pop(key, None)
+        return list(paths)
+
+    @staticmethod
+    def _dir_mtime(directory: Path) -> int | None:
+        try:
+            return directory.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def invalidate(self, path: Path) -> None:
+        """Forget a note and any listing of its directory (call after writing it)
+
+        ``path`` may also be a directory, in which case its own listings go too.
+        """
+        path = Path(path).absolute()
+        with self._lock:
+            self._drop(path)
+            for key in [key for key in self._listings if key[0] in (path, path.parent)]:
+                del self._listings[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._docs.clear()
+            self._listings.clear()
+            self._bytes = 0
+
+    def revalidate(self) -> int:
+        """Stat every cached note and listing, dropping stale ones; return how many"""
+        with self._lock:
+            docs = [(path, (doc.mtime_ns, doc.size)) for path, doc in self._docs.items()]
+            listings = [(key, mtime) for key, (mtime, _) in self._listings.items()]
+
+        stale_docs = [path for path, key in docs if self._stat(path) != key]
+        stale_listings = [key for key, mtime in listings if self._dir_mtime(key[0]) != mtime]
+        with self._lock:
+            for path in stale_docs:
+                self._drop(path)
+            for key in stale_listings:
+                self._listings.pop(key, None)
+        return len(stale_docs) + len(stale_listings)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._docs),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+_shared_cache: VaultCache | None = None
+_shared_lock = threading.Lock()
+
+
+def get_vault_cache() -> VaultCache:
+    """Process-wide cache shared by the skills, context and prompt components"""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = VaultCache()
+        return _shared_cache
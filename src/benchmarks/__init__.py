@@ -0,0 +1,7 @@
+"""Offline benchmarks for the agent loop"""
+
+from .generators import generate_events
+from .runner import BenchmarkConfig, compare_reports, run_benchmark
+from .stub_model import StubClient
+
+__all__ = ["BenchmarkConfig", "StubClient", "compare_reports", "generate_events", "run_benchmark"]
@@ -0,0 +1,120 @@
+"""Benchmark CLI: ``python -m src.benchmarks run|compare``"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from .runner import BenchmarkConfig, build_report, compare_reports, run_benchmark, save_report
+
+DEFAULT_OUTPUT_DIR = Path("bench_results")
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m src.benchmarks", description=__doc__)
+    parser.add_argument("--log-level", default="ERROR", help="Agent log level during runs")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run the agent loop benchmark against the stub model")
+    run.add_argument("--events", type=int, default=200)
+    run.add_argument("--concurrency", type=int, default=1)
+    run.add_argument(
+        "--workers", type=int, default=0, help="Benchmark supervisor mode with N worker processes"
+    )
+    run.add_argument(
+        "--sources", default="filesystem,gmail,whatsapp", help="Comma-separated event sources"
+    )
+    run.add_argument("--latency", type=float, default=0.0, help="Stub model latency (s)")
+    run.add_argument("--jitter", type=float, default=0.0, help="Extra random latency (s)")
+    run.add_argument("--error-rate", type=float, default=0.0)
+    run.add_argument("--exhausted-rate", type=float, default=0.0)
+    run.add_argument("--completion-rate", type=float, default=1.0)
+    run.add_argument(
+        "--context-cache", action="store_true", help="Expose a stub context-cache API"
+    )
+    run.add_argument("--retry-base-delay", type=float, default=0.0)
+    run.add_argument(
+        "--shed-load", action="store_true", help="Let the load shedder defer or drop events"
+    )
+    run.add_argument("--no-memory", action="store_true", help="Disable tracemalloc sampling")
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--output", type=Path, help="Report path (default: bench_results/<ts>.json)")
+
+    compare = commands.add_parser("compare", help="Compare two saved benchmark reports")
+    compare.add_argument("baseline", type=Path)
+    compare.add_argument("candidate", type=Path)
+    compare.add_argument(
+        "--threshold", type=float, default=10.0, help="Regression threshold in percent"
+    )
+
+    return parser.parse_args(argv)
+
+
+def _run(args: argparse.Namespace) -> int:
+    config = BenchmarkConfig(
+        events=args.events,
+        concurrency=args.concurrency,
+        sources=[s.strip() for s in args.sources.split(",") if s.strip()],
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        exhausted_rate=args.exhausted_rate,
+        completion_rate=args.completion_rate,
+        context_cache=args.context_cache,
+        retry_base_delay=args.retry_base_delay,
+        shed_load=args.shed_load,
+        track_memory=not args.no_memory,
+        workers=args.workers,
+        seed=args.seed,
+    )
+    report = build_report(config, asyncio.run(run_benchmark(config)))
+
+    output = args.output or DEFAULT_OUTPUT_DIR / (
+        f"{datetime.now().strftime('%Y%m%dT%H%M%S')}_{report['git_commit'] or 'nogit'}.json"
+    )
+    save_report(report, output)
+
+    results = report["results"]
+    print(f"events/sec:      {results['events_per_sec']}")
+    print(f"latency p50/p99: {results['latency_ms']['p50']}ms / {results['latency_ms']['p99']}ms")
+    if results["llm"]:
+        print(f"LLM calls/event: {results['llm']['calls_per_event']}")
+    if results.get("shed"):
+        shed = results["shed"]
+        print(f"shed:            {shed['defer']} deferred / {shed['drop']} dropped")
+    if results["memory"]:
+        print(f"memory growth:   {results['memory']['growth_kb']} KB")
+    print(f"report:          {output}")
+    return 0
+
+
+def _compare(args: argparse.Namespace) -> int:
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.candidate, "r", encoding="utf-8") as f:
+        candidate = json.load(f)
+
+    rows = compare_reports(baseline, candidate, threshold=args.threshold)
+    print(f"{baseline.get('git_commit')} -> {candidate.get('git_commit')}")
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(
+            f"{row['metric']:<22} {row['baseline']:>12.3f} {row['candidate']:>12.3f} "
+            f"{row['change_pct']:>+8.2f}%{flag}"
+        )
+    return 1 if any(row["regression"] for row in rows) else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    logging.basicConfig(level=args.log_level.upper(), format="%(levelname)s - %(message)s")
+    if args.command == "compare":
+        return _compare(args)
+    return _run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
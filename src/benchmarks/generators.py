@@ -0,0 +1,97 @@
+"""Synthetic event generators mirroring the watcher event shapes"""
+
+import random
+from datetime import datetime, timedelta
+from typing import Any, Callable, Iterator
+
+SENDERS = ["alice@example.com", "bob@example.com", "billing@vendor.test", "ceo@client.test"]
+SUBJECTS = [
+    "Invoice overdue",
+    "Meeting tomorrow",
+    "Quick question",
+    "Contract draft",
+    "Weekly report",
+]
+PHONES = ["+15550100", "+15550101", "+15550102", "+15550103"]
+MESSAGES = [
+    "Can you call me?",
+    "Payment sent",
+    "Where is the file?",
+    "Thanks!",
+    "Urgent: reply asap",
+]
+FILE_NAMES = ["notes.txt", "invoice.pdf", "todo.md", "report.docx", "scan.png"]
+
+EPOCH = datetime(2026, 1, 1)
+
+
+def _timestamp(rng: random.Random, index: int) -> str:
+    return (EPOCH + timedelta(seconds=index * 5 + rng.randint(0, 4))).isoformat()
+
+
+def filesystem_event(rng: random.Random, index: int) -> dict[str, Any]:
+    """Build an event shaped like a FileSystemWatcher report"""
+    name = rng.choice(FILE_NAMES)
+    return {
+        "id": f"fs-{index}",
+        "source": "filesystem",
+        "type": "file_change",
+        "timestamp": _timestamp(rng, index),
+        "data": {
+            "path": f"inbox/{index}_{name}",
+            "change": rng.choice(["new", "modified"]),
+            "size": rng.randint(100, 500_000),
+            "digest": f"{rng.getrandbits(128):032x}",
+        },
+    }
+
+
+def gmail_event(rng: random.Random, index: int) -> dict[str, Any]:
+    """Build an event shaped like a GmailWatcher report"""
+    return {
+        "id": f"gmail-{index}",
+        "source": "gmail",
+        "type": "email",
+        "timestamp": _timestamp(rng, index),
+        "data": {
+            "id": f"msg{index:08x}",
+            "from": rng.choice(SENDERS),
+            "subject": rng.choice(SUBJECTS),
+            "snippet": " ".join(rng.choice(MESSAGES) for _ in range(rng.randint(1, 6))),
+        },
+    }
+
+
+def whatsapp_event(rng: random.Random, index: int) -> dict[str, Any]:
+    """Build an event shaped like a WhatsAppWatcher report"""
+    return {
+        "id": f"whatsapp-{index}",
+        "source": "whatsapp",
+        "type": "whatsapp_message",
+        "timestamp": _timestamp(rng, index),
+        "data": {
+            "from": rng.choice(PHONES),
+            "body": rng.choice(MESSAGES),
+        },
+    }
+
+
+GENERATORS: dict[str, Callable[[random.Random, int], dict[str, Any]]] = {
+    "filesystem": filesystem_event,
+    "gmail": gmail_event,
+    "whatsapp": whatsapp_event,
+}
+
+
+def generate_events(
+    count: int, sources: list[str] | None = None, seed: int = 0
+) -> Iterator[dict[str, Any]]:
+    """Yield ``count`` events drawn uniformly from the given watcher sources"""
+    sources = sources or list(GENERATORS)
+    unknown = [s for s in sources if s not in GENERATORS]
+    if unknown:
+        raise ValueError(f"Unknown event sources: {', '.join(unknown)}")
+
+    rng = random.Random(seed)
+    for index in range(count):
+        yield GENERATORS[rng.choice(sources)](rng, index)
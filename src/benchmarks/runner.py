@@ -0,0 +1,365 @@
+"""End-to-end agent loop benchmark driven by the stub model"""
+
+import asyncio
+import json
+import logging
+import math
+import os
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from typing import Any, Iterator
+
+from .. import __version__
+from .generators import generate_events
+from .stub_model import StubClient
+
+logger = logging.getLogger(__name__)
+
+# The checkout this package lives in, whatever directory the benchmark is run from
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+@dataclass
+class BenchmarkConfig:
+    """Knobs for a single benchmark run"""
+
+    events: int = 200
+    concurrency: int = 1
+    sources: list[str] = field(default_factory=lambda: ["filesystem", "gmail", "whatsapp"])
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    exhausted_rate: float = 0.0
+    completion_rate: float = 1.0
+    context_cache: bool = False
+    retry_base_delay: float = 0.0
+    shed_load: bool = False  # pass the real backlog to the load shedder
+    memory_samples: int = 20
+    track_memory: bool = True
+    workers: int = 0  # >0 drives a Supervisor with that many worker processes
+    seed: int = 0
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def git_commit() -> str | None:
+    """Return the current commit hash so results can be compared across commits"""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+            timeout=5,
+        )
+        return result.stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+@contextmanager
+def scoped_env(**values: str) -> Iterator[None]:
+    """Temporarily set environment variables read by ``get_settings``"""
+    previous = {key: os.environ.get(key) for key in values}
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for key, value in previous.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+# A handbook and skills catalog the size of a real deployment: with an empty vault the
+# prompt prefix is far below the context cache minimum and --context-cache changes nothing
+HANDBOOK_TOPICS = [
+    "Communication", "Decision making", "Working hours", "Financial rules", "Privacy",
+    "Vendors", "Clients", "Scheduling", "Documents", "Escalation", "Security", "Reporting",
+]
+SKILL_NAMES = [
+    "email_triage", "invoice_processing", "meeting_scheduler", "file_organizer",
+    "whatsapp_responder", "weekly_report",
+]
+
+
+def seed_vault(vault: Path) -> None:
+    """Write a synthetic handbook and skill notes into a scratch vault"""
+    lines = ["# Company Handbook", ""]
+    for topic in HANDBOOK_TOPICS:
+        lines += [f"## {topic}", ""]
+        lines += [
+            f"- {topic} rule {n}: record the outcome in the vault and flag anything unusual "
+            f"to the owner before acting"
+            for n in range(1, 6)
+        ]
+        lines.append("")
+    skills = vault / "Skills"
+    skills.mkdir(parents=True, exist_ok=True)
+    (vault / "Company_Handbook.md").write_text("\n".join(lines), encoding="utf-8")
+    for name in SKILL_NAMES:
+        (skills / f"{name}.md").write_text(f"# {name}\n\nSteps for {name}.\n", encoding="utf-8")
+
+
+def build_stub_agent(client: StubClient, retry_base_delay: float = 0.0):
+    """Create a CoreAgent wired to the stub model with throttling and pauses disabled"""
+    # Imported lazily so callers can point VAULT_PATH/DATA_PATH elsewhere first
+    from ..agents.core_agent import CoreAgent, RateLimiter
+
+    agent = CoreAgent(client=client)
+    agent.rate_limiter = RateLimiter(
+        max_requests_per_minute=10**9, max_requests_per_day=10**9
+    )
+    agent.retry_base_delay = retry_base_delay
+    agent.loop_delay = 0.0
+    agent.error_delay = 0.0
+    return agent
+
+
+async def run_benchmark(config: BenchmarkConfig) -> dict[str, Any]:
+    """Push synthetic events through ``CoreAgent.handle_event`` and collect metrics"""
+    if config.workers > 0:
+        return await run_supervisor_benchmark(config)
+
+    client = StubClient(
+        latency=config.latency,
+        jitter=config.jitter,
+        error_rate=config.error_rate,
+        exhausted_rate=config.exhausted_rate,
+        completion_rate=config.completion_rate,
+        context_cache=config.context_cache,
+        seed=config.seed,
+    )
+    events = list(generate_events(config.events, config.sources, seed=config.seed))
+
+    with tempfile.TemporaryDirectory(prefix="bronze-bench-") as scratch:
+        scratch_path = Path(scratch)
+        seed_vault(scratch_path / "vault")
+        with scoped_env(
+            VAULT_PATH=str(scratch_path / "vault"), DATA_PATH=str(scratch_path / "data")
+        ):
+            agent = build_stub_agent(client, config.retry_base_delay)
+        try:
+            return await _drive(agent, client, events, config)
+        finally:
+            agent.event_consumer.close()
+            agent.event_log.close()
+
+
+async def run_supervisor_benchmark(config: BenchmarkConfig) -> dict[str, Any]:
+    """Push synthetic events through a Supervisor and its worker processes
+
+    Model statistics and memory live in the worker processes, so only
+    throughput and end-to-end latency are reported in this mode.
+    """
+    from ..agents.core_agent import RateLimiter
+    from ..workers import Supervisor
+
+    client_factory = partial(
+        StubClient,
+        latency=config.latency,
+        jitter=config.jitter,
+        error_rate=config.error_rate,
+        exhausted_rate=config.exhausted_rate,
+        completion_rate=config.completion_rate,
+        context_cache=config.context_cache,
+        seed=config.seed,
+    )
+    events = list(generate_events(config.events, config.sources, seed=config.seed))
+
+    with tempfile.TemporaryDirectory(prefix="bronze-bench-") as scratch:
+        scratch_path = Path(scratch)
+        seed_vault(scratch_path / "vault")
+        # Workers are spawned inside the scope so they inherit the scratch paths
+        with scoped_env(
+            VAULT_PATH=str(scratch_path / "vault"), DATA_PATH=str(scratch_path / "data")
+        ):
+            supervisor = Supervisor(
+                num_workers=config.workers,
+                max_in_flight=max(1, config.concurrency),
+                client_factory=client_factory,
+                # Unlimited quota so throttling does not dominate the measurement
+                rate_limiter=RateLimiter(10**9, 10**9),
+                agent_options={
+                    "retry_base_delay": config.retry_base_delay,
+                    "loop_delay": 0.0,
+                    "error_delay": 0.0,
+                },
+            )
+            await supervisor.start()
+        try:
+            await supervisor.wait_ready()
+            started = time.perf_counter()
+            for event in events:
+                await supervisor.submit_event(event)
+            await supervisor.drain()
+            duration = time.perf_counter() - started
+        finally:
+            await supervisor.shutdown()
+
+    ordered = sorted(supervisor.latencies)
+    return {
+        "events": len(events),
+        "workers": config.workers,
+        "duration_s": round(duration, 4),
+        "events_per_sec": round(len(events) / duration, 2) if duration else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(ordered, 50) * 1000, 3),
+            "p99": round(percentile(ordered, 99) * 1000, 3),
+            "mean": round(sum(ordered) / len(ordered) * 1000, 3) if ordered else 0.0,
+            "max": round(ordered[-1] * 1000, 3) if ordered else 0.0,
+        },
+        "llm": {},
+        "memory": {},
+    }
+
+
+async def _drive(
+    agent: Any, client: StubClient, events: list[dict[str, Any]], config: BenchmarkConfig
+) -> dict[str, Any]:
+    latencies: list[float] = []
+    memory_trace: list[dict[str, float]] = []
+    sample_every = max(1, len(events) // max(1, config.memory_samples))
+    semaphore = asyncio.Semaphore(config.concurrency)
+    completed = 0
+    admitted = 0
+
+    if config.track_memory:
+        tracemalloc.start()
+    memory_start = tracemalloc.get_traced_memory()[0] if config.track_memory else 0
+
+    async def handle(event: dict[str, Any]) -> None:
+        nonlocal completed, admitted
+        async with semaphore:
+            admitted += 1
+            backlog = len(events) - admitted if config.shed_load else 0
+            started = time.perf_counter()
+            await agent.handle_event(event, backlog)
+            latencies.append(time.perf_counter() - started)
+            completed += 1
+            if config.track_memory and completed % sample_every == 0:
+                memory_trace.append(
+                    {"events": completed, "kb": tracemalloc.get_traced_memory()[0] / 1024}
+                )
+
+    started = time.perf_counter()
+    await asyncio.gather(*(handle(event) for event in events))
+    duration = time.perf_counter() - started
+
+    memory: dict[str, Any] = {}
+    if config.track_memory:
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        memory = {
+            "start_kb": round(memory_start / 1024, 1),
+            "end_kb": round(current / 1024, 1),
+            "peak_kb": round(peak / 1024, 1),
+            "growth_kb": round((current - memory_start) / 1024, 1),
+            "growth_per_event_bytes": round((current - memory_start) / max(1, len(events)), 1),
+            "samples": [{"events": s["events"], "kb": round(s["kb"], 1)} for s in memory_trace],
+        }
+
+    ordered = sorted(latencies)
+    return {
+        "events": len(events),
+        "duration_s": round(duration, 4),
+        "events_per_sec": round(len(events) / duration, 2) if duration else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(ordered, 50) * 1000, 3),
+            "p99": round(percentile(ordered, 99) * 1000, 3),
+            "mean": round(sum(ordered) / len(ordered) * 1000, 3) if ordered else 0.0,
+            "max": round(ordered[-1] * 1000, 3) if ordered else 0.0,
+        },
+        "llm": {
+            **client.stats.as_dict(),
+            "calls_per_event": round(client.stats.calls / max(1, len(events)), 3),
+            "prompt_chars_per_call": round(
+                client.stats.prompt_chars / max(1, client.stats.calls), 1
+            ),
+            "context_caches": getattr(getattr(client, "caches", None), "created", 0),
+        },
+        "shed": dict(agent.load_shedder.counts),
+        "llm_circuit": agent.llm_breaker.snapshot(),
+        "conversation_history_len": len(agent.conversation_history),
+        "memory": memory,
+    }
+
+
+def build_report(config: BenchmarkConfig, results: dict[str, Any]) -> dict[str, Any]:
+    """Wrap results with the metadata needed to compare runs between commits"""
+    return {
+        "benchmark": "agent_loop",
+        "version": __version__,
+        "git_commit": git_commit(),
+        "timestamp": datetime.now().isoformat(),
+        "config": asdict(config),
+        "results": results,
+    }
+
+
+def save_report(report: dict[str, Any], output: Path) -> Path:
+    """Write a report as JSON, creating the parent directory if needed"""
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    logger.info(f"Benchmark report saved: {output}")
+    return output
+
+
+# Metrics compared between reports; True means a higher value is better
+COMPARED_METRICS: dict[str, bool] = {
+    "events_per_sec": True,
+    "latency_ms.p50": False,
+    "latency_ms.p99": False,
+    "llm.calls_per_event": False,
+    "llm.prompt_chars_per_call": False,
+    "memory.growth_kb": False,
+}
+
+
+def _lookup(results: dict[str, Any], dotted: str) -> float | None:
+    value: Any = results
+    for part in dotted.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+    return None if value is None else float(value)
+
+
+def compare_reports(
+    baseline: dict[str, Any], candidate: dict[str, Any], threshold: float = 10.0
+) -> list[dict[str, Any]]:
+    """Diff two reports and flag metrics that regressed by more than ``threshold`` percent"""
+    rows = []
+    for metric, higher_is_better in COMPARED_METRICS.items():
+        before = _lookup(baseline["results"], metric)
+        after = _lookup(candidate["results"], metric)
+        if before is None or after is None:
+            continue
+        change = ((after - before) / before * 100) if before else 0.0
+        worse = -change if higher_is_better else change
+        rows.append(
+            {
+                "metric": metric,
+                "baseline": before,
+                "candidate": after,
+                "change_pct": round(change, 2),
+                "regression": worse > threshold,
+            }
+        )
+    return rows
@@ -0,0 +1,131 @@
+"""Deterministic offline stand-in for the Gemini client"""
+
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from google.api_core import exceptions
+
+
+@dataclass
+class StubResponse:
+    """Minimal response object exposing ``text`` like a Gemini response"""
+
+    text: str
+
+
+@dataclass
+class StubStats:
+    """Counters collected by the stub model"""
+
+    calls: int = 0
+    errors: int = 0
+    resource_exhausted: int = 0
+    prompt_chars: int = 0
+    models: dict[str, int] = field(default_factory=dict)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "resource_exhausted": self.resource_exhausted,
+            "prompt_chars": self.prompt_chars,
+        }
+
+
+class StubModels:
+    """Implements the ``client.models`` surface used by CoreAgent"""
+
+    def __init__(self, client: "StubClient"):
+        self._client = client
+
+    def generate_content(self, model: str, contents: Any, config: Any = None) -> StubResponse:
+        """Sleep for the configured latency, then answer, fail or report quota exhaustion"""
+        return self._client._generate(model, contents)
+
+
+@dataclass
+class StubCache:
+    """Context cache handle returned by ``StubCaches.create``"""
+
+    name: str
+
+
+class StubCaches:
+    """Implements the ``client.caches`` surface used for prompt prefix caching"""
+
+    def __init__(self, client: "StubClient"):
+        self._client = client
+        self.created = 0
+        self.deleted = 0
+
+    def create(self, model: str, config: Any = None) -> StubCache:
+        self.created += 1
+        return StubCache(name=f"cachedContents/stub-{self.created}")
+
+    def delete(self, name: str) -> None:
+        self.deleted += 1
+
+
+class StubClient:
+    """Drop-in replacement for ``genai.Client`` that never touches the network
+
+    All randomness comes from a seeded generator, so two runs with the same
+    settings and the same call order produce the same responses.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        exhausted_rate: float = 0.0,
+        completion_rate: float = 1.0,
+        retry_hint: float = 0.0,
+        context_cache: bool = False,
+        seed: int = 0,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.exhausted_rate = exhausted_rate
+        self.completion_rate = completion_rate
+        self.retry_hint = retry_hint
+        self.stats = StubStats()
+        self.models = StubModels(self)
+        if context_cache:
+            # Only exposed when enabled: PromptBuilder probes for ``caches``
+            self.caches = StubCaches(self)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _generate(self, model: str, contents: Any) -> StubResponse:
+        # Draw all random numbers under the lock so concurrent calls stay reproducible
+        with self._lock:
+            self.stats.calls += 1
+            self.stats.prompt_chars += len(str(contents))
+            self.stats.models[model] = self.stats.models.get(model, 0) + 1
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            roll = self._random.random()
+            complete = self._random.random() < self.completion_rate
+
+        if delay > 0:
+            time.sleep(delay)
+
+        if roll < self.exhausted_rate:
+            with self._lock:
+                self.stats.resource_exhausted += 1
+            raise exceptions.ResourceExhausted(
+                f"429 Resource has been exhausted (stub). Please retry in {self.retry_hint}s."
+            )
+
+        if roll < self.exhausted_rate + self.error_rate:
+            with self._lock:
+                self.stats.errors += 1
+            raise RuntimeError("Stub model error")
+
+        if complete:
+            return StubResponse(text="Acknowledged. Task complete.")
+        return StubResponse(text="Working on it, more steps are needed.")
@@ -0,0 +1,153 @@
+"""Circuit breakers for the LLM and MCP backends"""
+
+import logging
+import time
+from enum import Enum
+from typing import Any, Awaitable, Callable
+
+from .config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a backend whose breaker is open"""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} circuit open, retry in {retry_after:.1f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Fails fast while a backend is unhealthy instead of queueing more work on it
+
+    After ``failure_threshold`` consecutive failures the breaker opens for
+    ``reset_timeout`` seconds. It then lets a single probe call through
+    (half-open): success closes it, failure reopens it for twice as long, up
+    to ``max_reset_timeout``. ``trip`` opens it directly, e.g. when a quota
+    error says how long to wait.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int | None = None,
+        reset_timeout: float | None = None,
+        max_reset_timeout: float | None = None,
+    ):
+        settings = get_settings()
+        self.name = name
+        self.failure_threshold = failure_threshold or settings.circuit_failure_threshold
+        self.base_reset_timeout = reset_timeout or settings.circuit_reset_timeout
+        self.max_reset_timeout = max_reset_timeout or settings.circuit_max_reset_timeout
+
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._reset_timeout = self.base_reset_timeout
+        self._opened_until = 0.0
+        self._probing = False
+        self._probe_started = 0.0
+        self.opened_count = 0
+        self.rejected_count = 0
+
+    @property
+    def state(self) -> CircuitState:
+        if self._state is CircuitState.OPEN and time.monotonic() >= self._opened_until:
+            self._state = CircuitState.HALF_OPEN
+            self._probing = False
+        return self._state
+
+    def _probe_free(self) -> bool:
+        # A probe that never reported back (e.g. cancelled) must not wedge the breaker
+        return not self._probing or time.monotonic() - self._probe_started > self._reset_timeout
+
+    @property
+    def available(self) -> bool:
+        """Whether a call made now would be let through"""
+        state = self.state
+        return state is CircuitState.CLOSED or (
+            state is CircuitState.HALF_OPEN and self._probe_free()
+        )
+
+    @property
+    def retry_after(self) -> float:
+        return max(0.0, self._opened_until - time.monotonic())
+
+    def before_call(self) -> None:
+        """Raise ``CircuitOpenError`` unless a call may proceed"""
+        state = self.state
+        if state is CircuitState.CLOSED:
+            return
+        if state is CircuitState.HALF_OPEN and self._probe_free():
+            self._probing = True
+            self._probe_started = time.monotonic()
+            return
+        self.rejected_count += 1
+        raise self.open_error()
+
+    def open_error(self) -> CircuitOpenError:
+        return CircuitOpenError(self.name, self.retry_after)
+
+    def record_success(self) -> None:
+        if self._state is not CircuitState.CLOSED:
+            logger.info(f"{self.name} circuit closed")
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._probing = False
+        self._reset_timeout = self.base_reset_timeout
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self.state is CircuitState.HALF_OPEN:
+            self._reset_timeout = min(self._reset_timeout * 2, self.max_reset_timeout)
+            self._open(self._reset_timeout)
+        elif self._failures >= self.failure_threshold:
+            self._open(self._reset_timeout)
+
+    def trip(self, duration: float) -> None:
+        """Open the breaker for at least ``duration`` seconds"""
+        self._open(max(duration, self._reset_timeout))
+
+    def _open(self, duration: float) -> None:
+        if self._state is not CircuitState.OPEN:
+            self.opened_count += 1
+        self._state = CircuitState.OPEN
+        self._probing = False
+        self._opened_until = max(self._opened_until, time.monotonic() + duration)
+        logger.warning(f"{self.name} circuit open for {self.retry_after:.1f}s")
+
+    async def call(
+        self,
+        func: Callable[..., Awaitable[Any]],
+        *args: Any,
+        is_failure: Callable[[Any], bool] | None = None,
+        **kwargs: Any,
+    ) -> Any:
+        """Await ``func`` through the breaker; exceptions and ``is_failure`` results count"""
+        self.before_call()
+        try:
+            result = await func(*args, **kwargs)
+        except Exception:
+            self.record_failure()
+            raise
+        if is_failure is not None and is_failure(result):
+            self.record_failure()
+        else:
+            self.record_success()
+        return result
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "state": self.state.value,
+            "failures": self._failures,
+            "retry_after": round(self.retry_after, 1),
+            "opened": self.opened_count,
+            "rejected": self.rejected_count,
+        }
@@ -10,7 +10,10 @@ class Settings(BaseSettings):
     """Application configuration from .env"""
 
     # Gemini API
-    gemini_api_key: str = os.getenv("GEMINI_API_KEY")
+    gemini_api_key: str = os.getenv("GEMINI_API_KEY", "")
+    gemini_model: str = "gemini-2.5-flash"
+    gemini_context_cache: bool = True  # cache the static prompt prefix when large enough
+    gemini_context_cache_ttl: int = 3600  # seconds
 
     # Gmail Configuration
     gmail_credentials_json: str = "./credentials.json"
@@ -20,23 +23,68 @@ class Settings(BaseSettings):
     # WhatsApp Configuration
     whatsapp_api_key: str = ""
     whatsapp_webhook_url: str = "http://localhost:8000/whatsapp"
+    whatsapp_check_interval: int = 60  # seconds, safety-net poll when the webhook is up
 
     # Filesystem Watcher
     watch_directories: str = "./inbox,./tasks"
     file_monitor_interval: int = 60  # seconds
 
+    # Watcher scheduling (intervals adapt around each watcher's check interval)
+    watcher_min_interval: float = 1.0  # seconds, floor while a source is busy
+    watcher_speedup: float = 10.0  # busy sources poll up to this many times faster
+    watcher_slowdown: float = 4.0  # idle sources poll up to this many times slower
+    watcher_max_backoff: float = 1800.0  # seconds, cap on error backoff
+
     # MCP Server
     mcp_port: int = 8001
     mcp_host: str = "127.0.0.1"
 
     # Obsidian Vault
     vault_path: str = "./AI_Employee_Vault"
+    vault_cache_bytes: int = 16 * 1024 * 1024  # parsed-note cache budget
+    vault_check_interval: int = 5  # seconds between cache revalidation scans
+    approval_check_interval: int = 10  # seconds between checks of Approved/ and Rejected/
+    approval_timeout_hours: int = 24  # pending approvals are auto-rejected after this
+
+    # Durable state (event log, checkpoints)
+    data_path: str = "./data"
+    event_log_segment_bytes: int = 16 * 1024 * 1024
+    event_log_fsync_batch: int = 64
+    event_log_fsync_interval: float = 0.5  # seconds
+    event_log_retention_hours: int = 168  # checkpointed segments older than this are deleted
+    event_max_attempts: int = 3  # failures before an event is moved to the dead-letter file
+    event_idempotency_max_keys: int = 100_000  # processed-event keys remembered per consumer
 
     # Agent Configuration
     agent_name: str = "BronzeAI"
     agent_role: str = "Personal AI Employee"
     ralph_wiggum_retries: int = 10
     ralph_wiggum_timeout: int = 300  # seconds
+    prompt_handbook_chars: int = 4000  # handbook excerpt in the cached prefix, 0 = none
+    worker_processes: int = 1  # >1 runs a supervisor with N workers, 0 = one per CPU core
+
+    # Document extraction (PDF, office documents, images)
+    extraction_workers: int = 2  # processes in the extraction pool
+    extraction_memory_mb: int = 1024  # address-space cap per extraction process (POSIX only)
+    extraction_timeout: float = 60.0  # seconds before an extraction is abandoned
+    extraction_max_file_bytes: int = 50 * 1024 * 1024  # larger files are not extracted
+    extraction_max_chars: int = 500_000  # extracted text is truncated beyond this
+    extraction_chunk_chars: int = 4000  # chunk size for file reads and summaries
+    extraction_excerpt_chars: int = 1000  # leading text carried inline in file events
+    extraction_summary_chunks: int = 4  # most LLM calls spent summarising one document
+    extraction_summary_chars: int = 2000  # cap on the running summary
+
+    # Circuit breakers (Gemini and each MCP server)
+    circuit_failure_threshold: int = 5  # consecutive failures before a circuit opens
+    circuit_reset_timeout: float = 30.0  # seconds before a half-open probe
+    circuit_max_reset_timeout: float = 600.0  # seconds, cap after repeated failed probes
+    llm_max_retry_delay: float = 60.0  # longer quota waits open the circuit instead
+
+    # Load shedding
+    event_priorities: str = "gmail=high,whatsapp=normal,filesystem=low"  # source[:type]=level
+    shed_defer_backlog: int = 50  # queued events before low priority events are deferred
+    shed_drop_backlog: int = 500  # queued events before low are dropped and normal deferred
+    shed_resume_batch: int = 10  # deferred notes re-queued per tick once load drops
 
     class Config:
         env_file = ".env"
@@ -53,3 +101,9 @@ def get_vault_path() -> Path:
     """Get the Obsidian vault path"""
     settings = get_settings()
     return Path(settings.vault_path).resolve()
+
+
+def get_data_path() -> Path:
+    """Get the directory for durable agent state"""
+    settings = get_settings()
+    return Path(settings.data_path).resolve()
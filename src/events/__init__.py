@@ -0,0 +1,6 @@
+"""Durable event log, consumers and replay"""
+
+from .consumer import EventConsumer, IdempotencyStore, idempotency_key
+from .event_log import EventLog, open_event_log
+
+__all__ = ["EventLog", "EventConsumer", "IdempotencyStore", "idempotency_key", "open_event_log"]
@@ -0,0 +1,196 @@
+"""Event log consumers with checkpoints and idempotency keys"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterator
+
+from ..config import get_settings
+from .event_log import EventLog
+
+logger = logging.getLogger(__name__)
+
+
+def idempotency_key(event: dict[str, Any]) -> str:
+    """Stable key for an event: its ``id`` or a hash of its source, type and data"""
+    if event.get("id"):
+        return str(event["id"])
+    canonical = json.dumps(
+        [event.get("source"), event.get("type"), event.get("data")],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+class IdempotencyStore:
+    """Persistent set of keys whose side effects have already run
+
+    Only the newest ``max_keys`` keys are kept; older ones age out, which is
+    safe once the events they belong to are behind the checkpoint. The file
+    is rewritten without the aged-out keys once it holds twice as many lines.
+    """
+
+    def __init__(self, path: Path, max_keys: int | None = None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_keys = max_keys or get_settings().event_idempotency_max_keys
+        # Insertion ordered, so the first key is always the oldest
+        self._keys: dict[str, None] = {}
+        self._lines = 0
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        self._keys[line.rstrip("\n")] = None
+                        self._lines += 1
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._age_out()
+
+    def seen(self, key: str) -> bool:
+        """Return True if ``key`` was already recorded"""
+        return key in self._keys
+
+    def mark(self, key: str) -> None:
+        """Record ``key`` as processed"""
+        if key in self._keys:
+            return
+        self._keys[key] = None
+        self._file.write(f"{key}\n")
+        self._file.flush()
+        self._lines += 1
+        self._age_out()
+
+    def _age_out(self) -> None:
+        while len(self._keys) > self.max_keys:
+            del self._keys[next(iter(self._keys))]
+        if self._lines > 2 * self.max_keys:
+            self.compact()
+
+    def compact(self) -> None:
+        """Rewrite the key file with only the keys still held"""
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.writelines(f"{key}\n" for key in self._keys)
+        self._file.close()
+        os.replace(tmp_path, self.path)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._lines = len(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class EventConsumer:
+    """Named reader over an EventLog that tracks a committed offset
+
+    Events may be acknowledged out of order; the checkpoint only advances
+    over a contiguous run of acknowledged offsets, so anything in flight
+    during a crash is redelivered on restart (at-least-once). Redeliveries
+    are filtered with the consumer's idempotency store. An event that keeps
+    failing is written to a dead-letter file after ``max_attempts`` tries and
+    acknowledged, so it cannot hold the checkpoint back.
+    """
+
+    def __init__(
+        self,
+        log: EventLog,
+        name: str,
+        checkpoint_every: int = 16,
+        max_attempts: int | None = None,
+    ):
+        settings = get_settings()
+        self.log = log
+        self.name = name
+        self.checkpoint_every = checkpoint_every
+        self.max_attempts = max_attempts or settings.event_max_attempts
+        self.retention_seconds = settings.event_log_retention_hours * 3600
+        self.checkpoint_path = log.directory / "checkpoints" / f"{name}.json"
+        self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        self.dead_letter_path = log.directory / "dead_letter" / f"{name}.jsonl"
+        self.idempotency = IdempotencyStore(log.directory / "idempotency" / f"{name}.keys")
+
+        self.committed = self._load_checkpoint()
+        self.checkpointed = self.committed
+        self._acked: set[int] = set()
+        self._attempts: dict[int, int] = {}
+        self._uncheckpointed = 0
+
+    def _load_checkpoint(self) -> int:
+        if not self.checkpoint_path.exists():
+            return 0
+        try:
+            with open(self.checkpoint_path, "r", encoding="utf-8") as f:
+                return int(json.load(f)["offset"])
+        except (OSError, ValueError, KeyError) as e:
+            logger.error(f"Unreadable checkpoint for {self.name}, starting from 0: {e}")
+            return 0
+
+    def pending(self) -> Iterator[tuple[int, dict[str, Any]]]:
+        """Yield events at or after the committed offset"""
+        yield from self.log.read(self.committed)
+
+    def ack(self, offset: int, event: dict[str, Any] | None = None) -> None:
+        """Mark an offset as handled and advance the checkpoint if possible"""
+        if event is not None:
+            self.idempotency.mark(idempotency_key(event))
+        self._attempts.pop(offset, None)
+        if offset < self.committed:
+            return
+        self._acked.add(offset)
+        while self.committed in self._acked:
+            self._acked.discard(self.committed)
+            self.committed += 1
+            self._uncheckpointed += 1
+        if self._uncheckpointed >= self.checkpoint_every:
+            self.checkpoint()
+
+    def fail(self, offset: int, event: dict[str, Any], error: str) -> bool:
+        """Record a failed attempt; True means retry, False means it was dead-lettered"""
+        attempts = self._attempts.get(offset, 0) + 1
+        if attempts < self.max_attempts:
+            self._attempts[offset] = attempts
+            return True
+        record = {
+            "offset": offset,
+            "attempts": attempts,
+            "error": error,
+            "failed": datetime.now().isoformat(),
+            "event": event,
+        }
+        self.dead_letter_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.dead_letter_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, default=str) + "\n")
+        logger.error(f"Event at offset {offset} failed {attempts} times, moved to dead letter")
+        self.ack(offset)
+        return False
+
+    def trim_log(self) -> int:
+        """Delete log segments that are checkpointed and older than the retention period"""
+        return self.log.delete_before(
+            self.checkpointed, modified_before=time.time() - self.retention_seconds
+        )
+
+    def is_duplicate(self, event: dict[str, Any]) -> bool:
+        """True if this event's side effects already ran"""
+        return self.idempotency.seen(idempotency_key(event))
+
+    def checkpoint(self) -> None:
+        """Persist the committed offset atomically"""
+        tmp_path = self.checkpoint_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"offset": self.committed, "updated": datetime.now().isoformat()}, f)
+        os.replace(tmp_path, self.checkpoint_path)
+        self.checkpointed = self.committed
+        self._uncheckpointed = 0
+
+    def close(self) -> None:
+        self.checkpoint()
+        self.idempotency.close()
@@ -0,0 +1,198 @@
+"""Append-only, segment-based durable event log"""
+
+import json
+import logging
+import os
+import struct
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Iterator
+
+from ..config import get_data_path, get_settings
+
+logger = logging.getLogger(__name__)
+
+# offset (u64), payload length (u32), crc32 of payload (u32)
+HEADER = struct.Struct(">QII")
+SEGMENT_SUFFIX = ".log"
+
+
+class EventLog:
+    """Length-prefixed JSON records split across fixed-size segment files
+
+    Every append is flushed to the OS immediately, so a process crash never
+    loses an acknowledged event. ``fsync`` is batched: it runs after
+    ``fsync_batch`` appends or ``fsync_interval`` seconds, whichever comes
+    first, trading a small power-loss window for throughput.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        segment_bytes: int = 16 * 1024 * 1024,
+        fsync_batch: int = 64,
+        fsync_interval: float = 0.5,
+        readonly: bool = False,
+    ):
+        self.directory = Path(directory)
+        self.readonly = readonly
+        if not readonly:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes = segment_bytes
+        self.fsync_batch = fsync_batch
+        self.fsync_interval = fsync_interval
+
+        self._lock = threading.Lock()
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._segments: list[int] = self._list_segments()
+        if readonly:
+            # Readers never repair or open segments for writing; a live writer may own them
+            self._active = None
+            self._next_offset = 0
+            return
+        if not self._segments:
+            self._segments.append(0)
+        self._next_offset = self._recover(self._segments[-1])
+        self._active = open(self._segment_path(self._segments[-1]), "ab")
+
+    def _segment_path(self, base_offset: int) -> Path:
+        return self.directory / f"{base_offset:020d}{SEGMENT_SUFFIX}"
+
+    def _list_segments(self) -> list[int]:
+        return sorted(int(p.stem) for p in self.directory.glob(f"*{SEGMENT_SUFFIX}"))
+
+    def _recover(self, base_offset: int) -> int:
+        """Find the next offset in the last segment and cut off any torn tail record"""
+        path = self._segment_path(base_offset)
+        next_offset = base_offset
+        valid_size = 0
+        if path.exists():
+            for offset, _, end in self._scan(path):
+                next_offset = offset + 1
+                valid_size = end
+            if path.stat().st_size != valid_size:
+                logger.warning(f"Truncating torn tail of {path.name} at byte {valid_size}")
+                with open(path, "r+b") as f:
+                    f.truncate(valid_size)
+        return next_offset
+
+    @staticmethod
+    def _scan(path: Path, start_offset: int = 0) -> Iterator[tuple[int, bytes, int]]:
+        """Yield (offset, payload, end position) for every intact record in a segment"""
+        with open(path, "rb") as f:
+            while True:
+                header = f.read(HEADER.size)
+                if len(header) < HEADER.size:
+                    return
+                offset, length, crc = HEADER.unpack(header)
+                if offset < start_offset:
+                    f.seek(length, os.SEEK_CUR)
+                    continue
+                payload = f.read(length)
+                if len(payload) < length or zlib.crc32(payload) != crc:
+                    return
+                yield offset, payload, f.tell()
+
+    @property
+    def next_offset(self) -> int:
+        """Offset the next appended event will receive"""
+        return self._next_offset
+
+    def append(self, event: dict[str, Any]) -> int:
+        """Append an event and return its offset"""
+        if self._active is None:
+            raise RuntimeError(f"Event log opened read-only: {self.directory}")
+        payload = json.dumps(event, separators=(",", ":"), default=str).encode("utf-8")
+        with self._lock:
+            if self._active.tell() >= self.segment_bytes:
+                self._roll()
+            offset = self._next_offset
+            self._active.write(HEADER.pack(offset, len(payload), zlib.crc32(payload)))
+            self._active.write(payload)
+            self._active.flush()
+            self._next_offset += 1
+            self._unsynced += 1
+            if (
+                self._unsynced >= self.fsync_batch
+                or time.monotonic() - self._last_sync >= self.fsync_interval
+            ):
+                self._sync_locked()
+        return offset
+
+    def _roll(self) -> None:
+        self._sync_locked()
+        self._active.close()
+        self._segments.append(self._next_offset)
+        self._active = open(self._segment_path(self._next_offset), "ab")
+        logger.info(f"Event log rolled to segment {self._next_offset}")
+
+    def _sync_locked(self) -> None:
+        if self._active is None:
+            return
+        if self._unsynced:
+            os.fsync(self._active.fileno())
+            self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def sync(self) -> None:
+        """Force buffered records to disk"""
+        with self._lock:
+            self._sync_locked()
+
+    def read(self, from_offset: int = 0) -> Iterator[tuple[int, dict[str, Any]]]:
+        """Yield (offset, event) pairs starting at ``from_offset``"""
+        segments = list(self._segments)
+        # Skip whole segments that end before the requested offset
+        for index, base in enumerate(segments):
+            upper = segments[index + 1] if index + 1 < len(segments) else None
+            if upper is not None and upper <= from_offset:
+                continue
+            path = self._segment_path(base)
+            if not path.exists():
+                continue
+            for offset, payload, _ in self._scan(path, from_offset):
+                yield offset, json.loads(payload)
+
+    def delete_before(self, offset: int, modified_before: float | None = None) -> int:
+        """Remove segments whose records all precede ``offset``; returns segments removed
+
+        With ``modified_before`` (a ``time.time()`` value) only segments last
+        written before then are removed, so recent history stays replayable.
+        """
+        removed = 0
+        with self._lock:
+            while len(self._segments) > 1 and self._segments[1] <= offset:
+                path = self._segment_path(self._segments[0])
+                try:
+                    if modified_before is not None and path.stat().st_mtime >= modified_before:
+                        break
+                except FileNotFoundError:
+                    pass
+                path.unlink(missing_ok=True)
+                self._segments.pop(0)
+                removed += 1
+        if removed:
+            logger.info(f"Deleted {removed} event log segment(s) before offset {offset}")
+        return removed
+
+    def close(self) -> None:
+        """Sync and close the active segment"""
+        with self._lock:
+            if self._active is not None and not self._active.closed:
+                self._sync_locked()
+                self._active.close()
+
+
+def open_event_log(readonly: bool = False) -> EventLog:
+    """Open the agent's event log under DATA_PATH using the configured tuning"""
+    settings = get_settings()
+    return EventLog(
+        get_data_path() / "events",
+        segment_bytes=settings.event_log_segment_bytes,
+        fsync_batch=settings.event_log_fsync_batch,
+        fsync_interval=settings.event_log_fsync_interval,
+        readonly=readonly,
+    )
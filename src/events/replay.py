@@ -0,0 +1,147 @@
+"""Replay historical events from the event log against the stub model
+
+Usage: ``python -m src.events.replay --since 2026-01-17 --output replay_out``
+
+Replays run in their own vault and data directory, so decisions land in
+``<output>/vault/Brain`` and nothing touches the live vault or event log.
+The replay consumer keeps its own idempotency keys: re-running the same
+replay into the same output skips events already replayed unless
+``--force`` is given.
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Any, Iterator
+
+from .consumer import EventConsumer, IdempotencyStore, idempotency_key
+from .event_log import EventLog, open_event_log
+
+logger = logging.getLogger(__name__)
+
+
+def select_events(
+    log: EventLog,
+    from_offset: int = 0,
+    to_offset: int | None = None,
+    since: str | None = None,
+    until: str | None = None,
+    sources: list[str] | None = None,
+    limit: int | None = None,
+) -> Iterator[tuple[int, dict[str, Any]]]:
+    """Filter logged events by offset range, ISO timestamp range and source"""
+    count = 0
+    for offset, event in log.read(from_offset):
+        if to_offset is not None and offset >= to_offset:
+            return
+        timestamp = str(event.get("timestamp", ""))
+        if since and timestamp < since:
+            continue
+        if until and timestamp >= until:
+            continue
+        if sources and event.get("source") not in sources:
+            continue
+        yield offset, event
+        count += 1
+        if limit is not None and count >= limit:
+            return
+
+
+async def replay(
+    events: list[tuple[int, dict[str, Any]]],
+    agent: Any,
+    idempotency: IdempotencyStore,
+    force: bool = False,
+) -> dict[str, Any]:
+    """Run events through ``agent.process_event`` as fast as the stub allows"""
+    replayed = skipped = 0
+    started = time.perf_counter()
+    for offset, event in events:
+        key = idempotency_key(event)
+        if idempotency.seen(key) and not force:
+            skipped += 1
+            continue
+        await agent.process_event(event)
+        idempotency.mark(key)
+        replayed += 1
+    duration = time.perf_counter() - started
+    return {
+        "replayed": replayed,
+        "skipped": skipped,
+        "duration_s": round(duration, 3),
+        "events_per_sec": round(replayed / duration, 2) if duration else 0.0,
+    }
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.events.replay", description="Replay logged events"
+    )
+    parser.add_argument(
+        "--log-dir", type=Path, help="Event log directory (default: DATA_PATH/events)"
+    )
+    parser.add_argument("--output", type=Path, default=Path("replay_out"))
+    parser.add_argument("--from-offset", type=int, default=0)
+    parser.add_argument("--to-offset", type=int)
+    parser.add_argument("--since", help="ISO timestamp lower bound (inclusive)")
+    parser.add_argument("--until", help="ISO timestamp upper bound (exclusive)")
+    parser.add_argument("--sources", help="Comma-separated sources, e.g. gmail,whatsapp")
+    parser.add_argument("--limit", type=int)
+    parser.add_argument("--latency", type=float, default=0.0, help="Stub model latency (s)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--force", action="store_true", help="Ignore replay idempotency keys")
+    parser.add_argument("--log-level", default="WARNING")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    logging.basicConfig(level=args.log_level.upper(), format="%(levelname)s - %(message)s")
+
+    from ..benchmarks.runner import build_stub_agent, scoped_env
+    from ..benchmarks.stub_model import StubClient
+
+    log = EventLog(args.log_dir, readonly=True) if args.log_dir else open_event_log(readonly=True)
+    events = list(
+        select_events(
+            log,
+            from_offset=args.from_offset,
+            to_offset=args.to_offset,
+            since=args.since,
+            until=args.until,
+            sources=args.sources.split(",") if args.sources else None,
+            limit=args.limit,
+        )
+    )
+    if not events:
+        print("No events matched")
+        return 0
+
+    output = args.output.resolve()
+    client = StubClient(latency=args.latency, seed=args.seed)
+    with scoped_env(VAULT_PATH=str(output / "vault"), DATA_PATH=str(output / "data")):
+        agent = build_stub_agent(client)
+    replay_consumer = EventConsumer(agent.event_log, "replay")
+    try:
+        summary = asyncio.run(
+            replay(events, agent, replay_consumer.idempotency, force=args.force)
+        )
+    finally:
+        replay_consumer.close()
+        agent.event_consumer.close()
+        agent.event_log.close()
+
+    print(
+        f"Replayed {summary['replayed']} event(s), skipped {summary['skipped']} "
+        f"in {summary['duration_s']}s ({summary['events_per_sec']} events/sec, "
+        f"{client.stats.calls} model calls)"
+    )
+    print(f"Decisions written to {output / 'vault' / 'Brain'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
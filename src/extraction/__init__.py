@@ -0,0 +1,14 @@
+"""Text extraction, caching and chunking for documents and attachments"""
+
+from .extractors import ExtractedText, detect_format, extract_file
+from .pipeline import Document, ExtractionPipeline, chunk_stream, chunk_text
+
+__all__ = [
+    "Document",
+    "ExtractedText",
+    "ExtractionPipeline",
+    "chunk_stream",
+    "chunk_text",
+    "detect_format",
+    "extract_file",
+]
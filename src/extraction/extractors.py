@@ -0,0 +1,178 @@
+"""Text extractors for the document formats that arrive in the inbox"""
+
+import re
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterator
+from xml.etree import ElementTree
+
+# Optional: PDF text needs pypdf, image metadata needs Pillow, OCR also needs pytesseract
+try:
+    from pypdf import PdfReader  # pyright: ignore[reportMissingImports]
+except ImportError:
+    PdfReader = None
+try:
+    from PIL import Image  # pyright: ignore[reportMissingImports]
+except ImportError:
+    Image = None
+try:
+    import pytesseract  # pyright: ignore[reportMissingImports]
+except ImportError:
+    pytesseract = None
+
+SNIFF_BYTES = 8192
+SLIDE_RE = re.compile(r"ppt/slides/slide(\d+)\.xml")
+WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+DRAWING_NS = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+SHEET_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+
+FORMATS = {
+    ".pdf": "pdf",
+    ".docx": "docx",
+    ".pptx": "pptx",
+    ".xlsx": "xlsx",
+    ".png": "image",
+    ".jpg": "image",
+    ".jpeg": "image",
+    ".gif": "image",
+    ".bmp": "image",
+    ".tif": "image",
+    ".tiff": "image",
+    ".webp": "image",
+}
+
+
+@dataclass(frozen=True)
+class ExtractedText:
+    """Text pulled out of one file, already cut to the character limit
+
+    ``ok`` is False when the extractor could not do its job (missing optional
+    dependency, corrupt file, timeout); such results are never cached.
+    """
+
+    format: str
+    text: str
+    truncated: bool = False
+    note: str = ""
+    ok: bool = True
+
+
+def detect_format(path: Path) -> str:
+    """Extractor name for a file, by extension; everything else is tried as text"""
+    return FORMATS.get(path.suffix.lower(), "text")
+
+
+def _collect(pieces: Iterator[str], max_chars: int) -> tuple[str, bool]:
+    """Join text pieces, stopping as soon as ``max_chars`` is exceeded"""
+    parts: list[str] = []
+    total = 0
+    for piece in pieces:
+        if not piece:
+            continue
+        parts.append(piece)
+        total += len(piece) + 1
+        if total > max_chars:
+            return "\n".join(parts)[:max_chars], True
+    return "\n".join(parts), False
+
+
+def _text(path: Path, max_chars: int) -> ExtractedText:
+    with open(path, "rb") as f:
+        # UTF-8 needs at most four bytes per character
+        raw = f.read(max_chars * 4 + 1)
+    if b"\x00" in raw[:SNIFF_BYTES]:
+        return ExtractedText("binary", "", note="binary file, no text extracted")
+    text = raw.decode("utf-8", errors="replace")
+    return ExtractedText("text", text[:max_chars], len(text) > max_chars)
+
+
+def _pdf(path: Path, max_chars: int) -> ExtractedText:
+    if PdfReader is None:
+        return ExtractedText("pdf", "", note="install pypdf to extract PDF text", ok=False)
+    reader = PdfReader(path)
+    text, truncated = _collect((page.extract_text() or "" for page in reader.pages), max_chars)
+    note = f"{len(reader.pages)} page(s)"
+    if not text.strip():
+        note += ", no text layer (scanned?)"
+    return ExtractedText("pdf", text, truncated, note)
+
+
+def _xml_paragraphs(source, paragraph_tag: str, text_tag: str) -> Iterator[str]:
+    """Stream paragraph text out of an XML part without building the whole tree"""
+    for _, element in ElementTree.iterparse(source):
+        if element.tag == paragraph_tag:
+            yield "".join(node.text or "" for node in element.iter(text_tag))
+            element.clear()
+
+
+def _docx(path: Path, max_chars: int) -> ExtractedText:
+    with zipfile.ZipFile(path) as archive, archive.open("word/document.xml") as part:
+        text, truncated = _collect(
+            _xml_paragraphs(part, f"{WORD_NS}p", f"{WORD_NS}t"), max_chars
+        )
+    return ExtractedText("docx", text, truncated)
+
+
+def _pptx(path: Path, max_chars: int) -> ExtractedText:
+    with zipfile.ZipFile(path) as archive:
+        slides = sorted(
+            (name for name in archive.namelist() if SLIDE_RE.fullmatch(name)),
+            key=lambda name: int(SLIDE_RE.fullmatch(name).group(1)),
+        )
+
+        def pieces() -> Iterator[str]:
+            for number, name in enumerate(slides, 1):
+                yield f"## Slide {number}"
+                with archive.open(name) as part:
+                    yield from _xml_paragraphs(part, f"{DRAWING_NS}p", f"{DRAWING_NS}t")
+
+        text, truncated = _collect(pieces(), max_chars)
+    return ExtractedText("pptx", text, truncated, f"{len(slides)} slide(s)")
+
+
+def _xlsx(path: Path, max_chars: int) -> ExtractedText:
+    # Cell text lives in the shared strings table; numbers and formulas are skipped
+    with zipfile.ZipFile(path) as archive:
+        if "xl/sharedStrings.xml" not in archive.namelist():
+            return ExtractedText("xlsx", "", note="no text cells")
+        with archive.open("xl/sharedStrings.xml") as part:
+            text, truncated = _collect(
+                _xml_paragraphs(part, f"{SHEET_NS}si", f"{SHEET_NS}t"), max_chars
+            )
+    return ExtractedText("xlsx", text, truncated, "text cells only")
+
+
+def _image(path: Path, max_chars: int) -> ExtractedText:
+    if Image is None:
+        return ExtractedText("image", "", note="install Pillow to inspect images", ok=False)
+    with Image.open(path) as image:
+        note = f"{image.width}x{image.height} {image.format or 'image'}"
+        if pytesseract is None:
+            note = f"{note}, OCR unavailable (pytesseract)"
+            return ExtractedText("image", "", note=note, ok=False)
+        text = pytesseract.image_to_string(image)
+    return ExtractedText("image", text[:max_chars], len(text) > max_chars, note)
+
+
+EXTRACTORS: dict[str, Callable[[Path, int], ExtractedText]] = {
+    "text": _text,
+    "pdf": _pdf,
+    "docx": _docx,
+    "pptx": _pptx,
+    "xlsx": _xlsx,
+    "image": _image,
+}
+
+
+def extract_file(path: str, max_chars: int) -> ExtractedText:
+    """Extract up to ``max_chars`` of text from a file; runs inside pool processes"""
+    file_path = Path(path)
+    kind = detect_format(file_path)
+    try:
+        return EXTRACTORS[kind](file_path, max_chars)
+    except MemoryError:
+        return ExtractedText(kind, "", note="extraction exceeded the memory limit", ok=False)
+    except Exception as e:
+        # Corrupt or unexpected documents: pypdf, zipfile and the XML parser all raise here
+        return ExtractedText(kind, "", note=f"extraction failed: {e}", ok=False)
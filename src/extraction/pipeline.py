@@ -0,0 +1,356 @@
+"""Document extraction in a memory-capped process pool with a content-hash cache"""
+
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import time
+from dataclasses import asdict, dataclass, replace
+from functools import partial
+from itertools import islice
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from ..config import get_data_path, get_settings
+from ..watchers.file_index import hash_file
+from .extractors import ExtractedText, detect_format, extract_file
+
+# RLIMIT_AS is POSIX-only; on Windows the pool runs without a memory cap
+try:
+    import resource
+except ImportError:
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+MAX_TASKS_PER_CHILD = 50  # recycle pool processes so parser leaks don't accumulate
+TIMEOUT_RETRY_AFTER = 600.0  # seconds before a document that timed out is tried again
+
+
+class PoolReplaced(Exception):
+    """A pool task was lost because the pool was terminated under it"""
+
+
+@dataclass(frozen=True)
+class Document:
+    """Metadata for a cached extraction; the text itself stays on disk"""
+
+    digest: str
+    path: str
+    format: str
+    chars: int
+    chunks: int
+    truncated: bool = False
+    note: str = ""
+    summary: str | None = None
+
+    def metadata(self) -> dict[str, Any]:
+        """Fields worth carrying in an event (no text, no summary)"""
+        return {
+            "format": self.format,
+            "chars": self.chars,
+            "chunks": self.chunks,
+            "truncated": self.truncated,
+            "note": self.note,
+        }
+
+
+def chunk_text(text: str, size: int) -> Iterator[str]:
+    """Split text into chunks of at most ``size`` characters, preferring paragraph breaks"""
+    return chunk_stream((text,), size)
+
+
+def chunk_stream(blocks: Iterable[str], size: int) -> Iterator[str]:
+    """``chunk_text`` over text that arrives in blocks, holding about one chunk at a time
+
+    The chunks are the same however the text is split into blocks.
+    """
+    size = max(size, 1)
+    blocks = iter(blocks)
+    buffer, pos, done = "", 0, False
+    current: list[str] = []
+    length = 0
+    while True:
+        end = buffer.find("\n\n", pos)
+        if end == -1 and not done:
+            # One spare character: the last one may start a paragraph break
+            if len(buffer) - pos <= size + 1:
+                block = next(blocks, None)
+                if block is None:
+                    done = True
+                else:
+                    buffer, pos = buffer[pos:] + block, 0
+                continue
+            # An unfinished paragraph already too long for a chunk is cut right away
+            paragraph, pos = buffer[pos:], len(buffer)
+        elif end == -1:
+            paragraph, pos = buffer[pos:], len(buffer)
+        else:
+            paragraph, pos = buffer[pos:end], end + 2
+        finished = end != -1 or done
+
+        while len(paragraph) > size:
+            # A paragraph that cannot fit anywhere is cut at the last line break or hard
+            if not finished and len(paragraph) <= size + 1:
+                break
+            cut = paragraph.rfind("\n", 0, size)
+            cut = cut if cut > 0 else size
+            if current:
+                yield "\n\n".join(current)
+                current, length = [], 0
+            yield paragraph[:cut]
+            paragraph = paragraph[cut:].lstrip("\n")
+        if not finished:
+            buffer, pos = paragraph, 0
+            continue
+        # ``length`` already counts a separator after each paragraph held
+        if current and length + len(paragraph) > size:
+            yield "\n\n".join(current)
+            current, length = [], 0
+        if paragraph.strip():
+            current.append(paragraph)
+            length += len(paragraph) + 2
+        if end == -1:
+            break
+    if current:
+        yield "\n\n".join(current)
+
+
+def _settle(future: asyncio.Future, outcome: Any) -> None:
+    """Complete a pool task's future from the event loop thread"""
+    if future.done():
+        return
+    if isinstance(outcome, BaseException):
+        future.set_exception(outcome)
+    else:
+        future.set_result(outcome)
+
+
+def _limit_memory(limit_bytes: int) -> None:
+    """Pool initializer: cap the process's address space so one document can't exhaust RAM"""
+    if resource is None or limit_bytes <= 0:
+        return
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        limit_bytes = min(limit_bytes, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit_bytes, hard))
+
+
+class ExtractionPipeline:
+    """Extracts, caches and chunks text from documents (PDF, office files, images)
+
+    Extraction runs in a small ``spawn`` process pool whose processes are
+    capped with ``RLIMIT_AS`` and abandoned after ``extraction_timeout``, so
+    a malformed or huge file costs at most one pool restart; tasks that were
+    still running on a replaced pool are resubmitted once. Successful results
+    are cached on disk by BLAKE2b content digest: a file seen before, renamed
+    or re-delivered, is never extracted twice, and worker processes share the
+    cache with the supervisor. Failures are not cached, except that a timed
+    out document is skipped for ``TIMEOUT_RETRY_AFTER`` seconds. Small
+    plain-text files skip the pool.
+
+    Daemon processes (supervisor workers) cannot own a pool and extract in a
+    thread instead: the timeout still applies, but there is no memory cap.
+    The supervisor extracts watched files itself, so workers normally only
+    read the cache.
+
+    Callers get a ``Document`` (metadata only) and stream the text back with
+    ``iter_chunks`` so nothing downstream has to hold a whole document.
+    """
+
+    def __init__(self, cache_path: Path | None = None):
+        self.settings = get_settings()
+        self.cache_path = cache_path or get_data_path() / "extracted"
+        self.cache_path.mkdir(parents=True, exist_ok=True)
+        self._context = multiprocessing.get_context("spawn")
+        self._pool: Any = None
+        self._in_flight: set[asyncio.Future] = set()
+        self._timed_out: dict[str, float] = {}
+        self.stats = {"hits": 0, "extracted": 0, "failed": 0}
+
+    def _meta_path(self, digest: str) -> Path:
+        return self.cache_path / f"{digest}.json"
+
+    def _text_path(self, digest: str) -> Path:
+        return self.cache_path / f"{digest}.txt"
+
+    def get(self, digest: str) -> Document | None:
+        """Cached extraction for a content digest, if any"""
+        try:
+            with open(self._meta_path(digest), "r", encoding="utf-8") as f:
+                return Document(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def _write_meta(self, document: Document) -> None:
+        # Write-then-rename so another process never reads half a record
+        tmp = self._meta_path(document.digest).with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(asdict(document), f)
+        os.replace(tmp, self._meta_path(document.digest))
+
+    def _document(self, digest: str, path: Path, result: ExtractedText) -> Document:
+        return Document(
+            digest=digest,
+            path=str(path),
+            format=result.format,
+            chars=len(result.text),
+            chunks=sum(1 for _ in chunk_text(result.text, self.settings.extraction_chunk_chars)),
+            truncated=result.truncated,
+            note=result.note,
+        )
+
+    def _store(self, digest: str, path: Path, result: ExtractedText) -> Document:
+        tmp = self._text_path(digest).with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(result.text)
+        os.replace(tmp, self._text_path(digest))
+        document = self._document(digest, path, result)
+        self._write_meta(document)
+        return document
+
+    async def extract(self, path: Path, digest: str | None = None) -> Document:
+        """Extract a file's text (or reuse the cached extraction) and return its metadata"""
+        path = Path(path)
+        if digest is None:
+            digest = await asyncio.to_thread(hash_file, path)
+        cached = self.get(digest)
+        if cached is not None:
+            self.stats["hits"] += 1
+            return replace(cached, path=str(path))
+
+        size = path.stat().st_size
+        kind = detect_format(path)
+        max_chars = self.settings.extraction_max_chars
+        if time.monotonic() < self._timed_out.get(digest, 0.0):
+            result = ExtractedText(kind, "", note="extraction timed out recently", ok=False)
+        elif size > self.settings.extraction_max_file_bytes:
+            note = f"not extracted, file is {size} bytes"
+            result = ExtractedText(kind, "", note=note, ok=False)
+        elif kind == "text" and size <= self.settings.extraction_chunk_chars:
+            # Not worth a round trip through the pool
+            result = await asyncio.to_thread(extract_file, str(path), max_chars)
+        else:
+            result = await self._run_in_pool(path, digest, kind, max_chars)
+
+        if not result.ok:
+            # Not cached: a retry may succeed once a dependency is installed or load drops
+            self.stats["failed"] += 1
+            logger.info(f"No text extracted from {path.name}: {result.note}")
+            return self._document(digest, path, result)
+        self._timed_out.pop(digest, None)
+        self.stats["extracted"] += 1
+        return await asyncio.to_thread(self._store, digest, path, result)
+
+    def _get_pool(self) -> Any:
+        if self._pool is None:
+            self._pool = self._context.Pool(
+                processes=self.settings.extraction_workers,
+                initializer=_limit_memory,
+                initargs=(self.settings.extraction_memory_mb * 1024 * 1024,),
+                maxtasksperchild=MAX_TASKS_PER_CHILD,
+            )
+        return self._pool
+
+    async def _run_in_pool(
+        self, path: Path, digest: str, kind: str, max_chars: int
+    ) -> ExtractedText:
+        if multiprocessing.current_process().daemon:
+            return await self._run_in_thread(path, digest, kind, max_chars)
+
+        loop = asyncio.get_running_loop()
+        # A task lost to another extraction's pool restart gets one more try
+        for _ in range(2):
+            future: asyncio.Future[ExtractedText] = loop.create_future()
+            self._in_flight.add(future)
+            self._get_pool().apply_async(
+                extract_file,
+                (str(path), max_chars),
+                callback=partial(loop.call_soon_threadsafe, _settle, future),
+                error_callback=partial(loop.call_soon_threadsafe, _settle, future),
+            )
+            try:
+                return await asyncio.wait_for(future, self.settings.extraction_timeout)
+            except PoolReplaced:
+                logger.info(f"Resubmitting extraction of {path.name} to the new pool")
+            except asyncio.TimeoutError:
+                # A pool process can't be cancelled on its own; replace the whole pool
+                logger.error(f"Extraction of {path.name} timed out; restarting the extraction pool")
+                self._timed_out[digest] = time.monotonic() + TIMEOUT_RETRY_AFTER
+                self._restart_pool()
+                return ExtractedText(kind, "", note="extraction timed out", ok=False)
+            except Exception as e:
+                logger.error(f"Extraction of {path.name} failed: {e}")
+                return ExtractedText(kind, "", note=f"extraction failed: {e}", ok=False)
+            finally:
+                self._in_flight.discard(future)
+        return ExtractedText(kind, "", note="extraction pool was restarted twice", ok=False)
+
+    async def _run_in_thread(
+        self, path: Path, digest: str, kind: str, max_chars: int
+    ) -> ExtractedText:
+        # Supervisor workers are daemons and may not start a pool. The thread has no
+        # memory cap and cannot be killed, so only the caller's wait is bounded
+        try:
+            return await asyncio.wait_for(
+                asyncio.to_thread(extract_file, str(path), max_chars),
+                self.settings.extraction_timeout,
+            )
+        except asyncio.TimeoutError:
+            logger.error(f"Extraction of {path.name} timed out in a worker thread")
+            self._timed_out[digest] = time.monotonic() + TIMEOUT_RETRY_AFTER
+            return ExtractedText(kind, "", note="extraction timed out", ok=False)
+
+    def _restart_pool(self) -> None:
+        """Terminate the pool and fail the tasks still on it so their callers resubmit"""
+        for future in self._in_flight:
+            _settle(future, PoolReplaced())
+        self.close()
+
+    def read_text(self, digest: str) -> str:
+        try:
+            with open(self._text_path(digest), "r", encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return ""
+
+    def iter_chunks(self, digest: str) -> Iterator[str]:
+        """Stream a cached document's text in ``extraction_chunk_chars`` pieces
+
+        The text file is read a block at a time, so only about one chunk is
+        held in memory however long the document is.
+        """
+        size = self.settings.extraction_chunk_chars
+        try:
+            f = open(self._text_path(digest), "r", encoding="utf-8")
+        except OSError:
+            return
+        with f:
+            yield from chunk_stream(iter(partial(f.read, size), ""), size)
+
+    def read_chunk(self, digest: str, index: int) -> str | None:
+        """One chunk of a cached document, or None if there is no such chunk"""
+        return next(islice(self.iter_chunks(digest), index, None), None)
+
+    def excerpt(self, digest: str) -> str:
+        """Leading text of a cached document, short enough to carry in an event"""
+        limit = self.settings.extraction_excerpt_chars
+        try:
+            with open(self._text_path(digest), "r", encoding="utf-8") as f:
+                text = f.read(limit + 1)
+        except OSError:
+            return ""
+        return text if len(text) <= limit else text[:limit] + "..."
+
+    def set_summary(self, digest: str, summary: str) -> None:
+        """Remember a document summary so the same content is never summarised twice"""
+        document = self.get(digest)
+        if document is not None:
+            self._write_meta(replace(document, summary=summary))
+
+    def close(self) -> None:
+        """Stop the pool processes; the next extraction starts a fresh pool"""
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool = None
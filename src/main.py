@@ -1,5 +1,6 @@
 """Bronze Tier: Personal AI Employee - Entry Point"""
 
+import argparse
 import asyncio
 import logging
 import sys
@@ -10,6 +11,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.agents.core_agent import CoreAgent
 from src.config import get_settings
+from src.workers import Supervisor
 
 # Configure logging
 logging.basicConfig(
@@ -19,9 +21,22 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def parse_args() -> argparse.Namespace:
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Bronze Tier AI Employee")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Worker processes (1 = single process, 0 = one per CPU core)",
+    )
+    return parser.parse_args()
+
+
 async def main() -> None:
     """Main entry point"""
     settings = get_settings()
+    args = parse_args()
+    workers = args.workers if args.workers is not None else settings.worker_processes
 
     print(f"""
     ╔═══════════════════════════════════════════════════╗
@@ -34,6 +49,13 @@ async def main() -> None:
     logger.info(f"Starting {settings.agent_name}...")
     logger.info(f"Vault location: {settings.vault_path}")
 
+    if workers != 1:
+        # Supervisor mode: watchers here, agents in separate processes
+        supervisor = Supervisor(num_workers=workers or None)
+        logger.info(f"Running in supervisor mode with {supervisor.num_workers} workers")
+        await supervisor.run()
+        return
+
     # Initialize and run agent
     agent = CoreAgent()
     await agent.run()
@@ -2,20 +2,29 @@
 
 import logging
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
+from ..circuit_breaker import CircuitBreaker, CircuitOpenError
 from ..config import get_settings
 
+if TYPE_CHECKING:
+    from ..agents.approvals import ApprovalQueue
+
 logger = logging.getLogger(__name__)
 
 
 class MCPServer(ABC):
     """Abstract base class for MCP servers"""
 
+    # Actions that must be approved by a human before ``submit`` runs them
+    sensitive_actions: frozenset[str] = frozenset()
+
     def __init__(self, name: str):
         self.settings = get_settings()
         self.name = name
         self.is_running = False
+        self.approvals: "ApprovalQueue | None" = None
+        self.breaker = CircuitBreaker(name)
         logger.info(f"MCP Server initialized: {name}")
 
     @abstractmethod
@@ -28,6 +37,28 @@ class MCPServer(ABC):
         """Handle incoming MCP request"""
         pass
 
+    def is_backend_failure(self, result: dict[str, Any]) -> bool:
+        """Whether an error result should count against the circuit breaker"""
+        return result.get("status") == "error"
+
+    async def call(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Handle a request through this server's circuit breaker"""
+        try:
+            return await self.breaker.call(
+                self.handle_request, request, is_failure=self.is_backend_failure
+            )
+        except CircuitOpenError as e:
+            return {"status": "error", "error": str(e), "retry_after": e.retry_after}
+
+    async def submit(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Entry point for agent-initiated requests; sensitive actions wait for approval"""
+        if request.get("action") not in self.sensitive_actions:
+            return await self.call(request)
+        if self.approvals is None:
+            logger.error(f"{self.name}: {request.get('action')} requires approval, none configured")
+            return {"status": "error", "error": "Action requires approval"}
+        return await self.approvals.park(self.name, request)
+
     async def start(self) -> None:
         """Start the MCP server"""
         self.is_running = True
@@ -11,6 +11,8 @@ logger = logging.getLogger(__name__)
 class EmailMCPServer(MCPServer):
     """MCP server for sending emails and attachments"""
 
+    sensitive_actions = frozenset({"send_email"})
+
     def __init__(self):
         super().__init__("EmailMCP")
 
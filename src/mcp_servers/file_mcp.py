@@ -2,31 +2,42 @@
 
 import logging
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from .base_server import MCPServer
 
+if TYPE_CHECKING:
+    from ..extraction import ExtractionPipeline
+
 logger = logging.getLogger(__name__)
 
 
 class FileMCPServer(MCPServer):
     """MCP server for file operations"""
 
-    def __init__(self):
+    def __init__(self, extraction: "ExtractionPipeline | None" = None):
         super().__init__("FileMCP")
+        self.extraction = extraction
 
     async def initialize(self) -> bool:
         """Initialize file service"""
         logger.info("Initializing file service...")
         return True
 
-    async def read_file(self, file_path: str) -> dict[str, Any]:
-        """Read file content"""
+    def is_backend_failure(self, result: dict[str, Any]) -> bool:
+        # Missing files and bad paths are per-request errors, not an unhealthy backend
+        return False
+
+    async def read_file(self, file_path: str, chunk: int | None = None) -> dict[str, Any]:
+        """Read file content; with an extraction pipeline, documents are read as text"""
         try:
             path = Path(file_path)
             if not path.exists():
                 return {"status": "error", "error": f"File not found: {file_path}"}
 
+            if self.extraction is not None:
+                return await self._read_document(path, chunk)
+
             with open(path, "r", encoding="utf-8") as f:
                 content = f.read()
 
@@ -35,6 +46,20 @@ class FileMCPServer(MCPServer):
             logger.error(f"Failed to read file: {e}")
             return {"status": "error", "error": str(e)}
 
+    async def _read_document(self, path: Path, chunk: int | None) -> dict[str, Any]:
+        """Extracted text of any supported file, one chunk at a time (chunk 0 by default)"""
+        document = await self.extraction.extract(path)
+        result = {"status": "success", **document.metadata(), "total_chunks": document.chunks}
+        chunk = chunk or 0
+        if document.chunks == 0 and chunk == 0:
+            result.update(chunk=0, content="")
+            return result
+        if not 0 <= chunk < document.chunks:
+            last = document.chunks - 1
+            return {"status": "error", "error": f"Chunk {chunk} out of range (0-{last})"}
+        result.update(chunk=chunk, content=self.extraction.read_chunk(document.digest, chunk) or "")
+        return result
+
     async def write_file(self, file_path: str, content: str) -> dict[str, Any]:
         """Write to file"""
         try:
@@ -55,7 +80,7 @@ class FileMCPServer(MCPServer):
         action = request.get("action")
 
         if action == "read":
-            return await self.read_file(request.get("file_path"))
+            return await self.read_file(request.get("file_path"), request.get("chunk"))
 
         if action == "write":
             return await self.write_file(
@@ -1,7 +1,24 @@
 """Watcher modules for event detection"""
 
+from .approval_watcher import ApprovalWatcher
+from .base_watcher import BaseWatcher
+from .file_index import ChangeKind, FileChange, FileIndex
 from .fs_watcher import FileSystemWatcher
 from .gmail_watcher import GmailWatcher
+from .runtime import PollPolicy, WatcherRuntime
+from .vault_watcher import VaultWatcher
 from .whatsapp_watcher import WhatsAppWatcher
 
-__all__ = ["FileSystemWatcher", "GmailWatcher", "WhatsAppWatcher"]
+__all__ = [
+    "ApprovalWatcher",
+    "BaseWatcher",
+    "ChangeKind",
+    "FileChange",
+    "FileIndex",
+    "FileSystemWatcher",
+    "GmailWatcher",
+    "PollPolicy",
+    "VaultWatcher",
+    "WatcherRuntime",
+    "WhatsAppWatcher",
+]
@@ -0,0 +1,34 @@
+"""Watches the vault for human approval decisions"""
+
+import logging
+from typing import TYPE_CHECKING
+
+from .base_watcher import BaseWatcher
+from .runtime import PollPolicy
+
+if TYPE_CHECKING:
+    from ..agents.approvals import ApprovalQueue
+
+logger = logging.getLogger(__name__)
+
+
+class ApprovalWatcher(BaseWatcher):
+    """Resumes parked actions once their notes move to Approved/ or Rejected/"""
+
+    source = "approvals"
+
+    def __init__(self, queue: "ApprovalQueue"):
+        super().__init__()
+        self.queue = queue
+        self.check_interval = self.settings.approval_check_interval
+
+    def poll_policy(self) -> PollPolicy:
+        return PollPolicy.from_base(self.check_interval)
+
+    async def start(self) -> None:
+        self.queue.load()
+        logger.info(f"Approval watcher started (check interval: {self.check_interval}s)")
+
+    async def poll(self) -> int:
+        """Resolve decided or expired approvals"""
+        return await self.queue.check_decisions()
@@ -0,0 +1,81 @@
+"""Shared plumbing for event watchers"""
+
+import logging
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Awaitable, Callable
+
+from ..config import get_settings
+from .runtime import PollPolicy, WatcherRuntime
+
+logger = logging.getLogger(__name__)
+
+EventHandler = Callable[[dict[str, Any]], Awaitable[Any]]
+
+
+class BaseWatcher(ABC):
+    """Base class for watchers that report events to the agent
+
+    Subclasses implement ``poll``; a ``WatcherRuntime`` decides when to call it.
+    """
+
+    source = "base"
+
+    def __init__(self):
+        self.settings = get_settings()
+        self.is_running = False
+        self.on_event: EventHandler | None = None
+        # Set when events are pushed to us (e.g. a webhook); polling then only
+        # runs at the policy's maximum interval as a safety net
+        self.push_enabled = False
+        self.runtime: WatcherRuntime | None = None
+
+    @abstractmethod
+    async def poll(self) -> int:
+        """Check the source once and return how many events were emitted"""
+        pass
+
+    def poll_policy(self) -> PollPolicy:
+        """Polling intervals for this watcher"""
+        return PollPolicy.from_base(60)
+
+    async def start(self) -> None:
+        """One-time setup before the first poll (authentication, webhooks)"""
+        pass
+
+    def request_poll(self) -> None:
+        """Push hook: ask the runtime to poll this watcher now"""
+        if self.runtime is not None:
+            self.runtime.wake(self)
+
+    async def watch(self) -> None:
+        """Run this watcher on its own runtime"""
+        await WatcherRuntime([self]).run()
+
+    def stop(self) -> None:
+        """Stop watching"""
+        self.is_running = False
+        if self.runtime is not None:
+            self.runtime.refresh()
+        logger.info(f"{self.source} watcher stopped")
+
+    def build_event(
+        self, event_type: str, data: dict[str, Any], event_id: str | None = None
+    ) -> dict[str, Any]:
+        """Wrap watcher data in the common event envelope"""
+        return {
+            "id": event_id,
+            "source": self.source,
+            "type": event_type,
+            "timestamp": datetime.now().isoformat(),
+            "data": data,
+        }
+
+    async def emit(
+        self, event_type: str, data: dict[str, Any], event_id: str | None = None
+    ) -> None:
+        """Hand an event to the registered handler (the agent's durable event log)"""
+        if self.on_event is None:
+            logger.debug(f"No event handler attached to {self.source} watcher, dropping event")
+            return
+        await self.on_event(self.build_event(event_type, data, event_id))
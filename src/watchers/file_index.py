@@ -0,0 +1,174 @@
+"""Content-hash index used to classify filesystem changes"""
+
+import difflib
+import hashlib
+import logging
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+TEXT_SNAPSHOT_LIMIT = 64 * 1024  # bytes; larger files get no diff summary
+MAX_SNAPSHOTS = 256
+MAX_DIFF_LINES = 20
+
+
+class ChangeKind(str, Enum):
+    """How a file differs from what the index last saw"""
+
+    NEW = "new"
+    MODIFIED = "modified"
+    METADATA = "metadata"
+    RENAMED = "renamed"
+
+
+@dataclass(frozen=True)
+class FileState:
+    """Last known size, mtime and content digest of a file"""
+
+    size: int
+    mtime_ns: int
+    digest: str
+
+
+@dataclass
+class FileChange:
+    """A classified change to a watched file"""
+
+    path: Path
+    kind: ChangeKind
+    state: FileState
+    previous_path: Path | None = None
+    diff: str | None = None
+
+    @property
+    def is_content_change(self) -> bool:
+        """True for changes the agent should see (new or different bytes)"""
+        return self.kind in (ChangeKind.NEW, ChangeKind.MODIFIED)
+
+
+def hash_file(path: Path, chunk_size: int = CHUNK_SIZE) -> str:
+    """Stream a file through BLAKE2b and return the hex digest"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _read_text(path: Path, size: int) -> str | None:
+    if size > TEXT_SNAPSHOT_LIMIT:
+        return None
+    try:
+        return path.read_bytes().decode("utf-8")
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def diff_summary(old: str, new: str, name: str = "file") -> str:
+    """Summarise a text change as +/- line counts and the first changed lines"""
+    diff = list(
+        difflib.unified_diff(old.splitlines(), new.splitlines(), name, name, lineterm="", n=0)
+    )
+    added = sum(1 for line in diff if line.startswith("+") and not line.startswith("+++"))
+    removed = sum(1 for line in diff if line.startswith("-") and not line.startswith("---"))
+    body = [line for line in diff[2:] if not line.startswith("@@")][:MAX_DIFF_LINES]
+    return "\n".join([f"+{added} -{removed} lines", *body])
+
+
+class FileIndex:
+    """Tracks watched files by size, mtime and content hash
+
+    A file whose size and mtime are unchanged is never re-read. Otherwise it
+    is hashed in chunks; identical bytes are reported as a metadata-only
+    change, and a new path whose digest matches a vanished one is reported
+    as a rename. Small UTF-8 files keep a text snapshot (bounded LRU) so
+    modifications come with a diff summary.
+
+    ``scan`` does blocking I/O and is meant to run in a worker thread.
+    """
+
+    def __init__(self):
+        self.states: dict[Path, FileState] = {}
+        self._snapshots: OrderedDict[Path, str] = OrderedDict()
+
+    def _remember_text(self, path: Path, text: str | None) -> None:
+        if text is None:
+            self._snapshots.pop(path, None)
+            return
+        self._snapshots[path] = text
+        self._snapshots.move_to_end(path)
+        while len(self._snapshots) > MAX_SNAPSHOTS:
+            self._snapshots.popitem(last=False)
+
+    def _walk(self, directories: list[Path]) -> dict[Path, os.stat_result]:
+        found: dict[Path, os.stat_result] = {}
+        for directory in directories:
+            if not directory.exists():
+                logger.warning(f"Watch directory does not exist: {directory}")
+                continue
+            for path in directory.rglob("*"):
+                try:
+                    stat = path.stat()
+                except OSError as e:
+                    logger.error(f"Error accessing file {path}: {e}")
+                    continue
+                if path.is_file():
+                    found[path] = stat
+        return found
+
+    def scan(self, directories: list[Path]) -> list[FileChange]:
+        """Compare the directories against the index and return classified changes"""
+        found = self._walk(directories)
+        changes: list[FileChange] = []
+        added: list[tuple[Path, FileState]] = []
+
+        for path, stat in found.items():
+            known = self.states.get(path)
+            if known and known.size == stat.st_size and known.mtime_ns == stat.st_mtime_ns:
+                continue
+            try:
+                state = FileState(stat.st_size, stat.st_mtime_ns, hash_file(path))
+            except OSError as e:
+                logger.error(f"Error hashing file {path}: {e}")
+                continue
+
+            if known is None:
+                added.append((path, state))
+                continue
+
+            self.states[path] = state
+            if state.digest == known.digest:
+                changes.append(FileChange(path, ChangeKind.METADATA, state))
+                continue
+
+            text = _read_text(path, state.size)
+            old_text = self._snapshots.get(path)
+            diff = diff_summary(old_text, text, path.name) if text and old_text else None
+            self._remember_text(path, text)
+            changes.append(FileChange(path, ChangeKind.MODIFIED, state, diff=diff))
+
+        vanished = {
+            (state.size, state.digest): path
+            for path, state in self.states.items()
+            if path not in found
+        }
+        for path, state in added:
+            self.states[path] = state
+            previous = vanished.pop((state.size, state.digest), None)
+            if previous is not None:
+                self._remember_text(path, self._snapshots.pop(previous, None))
+                changes.append(FileChange(path, ChangeKind.RENAMED, state, previous_path=previous))
+            else:
+                self._remember_text(path, _read_text(path, state.size))
+                changes.append(FileChange(path, ChangeKind.NEW, state))
+
+        for path in [p for p in self.states if p not in found]:
+            del self.states[path]
+            self._snapshots.pop(path, None)
+
+        return changes
@@ -3,73 +3,78 @@
 import asyncio
 import logging
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING
 
-from ..config import get_settings
+from .base_watcher import BaseWatcher
+from .file_index import FileChange, FileIndex
+from .runtime import PollPolicy
+
+if TYPE_CHECKING:
+    from ..extraction import ExtractionPipeline
 
 logger = logging.getLogger(__name__)
 
 
-class FileSystemWatcher:
+class FileSystemWatcher(BaseWatcher):
     """Monitors filesystem for file changes"""
 
-    def __init__(self):
-        self.settings = get_settings()
+    source = "filesystem"
+
+    def __init__(self, extraction: "ExtractionPipeline | None" = None):
+        super().__init__()
+        self.extraction = extraction
         self.watch_dirs = [
             Path(d.strip()) for d in self.settings.watch_directories.split(",")
         ]
         self.monitor_interval = self.settings.file_monitor_interval
-        self.is_running = False
-        self.file_cache: dict[str, float] = {}
-
-    async def scan_directories(self) -> list[Path]:
-        """Scan watched directories for new files"""
-        new_files = []
-        for watch_dir in self.watch_dirs:
-            if not watch_dir.exists():
-                logger.warning(f"Watch directory does not exist: {watch_dir}")
-                continue
+        self.file_index = FileIndex()
 
-            for file_path in watch_dir.rglob("*"):
-                if file_path.is_file():
-                    try:
-                        mtime = file_path.stat().st_mtime
-                        if (
-                            str(file_path) not in self.file_cache
-                            or self.file_cache[str(file_path)] != mtime
-                        ):
-                            self.file_cache[str(file_path)] = mtime
-                            new_files.append(file_path)
-                    except OSError as e:
-                        logger.error(f"Error accessing file {file_path}: {e}")
+    async def scan_directories(self) -> list[FileChange]:
+        """Scan watched directories and return files whose content changed"""
+        # Stat calls and hashing are blocking, so keep them off the event loop
+        changes = await asyncio.to_thread(self.file_index.scan, self.watch_dirs)
+        for change in changes:
+            if not change.is_content_change:
+                logger.debug(f"Ignoring {change.kind.value} change: {change.path}")
+        return [change for change in changes if change.is_content_change]
 
-        return new_files
-
-    async def process_file(self, file_path: Path) -> None:
+    async def process_file(self, change: FileChange) -> None:
         """Process a single file event"""
-        logger.info(f"Processing file: {file_path}")
-        # TODO: Route file event to agent for processing
+        logger.info(f"Processing file ({change.kind.value}): {change.path}")
+        data = {
+            "path": str(change.path),
+            "change": change.kind.value,
+            "size": change.state.size,
+            "digest": change.state.digest,
+        }
+        if change.diff:
+            data["diff"] = change.diff
+        if self.extraction is not None:
+            try:
+                # Events carry metadata and an excerpt; the full text stays in the cache
+                document = await self.extraction.extract(change.path, change.state.digest)
+                data["document"] = document.metadata()
+                data["excerpt"] = self.extraction.excerpt(document.digest)
+            except OSError as e:
+                logger.error(f"Error extracting text from {change.path}: {e}")
+        # The mtime tells a file that returns to earlier content (A -> B -> A) apart
+        # from a redelivery, which rescans to the same digest and mtime
+        state = change.state
+        await self.emit(
+            "file_change", data, event_id=f"fs-{change.path}@{state.digest}:{state.mtime_ns}"
+        )
 
-    async def watch(self) -> None:
-        """Start watching filesystem"""
-        self.is_running = True
+    def poll_policy(self) -> PollPolicy:
+        return PollPolicy.from_base(self.monitor_interval)
+
+    async def start(self) -> None:
         logger.info(
             f"Filesystem watcher started (monitoring: {self.settings.watch_directories})"
         )
 
-        while self.is_running:
-            try:
-                new_files = await self.scan_directories()
-                for file_path in new_files:
-                    await self.process_file(file_path)
-
-                await asyncio.sleep(self.monitor_interval)
-
-            except Exception as e:
-                logger.error(f"Error in filesystem watcher: {e}")
-                await asyncio.sleep(self.monitor_interval)
-
-    def stop(self) -> None:
-        """Stop watching filesystem"""
-        self.is_running = False
-        logger.info("Filesystem watcher stopped")
+    async def poll(self) -> int:
+        """Scan once and report every file whose content changed"""
+        changes = await self.scan_directories()
+        for change in changes:
+            await self.process_file(change)
+        return len(changes)
@@ -1,26 +1,27 @@
 """Gmail event watcher using Google API"""
 
-import asyncio
 import logging
 from datetime import datetime
 from typing import Any, Optional
 
 import aiohttp
 
-from ..config import get_settings
+from .base_watcher import BaseWatcher
+from .runtime import PollPolicy
 
 logger = logging.getLogger(__name__)
 
 
-class GmailWatcher:
+class GmailWatcher(BaseWatcher):
     """Monitors Gmail inbox for new messages"""
 
+    source = "gmail"
+
     def __init__(self):
-        self.settings = get_settings()
+        super().__init__()
         self.credentials_path = self.settings.gmail_credentials_json
         self.token_path = self.settings.gmail_token_json
         self.check_interval = self.settings.gmail_check_interval
-        self.is_running = False
         self.last_check = datetime.now()
 
     async def authenticate(self) -> bool:
@@ -38,27 +39,19 @@ class GmailWatcher:
     async def process_email(self, email: dict[str, Any]) -> None:
         """Process a single email event"""
         logger.info(f"Processing email: {email.get('subject', 'No subject')}")
-        # TODO: Route email to agent for processing
-
-    async def watch(self) -> None:
-        """Start watching Gmail inbox"""
-        self.is_running = True
-        logger.info(f"Gmail watcher started (check interval: {self.check_interval}s)")
+        message_id = email.get("id")
+        await self.emit("email", email, event_id=f"gmail-{message_id}" if message_id else None)
 
-        while self.is_running:
-            try:
-                emails = await self.fetch_new_emails()
-                for email in emails:
-                    await self.process_email(email)
+    def poll_policy(self) -> PollPolicy:
+        return PollPolicy.from_base(self.check_interval)
 
-                self.last_check = datetime.now()
-                await asyncio.sleep(self.check_interval)
-
-            except Exception as e:
-                logger.error(f"Error in Gmail watcher: {e}")
-                await asyncio.sleep(self.check_interval)
+    async def start(self) -> None:
+        logger.info(f"Gmail watcher started (check interval: {self.check_interval}s)")
 
-    def stop(self) -> None:
-        """Stop watching Gmail"""
-        self.is_running = False
-        logger.info("Gmail watcher stopped")
+    async def poll(self) -> int:
+        """Fetch and report new emails; Gmail push notifications can call ``request_poll``"""
+        emails = await self.fetch_new_emails()
+        for email in emails:
+            await self.process_email(email)
+        self.last_check = datetime.now()
+        return len(emails)
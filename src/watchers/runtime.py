@@ -0,0 +1,230 @@
+"""Single-loop scheduler that runs every watcher"""
+
+import asyncio
+import heapq
+import logging
+import random
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from ..config import get_settings
+
+if TYPE_CHECKING:
+    from .base_watcher import BaseWatcher
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PollPolicy:
+    """How often a watcher polls and how it reacts to activity and errors"""
+
+    base_interval: float
+    min_interval: float
+    max_interval: float
+    tighten: float = 0.5  # interval multiplier after a poll that found something
+    relax: float = 1.25  # interval multiplier after an idle poll
+    max_backoff: float = 1800.0
+
+    @classmethod
+    def from_base(cls, base_interval: float) -> "PollPolicy":
+        """Adapt around a watcher's configured interval using the global watcher settings"""
+        settings = get_settings()
+        fastest = base_interval / settings.watcher_speedup
+        return cls(
+            base_interval=base_interval,
+            min_interval=max(settings.watcher_min_interval, fastest),
+            max_interval=base_interval * settings.watcher_slowdown,
+            max_backoff=settings.watcher_max_backoff,
+        )
+
+
+@dataclass
+class WatchState:
+    """Scheduling state and counters for one watcher"""
+
+    policy: PollPolicy
+    interval: float
+    errors: int = 0
+    generation: int = 0
+    polling: bool = False
+    poll_again: bool = False
+    polls: int = 0
+    found: int = 0
+    failures: int = 0
+    wakeups: int = 0
+    last_delay: float = 0.0
+
+
+@dataclass(order=True)
+class _Timer:
+    due: float
+    seq: int
+    watcher: Any = field(compare=False)
+    generation: int = field(compare=False)
+
+
+class WatcherRuntime:
+    """Runs all watchers from one timer heap instead of one sleeping loop each
+
+    After every poll the watcher is rescheduled: sooner if the poll found
+    something, later if it was idle, and with jittered exponential backoff
+    if it raised. Watchers with push delivery poll at their maximum interval
+    as a safety net, and ``wake`` (or ``BaseWatcher.request_poll``) moves a
+    watcher's next poll to now.
+    """
+
+    def __init__(self, watchers: list["BaseWatcher"] | None = None):
+        self.states: dict["BaseWatcher", WatchState] = {}
+        self._heap: list[_Timer] = []
+        self._seq = 0
+        self._wake_event = asyncio.Event()
+        self._polls: set[asyncio.Task] = set()
+        self.is_running = False
+        for watcher in watchers or []:
+            self.add(watcher)
+
+    def add(self, watcher: "BaseWatcher") -> None:
+        """Register a watcher; it is first polled when the runtime starts"""
+        policy = watcher.poll_policy()
+        self.states[watcher] = WatchState(policy=policy, interval=policy.base_interval)
+        watcher.runtime = self
+        if self.is_running:
+            self._schedule(watcher, 0.0)
+
+    def _now(self) -> float:
+        return asyncio.get_running_loop().time()
+
+    def _schedule(self, watcher: "BaseWatcher", delay: float) -> None:
+        state = self.states[watcher]
+        state.generation += 1
+        state.last_delay = delay
+        self._seq += 1
+        timer = _Timer(self._now() + delay, self._seq, watcher, state.generation)
+        heapq.heappush(self._heap, timer)
+        if self._heap[0] is timer:
+            self._wake_event.set()
+
+    def wake(self, watcher: "BaseWatcher") -> None:
+        """Poll a watcher as soon as possible (push notification hook)"""
+        state = self.states.get(watcher)
+        if state is None or not self.is_running:
+            return
+        state.wakeups += 1
+        if state.polling:
+            state.poll_again = True
+        else:
+            self._schedule(watcher, 0.0)
+
+    def refresh(self) -> None:
+        """Re-evaluate the schedule, e.g. after a watcher stopped"""
+        self._wake_event.set()
+
+    def _next_delay(self, watcher: "BaseWatcher", state: WatchState, found: int | None) -> float:
+        policy = state.policy
+        if found is None:
+            # Exponential backoff with full jitter between half and all of the delay
+            delay = min(policy.max_backoff, policy.base_interval * 2 ** (state.errors - 1))
+            return delay * random.uniform(0.5, 1.0)
+        if watcher.push_enabled:
+            state.interval = policy.max_interval
+        elif found:
+            state.interval = max(policy.min_interval, state.interval * policy.tighten)
+        else:
+            state.interval = min(policy.max_interval, state.interval * policy.relax)
+        return state.interval
+
+    async def _poll(self, watcher: "BaseWatcher") -> None:
+        state = self.states[watcher]
+        state.polling = True
+        found: int | None = None
+        try:
+            found = await watcher.poll()
+            state.errors = 0
+            state.polls += 1
+            state.found += found
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            state.errors += 1
+            state.failures += 1
+            logger.error(f"Error in {watcher.source} watcher: {e}")
+        finally:
+            state.polling = False
+
+        if not (self.is_running and watcher.is_running):
+            return
+        if state.poll_again:
+            state.poll_again = False
+            self._schedule(watcher, 0.0)
+            return
+        delay = self._next_delay(watcher, state, found)
+        if found is None:
+            logger.warning(f"{watcher.source} watcher backing off for {delay:.1f}s")
+        self._schedule(watcher, delay)
+
+    async def run(self) -> None:
+        """Start every watcher and dispatch polls until stopped"""
+        self.is_running = True
+        for watcher in list(self.states):
+            watcher.is_running = True
+            try:
+                await watcher.start()
+            except Exception as e:
+                logger.error(f"Failed to start {watcher.source} watcher: {e}")
+            self._schedule(watcher, 0.0)
+        logger.info(f"Watcher runtime started ({len(self.states)} watchers)")
+
+        try:
+            while self.is_running and any(w.is_running for w in self.states):
+                if not self._heap:
+                    await self._wake_event.wait()
+                    self._wake_event.clear()
+                    continue
+
+                timer = self._heap[0]
+                delay = timer.due - self._now()
+                if delay > 0:
+                    self._wake_event.clear()
+                    try:
+                        await asyncio.wait_for(self._wake_event.wait(), delay)
+                    except TimeoutError:
+                        pass
+                    continue
+
+                heapq.heappop(self._heap)
+                watcher = timer.watcher
+                state = self.states.get(watcher)
+                # Skip timers superseded by a later reschedule or for stopped watchers
+                if state is None or timer.generation != state.generation:
+                    continue
+                if not watcher.is_running or state.polling:
+                    continue
+                task = asyncio.create_task(self._poll(watcher))
+                self._polls.add(task)
+                task.add_done_callback(self._polls.discard)
+        finally:
+            for task in list(self._polls):
+                task.cancel()
+
+    def stop(self) -> None:
+        """Stop scheduling polls and stop every watcher"""
+        self.is_running = False
+        self._wake_event.set()
+        for watcher in self.states:
+            if watcher.is_running:
+                watcher.stop()
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Per-watcher counters for logging and benchmarks"""
+        return {
+            watcher.source: {
+                "interval": round(state.interval, 2),
+                "next_delay": round(state.last_delay, 2),
+                "polls": state.polls,
+                "found": state.found,
+                "failures": state.failures,
+                "wakeups": state.wakeups,
+            }
+            for watcher, state in self.states.items()
+        }
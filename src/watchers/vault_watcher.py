@@ -0,0 +1,48 @@
+"""Keeps the vault document cache in sync with edits made outside the agent"""
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING
+
+from .base_watcher import BaseWatcher
+from .runtime import PollPolicy
+
+if TYPE_CHECKING:
+    from ..agents.vault_cache import VaultCache
+
+logger = logging.getLogger(__name__)
+
+
+class VaultWatcher(BaseWatcher):
+    """Revalidates cached vault notes so cache lookups can skip ``stat`` calls
+
+    Only notes and listings already in the cache are checked, so a poll costs
+    one ``stat`` per cached entry regardless of vault size. The agent also
+    invalidates entries directly for its own writes and for filesystem events.
+    """
+
+    source = "vault"
+
+    def __init__(self, cache: "VaultCache"):
+        super().__init__()
+        self.cache = cache
+        self.check_interval = self.settings.vault_check_interval
+
+    def poll_policy(self) -> PollPolicy:
+        return PollPolicy.from_base(self.check_interval)
+
+    async def start(self) -> None:
+        self.cache.watched = True
+        logger.info(f"Vault watcher started (check interval: {self.check_interval}s)")
+
+    async def poll(self) -> int:
+        """Drop cache entries whose file or directory changed on disk"""
+        stale = await asyncio.to_thread(self.cache.revalidate)
+        if stale:
+            logger.debug(f"Vault cache: {stale} stale entries dropped")
+        return stale
+
+    def stop(self) -> None:
+        # Without revalidation, lookups must go back to checking mtimes
+        self.cache.watched = False
+        super().stop()
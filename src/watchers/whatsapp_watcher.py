@@ -1,23 +1,25 @@
 """WhatsApp event watcher"""
 
-import asyncio
 import logging
 from datetime import datetime
 from typing import Any
 
-from ..config import get_settings
+from .base_watcher import BaseWatcher
+from .runtime import PollPolicy
 
 logger = logging.getLogger(__name__)
 
 
-class WhatsAppWatcher:
+class WhatsAppWatcher(BaseWatcher):
     """Monitors WhatsApp for new messages"""
 
+    source = "whatsapp"
+
     def __init__(self):
-        self.settings = get_settings()
+        super().__init__()
         self.api_key = self.settings.whatsapp_api_key
         self.webhook_url = self.settings.whatsapp_webhook_url
-        self.is_running = False
+        self.check_interval = self.settings.whatsapp_check_interval
         self.last_check = datetime.now()
 
     async def setup_webhook(self) -> bool:
@@ -29,22 +31,21 @@ class WhatsAppWatcher:
     async def handle_message(self, message: dict[str, Any]) -> None:
         """Handle incoming WhatsApp message"""
         logger.info(f"Handling WhatsApp message from {message.get('from')}")
-        # TODO: Route message to agent for processing
-
-    async def watch(self) -> None:
-        """Start watching WhatsApp"""
-        self.is_running = True
-        logger.info("WhatsApp watcher started")
-
-        while self.is_running:
-            try:
-                # TODO: Implement WhatsApp polling or webhook listening
-                await asyncio.sleep(60)
-            except Exception as e:
-                logger.error(f"Error in WhatsApp watcher: {e}")
-                await asyncio.sleep(60)
-
-    def stop(self) -> None:
-        """Stop watching WhatsApp"""
-        self.is_running = False
-        logger.info("WhatsApp watcher stopped")
+        message_id = message.get("id")
+        await self.emit(
+            "whatsapp_message", message, event_id=f"whatsapp-{message_id}" if message_id else None
+        )
+
+    def poll_policy(self) -> PollPolicy:
+        return PollPolicy.from_base(self.check_interval)
+
+    async def start(self) -> None:
+        """Prefer webhook delivery; polling becomes a safety net once it is up"""
+        self.push_enabled = await self.setup_webhook()
+        mode = "webhook" if self.push_enabled else f"polling every {self.check_interval}s"
+        logger.info(f"WhatsApp watcher started ({mode})")
+
+    async def poll(self) -> int:
+        """Poll WhatsApp for messages the webhook may have missed"""
+        # TODO: Implement WhatsApp polling
+        return 0
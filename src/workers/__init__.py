@@ -0,0 +1,7 @@
+"""Multi-process worker mode"""
+
+from .rate_limit import SharedRateLimiter
+from .supervisor import Supervisor
+from .worker import run_worker
+
+__all__ = ["Supervisor", "SharedRateLimiter", "run_worker"]
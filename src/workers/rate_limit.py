@@ -0,0 +1,59 @@
+"""Rate limiter whose budget is shared by every worker process"""
+
+import asyncio
+import logging
+import multiprocessing
+import time
+from typing import Any
+
+from ..agents.core_agent import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+MINUTE = 60.0
+DAY = 86400.0
+
+
+class SharedRateLimiter(RateLimiter):
+    """Sliding-window limiter backed by shared memory
+
+    Request timestamps live in a ring buffer sized to the daily quota, so
+    every process sees the same minute and day windows. The lock is only
+    held while the buffer is inspected; waiting happens outside it.
+    """
+
+    def __init__(
+        self,
+        max_requests_per_minute: int = 10,
+        max_requests_per_day: int = 1000,
+        context: Any | None = None,
+    ):
+        super().__init__(max_requests_per_minute, max_requests_per_day)
+        context = context or multiprocessing.get_context()
+        self._lock = context.Lock()
+        self._stamps = context.Array("d", max_requests_per_day, lock=False)
+        self._head = context.Value("i", 0, lock=False)
+
+    def _reserve(self) -> float:
+        """Record a request and return 0, or return how long to wait first"""
+        with self._lock:
+            now = time.time()
+            window = [t for t in self._stamps if t > now - DAY]
+            in_minute = sorted(t for t in window if t > now - MINUTE)
+            if len(in_minute) >= self.max_per_minute:
+                return in_minute[len(in_minute) - self.max_per_minute] + MINUTE - now + 0.01
+            if len(window) >= self.max_per_day:
+                return min(window) + DAY - now + 0.01
+            # The slot at head is the oldest entry, which is already outside the day window
+            self._stamps[self._head.value] = now
+            self._head.value = (self._head.value + 1) % len(self._stamps)
+            return 0.0
+
+    async def acquire(self):
+        """Wait if necessary to respect the shared rate limits"""
+        while True:
+            wait_time = self._reserve()
+            if wait_time <= 0:
+                return
+            logger.warning(f"Shared rate limit: waiting {wait_time:.1f}s for quota")
+            await asyncio.sleep(wait_time)
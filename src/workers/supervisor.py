@@ -0,0 +1,317 @@
+"""Supervisor that owns the watchers and fans events out to worker processes"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import queue
+import time
+from collections import deque
+from typing import Any, Callable
+
+from ..agents.approvals import ApprovalQueue, create_action_servers
+from ..agents.core_agent import RATE_LIMIT_PER_DAY, RATE_LIMIT_PER_MINUTE, RateLimiter
+from ..agents.load_shedder import LoadShedder
+from ..agents.memory_store import MemoryStore
+from ..config import get_data_path, get_settings
+from ..events import EventConsumer, open_event_log
+from ..extraction import ExtractionPipeline
+from ..watchers import (
+    ApprovalWatcher,
+    FileSystemWatcher,
+    GmailWatcher,
+    WatcherRuntime,
+    WhatsAppWatcher,
+)
+from .rate_limit import SharedRateLimiter
+from .worker import DEFERRED, DONE, READY, run_worker
+
+logger = logging.getLogger(__name__)
+
+CRASH_LOOP_WINDOW = 10.0  # seconds; dying sooner than this counts as a crash loop
+MAX_RESTART_BACKOFF = 60.0  # seconds
+
+
+class WorkerHandle:
+    """Book-keeping for one worker process"""
+
+    def __init__(self, worker_id: int):
+        self.worker_id = worker_id
+        self.process: Any = None
+        self.tasks: Any = None
+        self.in_flight: dict[int, dict[str, Any]] = {}
+        self.ready = False
+        self.restarts = 0
+        self.started_at = 0.0
+        self.restart_at = 0.0
+        self.backoff = 0.0
+
+
+class Supervisor:
+    """Runs the watchers and event log in this process and the agent in N workers
+
+    Each worker has its own task queue so the supervisor always knows which
+    events a worker holds. When a worker dies those events are put back at
+    the front of the pending queue and the worker is restarted with a fresh
+    queue. All workers draw from one shared rate-limit budget.
+    """
+
+    def __init__(
+        self,
+        num_workers: int | None = None,
+        max_in_flight: int = 2,
+        client_factory: Callable[[], Any] | None = None,
+        agent_options: dict[str, Any] | None = None,
+        rate_limiter: RateLimiter | None = None,
+    ):
+        self.settings = get_settings()
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.max_in_flight = max_in_flight
+        self.client_factory = client_factory
+        self.agent_options = agent_options or {}
+
+        self._context = multiprocessing.get_context("spawn")
+        self.rate_limiter = rate_limiter or SharedRateLimiter(
+            max_requests_per_minute=RATE_LIMIT_PER_MINUTE,
+            max_requests_per_day=RATE_LIMIT_PER_DAY,
+            context=self._context,
+        )
+        self.results = self._context.Queue()
+        self.workers = [WorkerHandle(i) for i in range(self.num_workers)]
+
+        self.event_log = open_event_log()
+        self.event_consumer = EventConsumer(self.event_log, "agent")
+        self.pending: deque[tuple[int, dict[str, Any]]] = deque()
+        self.submitted_at: dict[int, float] = {}
+        self.latencies: deque[float] = deque(maxlen=10_000)
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._all_ready = asyncio.Event()
+
+        # Documents are extracted here; workers read the text back from the shared cache
+        self.extraction = ExtractionPipeline()
+        self.gmail_watcher = GmailWatcher()
+        self.whatsapp_watcher = WhatsAppWatcher()
+        self.fs_watcher = FileSystemWatcher(self.extraction)
+        for watcher in (self.gmail_watcher, self.whatsapp_watcher, self.fs_watcher):
+            watcher.on_event = self.submit_event
+        # Workers park sensitive actions; decisions are picked up and executed here
+        self.memory = MemoryStore(get_data_path() / "memory.db")
+        self.approvals = ApprovalQueue(self.memory)
+        self.load_shedder = LoadShedder(self.memory)
+        self._last_deferred = 0.0
+        self.mcp_servers = create_action_servers(self.approvals, self.extraction)
+        self.approval_watcher = ApprovalWatcher(self.approvals)
+        self.watcher_runtime = WatcherRuntime(
+            [self.gmail_watcher, self.whatsapp_watcher, self.fs_watcher, self.approval_watcher]
+        )
+
+        self.is_running = False
+        self._tasks: list[asyncio.Task] = []
+
+    def _spawn(self, handle: WorkerHandle) -> None:
+        handle.ready = False
+        handle.tasks = self._context.Queue()
+        handle.process = self._context.Process(
+            target=run_worker,
+            args=(
+                handle.worker_id,
+                handle.tasks,
+                self.results,
+                self.rate_limiter,
+                self.client_factory,
+                self.agent_options,
+                logging.getLogger().getEffectiveLevel(),
+            ),
+            name=f"bronze-worker-{handle.worker_id}",
+            daemon=True,
+        )
+        handle.process.start()
+        handle.started_at = time.monotonic()
+        logger.info(f"Worker {handle.worker_id} started (pid {handle.process.pid})")
+
+    async def submit_event(self, event: dict[str, Any]) -> int:
+        """Durably log an event and queue it for the next free worker"""
+        offset = self.event_log.append(event)
+        self._enqueue(offset, event)
+        return offset
+
+    def _enqueue(self, offset: int, event: dict[str, Any]) -> None:
+        if self.event_consumer.is_duplicate(event):
+            logger.info(f"Skipping already processed event at offset {offset}")
+            self.event_consumer.ack(offset)
+            return
+        self.submitted_at.setdefault(offset, time.perf_counter())
+        self.pending.append((offset, event))
+        self._idle.clear()
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Hand pending events to the least loaded live workers"""
+        while self.pending:
+            live = [
+                w
+                for w in self.workers
+                if w.process is not None
+                and w.process.is_alive()
+                and len(w.in_flight) < self.max_in_flight
+            ]
+            if not live:
+                return
+            handle = min(live, key=lambda w: len(w.in_flight))
+            offset, event = self.pending.popleft()
+            handle.in_flight[offset] = event
+            # Workers shed load based on how much is still waiting here
+            handle.tasks.put((offset, event, len(self.pending)))
+
+    def _handle_result(self, message: tuple[str, int, int]) -> None:
+        status, worker_id, offset = message
+        if status == READY:
+            self.workers[worker_id].ready = True
+            if all(w.ready for w in self.workers):
+                self._all_ready.set()
+            return
+        event = self.workers[worker_id].in_flight.pop(offset, None)
+        if event is None:
+            # Late result from a worker whose events were already requeued
+            return
+        started = self.submitted_at.pop(offset, None)
+        if started is not None:
+            self.latencies.append(time.perf_counter() - started)
+        if status == DONE:
+            self.event_consumer.ack(offset, event)
+        elif status == DEFERRED:
+            # Not marked as processed: it runs when re-queued from Needs_Action
+            self.event_consumer.ack(offset)
+            self._last_deferred = time.monotonic()
+        else:
+            logger.error(f"Event at offset {offset} failed in worker {worker_id}")
+            if self.event_consumer.fail(offset, event, f"failed in worker {worker_id}"):
+                self.pending.append((offset, event))
+        self._dispatch()
+        if not self.pending and not any(w.in_flight for w in self.workers):
+            self._idle.set()
+
+    def _next_result(self) -> tuple[str, int, int] | None:
+        try:
+            return self.results.get(timeout=0.5)
+        except queue.Empty:
+            return None
+
+    async def _collect_results(self) -> None:
+        while self.is_running:
+            message = await asyncio.to_thread(self._next_result)
+            if message is not None:
+                self._handle_result(message)
+
+    def _check_workers(self) -> None:
+        """Restart dead workers and requeue whatever they were holding"""
+        now = time.monotonic()
+        for handle in self.workers:
+            if handle.process is None:
+                if now >= handle.restart_at:
+                    handle.restarts += 1
+                    self._spawn(handle)
+                continue
+            if handle.process.is_alive():
+                continue
+
+            lost = sorted(handle.in_flight.items())
+            handle.in_flight.clear()
+            self.pending.extendleft(reversed(lost))
+            # Back off workers that die right after starting instead of spinning
+            if now - handle.started_at < CRASH_LOOP_WINDOW:
+                handle.backoff = min(max(1.0, handle.backoff * 2), MAX_RESTART_BACKOFF)
+            else:
+                handle.backoff = 0.0
+            logger.error(
+                f"Worker {handle.worker_id} exited with code {handle.process.exitcode}; "
+                f"requeueing {len(lost)} event(s), restarting in {handle.backoff:.0f}s"
+            )
+            handle.process = None
+            handle.ready = False
+            handle.restart_at = now + handle.backoff
+            if handle.backoff == 0:
+                handle.restarts += 1
+                self._spawn(handle)
+        self._dispatch()
+
+    async def _monitor(self) -> None:
+        while self.is_running:
+            await asyncio.sleep(1)
+            self._check_workers()
+            await asyncio.to_thread(self.event_log.sync)
+            await asyncio.to_thread(self.event_consumer.trim_log)
+            await self._resume_deferred()
+
+    async def _resume_deferred(self) -> None:
+        """Re-queue deferred events while every worker is idle"""
+        if self.pending or any(w.in_flight for w in self.workers):
+            return
+        # Workers' circuits are not visible here; give a recent deferral time to clear
+        if time.monotonic() - self._last_deferred < self.settings.circuit_reset_timeout:
+            return
+        for event in self.load_shedder.take_deferred(self.settings.shed_resume_batch):
+            await self.submit_event(event)
+
+    async def start(self) -> None:
+        """Spawn workers, redeliver unacknowledged events and start background tasks"""
+        self.is_running = True
+        for handle in self.workers:
+            self._spawn(handle)
+        for offset, event in self.event_consumer.pending():
+            self._enqueue(offset, event)
+        self._tasks = [
+            asyncio.create_task(self._collect_results()),
+            asyncio.create_task(self._monitor()),
+        ]
+        logger.info(f"Supervisor started with {self.num_workers} worker(s)")
+
+    async def wait_ready(self) -> None:
+        """Wait until every worker has built its agent"""
+        await self._all_ready.wait()
+
+    async def drain(self) -> None:
+        """Wait until every submitted event has been handled"""
+        await self._idle.wait()
+
+    async def run(self) -> None:
+        """Run the watchers and dispatch their events until stopped"""
+        await self.start()
+        for server in self.mcp_servers.values():
+            await server.start()
+        watcher_task = asyncio.create_task(self.watcher_runtime.run())
+        try:
+            while self.is_running:
+                await asyncio.sleep(1)
+        except KeyboardInterrupt:
+            logger.info("Supervisor interrupted by user")
+        finally:
+            watcher_task.cancel()
+            await self.shutdown()
+
+    async def shutdown(self, timeout: float = 10.0) -> None:
+        """Stop watchers and workers and persist the consumer checkpoint"""
+        self.is_running = False
+        self.watcher_runtime.stop()
+        for handle in self.workers:
+            if handle.process is not None and handle.process.is_alive():
+                handle.tasks.put(None)
+        for handle in self.workers:
+            if handle.process is not None:
+                await asyncio.to_thread(handle.process.join, timeout)
+                if handle.process.is_alive():
+                    handle.process.terminate()
+        for task in self._tasks:
+            task.cancel()
+        for server in self.mcp_servers.values():
+            server.stop()
+        self.extraction.close()
+        self.event_consumer.close()
+        self.event_log.close()
+        self.memory.close()
+        logger.info("Supervisor stopped")
+
+    def stop(self) -> None:
+        """Ask the run loop to exit"""
+        self.is_running = False
@@ -0,0 +1,81 @@
+"""Worker process entry point"""
+
+import asyncio
+import logging
+import queue
+from typing import Any, Callable
+
+from ..agents.core_agent import CoreAgent
+from ..agents.load_shedder import ShedDecision
+
+logger = logging.getLogger(__name__)
+
+# Messages sent back to the supervisor on the shared result queue
+READY = "ready"
+DONE = "done"
+DEFERRED = "deferred"
+FAILED = "failed"
+
+
+def run_worker(
+    worker_id: int,
+    tasks: Any,
+    results: Any,
+    rate_limiter: Any,
+    client_factory: Callable[[], Any] | None = None,
+    agent_options: dict[str, Any] | None = None,
+    log_level: int = logging.INFO,
+) -> None:
+    """Process events handed out by the supervisor until a ``None`` sentinel arrives"""
+    logging.basicConfig(
+        level=log_level,
+        format=f"%(asctime)s - worker-{worker_id} - %(name)s - %(levelname)s - %(message)s",
+    )
+    try:
+        asyncio.run(
+            _work(worker_id, tasks, results, rate_limiter, client_factory, agent_options or {})
+        )
+    except KeyboardInterrupt:
+        pass
+
+
+async def _work(
+    worker_id: int,
+    tasks: Any,
+    results: Any,
+    rate_limiter: Any,
+    client_factory: Callable[[], Any] | None,
+    agent_options: dict[str, Any],
+) -> None:
+    client = client_factory() if client_factory else None
+    agent = CoreAgent(client=client, rate_limiter=rate_limiter, durable_events=False)
+    for name, value in agent_options.items():
+        setattr(agent, name, value)
+    logger.info(f"Worker {worker_id} ready")
+    results.put((READY, worker_id, -1))
+
+    async def handle(offset: int, event: dict[str, Any], backlog: int) -> None:
+        try:
+            decision = await agent.handle_event(event, backlog)
+            status = DEFERRED if decision is ShedDecision.DEFER else DONE
+            results.put((status, worker_id, offset))
+        except Exception as e:
+            logger.error(f"Worker {worker_id} failed event at offset {offset}: {e}")
+            results.put((FAILED, worker_id, offset))
+
+    # The supervisor caps how many events a worker holds, so each gets its own task
+    running: set[asyncio.Task] = set()
+    while True:
+        try:
+            item = await asyncio.to_thread(tasks.get, True, 1.0)
+        except queue.Empty:
+            continue
+        if item is None:
+            break
+        task = asyncio.create_task(handle(*item))
+        running.add(task)
+        task.add_done_callback(running.discard)
+
+    if running:
+        await asyncio.gather(*running)
+    logger.info(f"Worker {worker_id} exiting")
@@ -0,0 +1,43 @@
+"""Shared fixtures: every test gets its own vault and data directory"""
+
+from typing import Any
+
+import pytest
+
+from src.agents import vault_cache
+from src.benchmarks.stub_model import StubClient
+
+
+@pytest.fixture(autouse=True)
+def isolated_paths(tmp_path, monkeypatch):
+    """Point settings at temporary vault, data and watch directories"""
+    vault = tmp_path / "vault"
+    data = tmp_path / "data"
+    inbox = tmp_path / "inbox"
+    for path in (vault, data, inbox):
+        path.mkdir()
+    monkeypatch.setenv("VAULT_PATH", str(vault))
+    monkeypatch.setenv("DATA_PATH", str(data))
+    monkeypatch.setenv("WATCH_DIRECTORIES", str(inbox))
+    monkeypatch.setenv("GEMINI_API_KEY", "test")
+    monkeypatch.setenv("GEMINI_CONTEXT_CACHE", "false")
+    # The shared vault cache would otherwise carry notes across tests
+    monkeypatch.setattr(vault_cache, "_shared_cache", None)
+    return tmp_path
+
+
+class RecordingClient(StubClient):
+    """Stub model that keeps every prompt it was sent"""
+
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.prompts: list[str] = []
+
+    def _generate(self, model: str, contents: Any):
+        self.prompts.append(str(contents))
+        return super()._generate(model, contents)
+
+
+@pytest.fixture
+def recording_client() -> RecordingClient:
+    return RecordingClient()
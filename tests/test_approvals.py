@@ -0,0 +1,118 @@
+"""Parking, resolving and expiring sensitive actions in ApprovalQueue"""
+
+import time
+
+import pytest
+
+from src.agents.approvals import APPROVALS_NAMESPACE, ApprovalQueue
+from src.agents.memory_store import MemoryStore
+from src.mcp_servers import MCPServer
+
+
+class RecordingServer(MCPServer):
+    sensitive_actions = frozenset({"send_email"})
+
+    def __init__(self):
+        super().__init__("email")
+        self.requests: list[dict] = []
+
+    async def initialize(self) -> bool:
+        return True
+
+    async def handle_request(self, request: dict) -> dict:
+        self.requests.append(request)
+        return {"status": "success"}
+
+
+@pytest.fixture
+def memory(isolated_paths):
+    memory = MemoryStore(isolated_paths / "memory.db")
+    yield memory
+    memory.close()
+
+
+@pytest.fixture
+def server(memory):
+    server = RecordingServer()
+    ApprovalQueue(memory).register(server)
+    return server
+
+
+async def _park(server: RecordingServer) -> dict:
+    return await server.submit({"action": "send_email", "to": "a@example.com", "body": "hi"})
+
+
+def _archived(queue: ApprovalQueue, approval_id: str) -> str:
+    [note] = queue.done_path.glob(f"*/APPROVAL_{approval_id}.md")
+    return note.read_text()
+
+
+async def test_park_returns_at_once_and_survives_a_restart(server, memory):
+    queue = server.approvals
+    result = await _park(server)
+
+    assert result["status"] == "pending_approval"
+    assert server.requests == []
+    note = queue.pending_path / f"APPROVAL_{result['approval_id']}.md"
+    assert "action: send_email" in note.read_text()
+    assert memory.get(APPROVALS_NAMESPACE, result["approval_id"])["server"] == "email"
+    assert ApprovalQueue(memory).load() == 1
+
+
+async def test_approved_action_runs_once(server):
+    queue = server.approvals
+    result = await _park(server)
+    note = queue.pending_path / f"APPROVAL_{result['approval_id']}.md"
+
+    note.rename(queue.approved_path / note.name)
+
+    assert await queue.check_decisions() == 1
+    assert server.requests == [{"action": "send_email", "to": "a@example.com", "body": "hi"}]
+    assert queue.pending() == {}
+    assert not (queue.approved_path / note.name).exists()
+    assert "status: executed" in _archived(queue, result["approval_id"])
+    assert await queue.check_decisions() == 0
+    assert len(server.requests) == 1
+
+
+async def test_approval_waits_while_the_breaker_is_open(server):
+    queue = server.approvals
+    result = await _park(server)
+    note = queue.pending_path / f"APPROVAL_{result['approval_id']}.md"
+    note.rename(queue.approved_path / note.name)
+    server.breaker.trip(60)
+
+    assert await queue.check_decisions() == 0
+    assert server.requests == []
+
+    server.breaker.record_success()
+    assert await queue.check_decisions() == 1
+    assert len(server.requests) == 1
+
+
+async def test_rejected_action_never_runs(server):
+    queue = server.approvals
+    result = await _park(server)
+    note = queue.pending_path / f"APPROVAL_{result['approval_id']}.md"
+
+    note.rename(queue.rejected_path / note.name)
+
+    assert await queue.check_decisions() == 1
+    assert server.requests == []
+    assert queue.pending() == {}
+    assert "status: rejected" in _archived(queue, result["approval_id"])
+
+
+async def test_unanswered_approval_expires(server, monkeypatch):
+    queue = server.approvals
+    result = await _park(server)
+    assert await queue.check_decisions() == 0
+
+    later = time.time() + queue.settings.approval_timeout_hours * 3600 + 1
+    monkeypatch.setattr("src.agents.approvals.time.time", lambda: later)
+
+    assert await queue.check_decisions() == 1
+    assert server.requests == []
+    assert queue.pending() == {}
+    assert not any(queue.pending_path.iterdir())
+    assert "status: expired" in _archived(queue, result["approval_id"])
@@ -0,0 +1,90 @@
+"""Benchmark statistics, report comparison and the stub model"""
+
+import pytest
+from google.api_core import exceptions
+
+from src.benchmarks.runner import compare_reports, percentile
+from src.benchmarks.stub_model import StubClient
+
+
+def test_percentile_uses_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile(values, 100) == 100.0
+    assert percentile(values, 0) == 1.0
+    assert percentile([7.0], 99) == 7.0
+    assert percentile([], 50) == 0.0
+
+
+def _report(**results) -> dict:
+    return {"results": results}
+
+
+def test_compare_reports_flags_regressions_in_either_direction():
+    baseline = _report(
+        events_per_sec=100.0,
+        latency_ms={"p50": 10.0, "p99": 40.0},
+        llm={"calls_per_event": 1.0},
+    )
+    candidate = _report(
+        events_per_sec=85.0,
+        latency_ms={"p50": 10.5, "p99": 30.0},
+        llm={"calls_per_event": 1.2},
+    )
+
+    rows = {row["metric"]: row for row in compare_reports(baseline, candidate)}
+
+    assert rows["events_per_sec"]["change_pct"] == -15.0
+    assert rows["events_per_sec"]["regression"]
+    assert not rows["latency_ms.p50"]["regression"]
+    assert not rows["latency_ms.p99"]["regression"]  # faster is never a regression
+    assert rows["llm.calls_per_event"]["regression"]
+    assert "memory.growth_kb" not in rows  # missing from both reports
+
+
+def test_compare_reports_threshold_and_zero_baseline():
+    baseline = _report(events_per_sec=100.0, memory={"growth_kb": 0.0})
+    candidate = _report(events_per_sec=95.0, memory={"growth_kb": 50.0})
+
+    rows = {row["metric"]: row for row in compare_reports(baseline, candidate, threshold=4)}
+
+    assert rows["events_per_sec"]["regression"]
+    assert rows["memory.growth_kb"]["change_pct"] == 0.0
+
+
+def _outcomes(client: StubClient, calls: int) -> list[str]:
+    outcomes = []
+    for i in range(calls):
+        try:
+            outcomes.append(client.models.generate_content("model", f"prompt {i}").text)
+        except exceptions.ResourceExhausted:
+            outcomes.append("exhausted")
+        except RuntimeError:
+            outcomes.append("error")
+    return outcomes
+
+
+def test_stub_client_is_deterministic_per_seed():
+    settings = {"error_rate": 0.2, "exhausted_rate": 0.2, "completion_rate": 0.5}
+
+    first = _outcomes(StubClient(seed=3, **settings), 50)
+
+    assert first == _outcomes(StubClient(seed=3, **settings), 50)
+    assert first != _outcomes(StubClient(seed=4, **settings), 50)
+    assert {"exhausted", "error"} <= set(first)
+
+
+def test_stub_client_counts_calls_and_prompt_chars():
+    client = StubClient(error_rate=1.0)
+
+    with pytest.raises(RuntimeError):
+        client.models.generate_content("model", "12345")
+
+    assert client.stats.as_dict() == {
+        "calls": 1,
+        "errors": 1,
+        "resource_exhausted": 0,
+        "prompt_chars": 5,
+    }
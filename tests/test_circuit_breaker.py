@@ -0,0 +1,116 @@
+"""Circuit breaker state transitions"""
+
+import pytest
+
+from src import circuit_breaker
+from src.circuit_breaker import CircuitBreaker, CircuitOpenError, CircuitState
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker("llm", failure_threshold=3, reset_timeout=10, max_reset_timeout=30)
+
+
+def test_opens_after_consecutive_failures(breaker):
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state is CircuitState.CLOSED
+
+    breaker.record_failure()
+
+    assert breaker.state is CircuitState.OPEN
+    assert not breaker.available
+    with pytest.raises(CircuitOpenError) as error:
+        breaker.before_call()
+    assert error.value.retry_after == 10
+    assert breaker.snapshot()["rejected"] == 1
+
+
+def test_half_open_lets_one_probe_through(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now += 10
+
+    assert breaker.state is CircuitState.HALF_OPEN
+    breaker.before_call()
+    assert not breaker.available
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record_success()
+
+    assert breaker.state is CircuitState.CLOSED
+    assert breaker.available
+
+
+def test_failed_probe_reopens_for_longer_up_to_the_cap(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure()
+    for expected in (20, 30, 30):
+        clock.now += breaker.retry_after
+        breaker.before_call()
+        breaker.record_failure()
+        assert breaker.state is CircuitState.OPEN
+        assert breaker.retry_after == expected
+    assert breaker.opened_count == 4
+
+    clock.now += breaker.retry_after
+    breaker.before_call()
+    breaker.record_success()
+    for _ in range(3):
+        breaker.record_failure()
+    assert breaker.retry_after == 10  # success resets the backoff
+
+
+def test_abandoned_probe_does_not_wedge_the_breaker(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now += 10
+    breaker.before_call()  # the probe is cancelled and never reports back
+
+    clock.now += 11
+
+    assert breaker.available
+    breaker.before_call()
+
+
+def test_trip_opens_for_at_least_the_given_duration(breaker, clock):
+    breaker.trip(45)
+
+    assert breaker.state is CircuitState.OPEN
+    assert breaker.retry_after == 45
+    clock.now += 45
+    assert breaker.state is CircuitState.HALF_OPEN
+
+
+async def test_call_counts_failing_results(breaker):
+    async def backend(status):
+        return {"status": status}
+
+    def failed(result):
+        return result["status"] == "error"
+
+    for _ in range(3):
+        await breaker.call(backend, "error", is_failure=failed)
+
+    assert breaker.state is CircuitState.OPEN
+    with pytest.raises(CircuitOpenError):
+        await breaker.call(backend, "ok", is_failure=failed)
@@ -0,0 +1,63 @@
+"""Chunk-by-chunk document summaries in CoreAgent"""
+
+import pytest
+
+from src.agents.core_agent import CoreAgent, RateLimiter
+
+
+@pytest.fixture
+def agent(recording_client, monkeypatch):
+    monkeypatch.setenv("EXTRACTION_CHUNK_CHARS", "100")
+    monkeypatch.setenv("EXTRACTION_EXCERPT_CHARS", "50")
+    agent = CoreAgent(
+        client=recording_client,
+        rate_limiter=RateLimiter(max_requests_per_minute=3, max_requests_per_day=1000),
+        durable_events=False,
+    )
+    agent.retry_base_delay = agent.loop_delay = agent.error_delay = 0
+    yield agent
+    agent.stop()
+
+
+async def _document(agent, tmp_path, paragraphs: int):
+    path = tmp_path / "inbox" / "notes.txt"
+    path.write_text("\n\n".join(f"Paragraph {i} " + "x" * 70 for i in range(paragraphs)))
+    return path, await agent.extraction.extract(path)
+
+
+async def test_summary_calls_stay_within_a_minute_of_quota(agent, recording_client, tmp_path):
+    _, document = await _document(agent, tmp_path, paragraphs=6)
+    assert document.chunks == 6
+
+    summary = await agent.summarize_document(document.digest, "notes.txt")
+
+    # Three calls a minute: two for the summary, one left for the task
+    assert len(recording_client.prompts) == 2
+    assert all(len(prompt) < 1000 for prompt in recording_client.prompts)
+    assert "Parts 3-6 were not summarised" in summary
+    assert await agent.summarize_document(document.digest, "notes.txt") == summary
+    assert len(recording_client.prompts) == 2
+
+
+async def test_failed_summary_falls_back_to_excerpt(agent, recording_client, tmp_path):
+    path, document = await _document(agent, tmp_path, paragraphs=1)
+    recording_client.error_rate = 1.0
+    agent.rate_limiter = RateLimiter(max_requests_per_minute=1000, max_requests_per_day=1000)
+    agent.llm_breaker.failure_threshold = 1000
+    event = {
+        "id": "fs-1",
+        "source": "filesystem",
+        "type": "file_change",
+        "timestamp": "2026-01-01T00:00:00",
+        "data": {
+            "path": str(path),
+            "digest": document.digest,
+            "document": document.metadata(),
+            "excerpt": agent.extraction.excerpt(document.digest),
+        },
+    }
+
+    await agent.process_event(event)
+
+    assert "'excerpt': 'Paragraph 0" in recording_client.prompts[-1]
+    assert agent.extraction.get(document.digest).summary is None
@@ -0,0 +1,163 @@
+"""Durable event log recovery, segments and consumer checkpoints"""
+
+import json
+
+from src.events import EventConsumer, EventLog, IdempotencyStore
+
+
+def _offsets(log: EventLog, from_offset: int = 0) -> list[int]:
+    return [offset for offset, _ in log.read(from_offset)]
+
+
+def test_torn_tail_is_truncated_on_reopen(tmp_path):
+    log = EventLog(tmp_path)
+    for i in range(3):
+        log.append({"id": i})
+    log.close()
+    segment = next(tmp_path.glob("*.log"))
+    intact = segment.stat().st_size
+    with open(segment, "ab") as f:
+        f.write(b"\x00\x00\x00\x00\x00\x00\x00\x03\x00\x00")  # half a header
+
+    log = EventLog(tmp_path)
+
+    assert segment.stat().st_size == intact
+    assert log.next_offset == 3
+    assert log.append({"id": 3}) == 3
+    assert [event["id"] for _, event in log.read()] == [0, 1, 2, 3]
+    log.close()
+
+
+def test_corrupt_record_ends_the_segment(tmp_path):
+    log = EventLog(tmp_path)
+    log.append({"id": 0})
+    log.append({"id": 1})
+    log.close()
+    segment = next(tmp_path.glob("*.log"))
+    data = bytearray(segment.read_bytes())
+    data[-2] ^= 0xFF  # flip a payload byte of the last record so its CRC fails
+    segment.write_bytes(bytes(data))
+
+    log = EventLog(tmp_path)
+
+    assert _offsets(log) == [0]
+    assert log.append({"id": "again"}) == 1
+    log.close()
+
+
+def test_segments_roll_and_read_across_them(tmp_path):
+    log = EventLog(tmp_path, segment_bytes=64)
+    for i in range(10):
+        log.append({"id": i, "pad": "x" * 20})
+
+    assert len(list(tmp_path.glob("*.log"))) > 1
+    assert _offsets(log) == list(range(10))
+    assert _offsets(log, 7) == [7, 8, 9]
+    log.close()
+
+    reopened = EventLog(tmp_path, segment_bytes=64)
+    assert reopened.next_offset == 10
+    assert _offsets(reopened, 4) == list(range(4, 10))
+    reopened.close()
+
+
+def test_delete_before_keeps_segments_with_live_records(tmp_path):
+    log = EventLog(tmp_path, segment_bytes=64)
+    for i in range(10):
+        log.append({"id": i, "pad": "x" * 20})
+    segments = sorted(int(path.stem) for path in tmp_path.glob("*.log"))
+    cutoff = segments[2] + 1
+
+    removed = log.delete_before(cutoff)
+
+    assert removed == 2
+    assert sorted(int(path.stem) for path in tmp_path.glob("*.log")) == segments[2:]
+    assert _offsets(log)[0] == segments[2]
+    assert log.delete_before(10**6) == len(segments) - 3  # the active segment always stays
+    log.close()
+
+
+def test_consumer_checkpoint_waits_for_contiguous_acks(tmp_path):
+    log = EventLog(tmp_path)
+    events = [{"id": f"e{i}"} for i in range(5)]
+    for event in events:
+        log.append(event)
+    consumer = EventConsumer(log, "agent", checkpoint_every=1)
+
+    consumer.ack(2, events[2])
+    consumer.ack(1, events[1])
+    assert consumer.committed == 0
+    consumer.ack(0, events[0])
+    assert consumer.committed == 3
+    consumer.ack(4, events[4])
+    consumer.close()
+
+    # Offset 3 was never acked: it is redelivered, and the acked 4 comes back as a duplicate
+    restarted = EventConsumer(log, "agent")
+    pending = list(restarted.pending())
+    assert [offset for offset, _ in pending] == [3, 4]
+    assert [restarted.is_duplicate(event) for _, event in pending] == [False, True]
+    restarted.close()
+    log.close()
+
+
+def test_failing_event_is_dead_lettered_and_the_checkpoint_moves_on(tmp_path):
+    log = EventLog(tmp_path)
+    events = [{"id": f"e{i}"} for i in range(3)]
+    for event in events:
+        log.append(event)
+    consumer = EventConsumer(log, "agent", checkpoint_every=1, max_attempts=3)
+    consumer.ack(0, events[0])
+
+    assert consumer.fail(1, events[1], "boom")
+    assert consumer.fail(1, events[1], "boom")
+    assert not consumer.dead_letter_path.exists()
+    assert not consumer.fail(1, events[1], "boom")
+    consumer.ack(2, events[2])
+
+    assert consumer.committed == 3
+    [record] = [json.loads(line) for line in consumer.dead_letter_path.read_text().splitlines()]
+    assert (record["offset"], record["attempts"], record["error"]) == (1, 3, "boom")
+    assert record["event"] == events[1]
+    assert not consumer.is_duplicate(events[1])
+    consumer.close()
+    log.close()
+
+
+def test_trim_log_keeps_uncheckpointed_and_recent_segments(tmp_path):
+    log = EventLog(tmp_path, segment_bytes=64)
+    for i in range(10):
+        log.append({"id": i, "pad": "x" * 20})
+    consumer = EventConsumer(log, "agent", checkpoint_every=100)
+    for offset in range(10):
+        consumer.ack(offset)
+    segments = len(list(tmp_path.glob("*.log")))
+
+    consumer.retention_seconds = 0
+    assert consumer.trim_log() == 0  # acknowledged but not yet checkpointed
+    consumer.checkpoint()
+    consumer.retention_seconds = 3600
+    assert consumer.trim_log() == 0  # checkpointed but still recent
+
+    consumer.retention_seconds = -1
+    assert consumer.trim_log() == segments - 1
+    assert [offset for offset, _ in consumer.pending()] == []
+    consumer.close()
+    log.close()
+
+
+def test_idempotency_keys_age_out_and_the_file_is_compacted(tmp_path):
+    path = tmp_path / "agent.keys"
+    store = IdempotencyStore(path, max_keys=3)
+    for i in range(7):
+        store.mark(f"k{i}")
+
+    assert len(store) == 3
+    assert not store.seen("k3")
+    assert [store.seen(f"k{i}") for i in range(4, 7)] == [True, True, True]
+    assert len(path.read_text().splitlines()) <= 6
+    store.close()
+
+    reopened = IdempotencyStore(path, max_keys=3)
+    assert [reopened.seen(f"k{i}") for i in range(7)] == [False] * 4 + [True] * 3
+    reopened.close()
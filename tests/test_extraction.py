@@ -0,0 +1,200 @@
+"""Extraction pipeline: chunking, caching and pool failure handling"""
+
+import asyncio
+import threading
+import time
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from src.extraction import (
+    ExtractedText,
+    ExtractionPipeline,
+    chunk_stream,
+    chunk_text,
+    extract_file,
+)
+from src.extraction import pipeline as pipeline_module
+from src.mcp_servers.file_mcp import FileMCPServer
+
+WORD_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+RELEASE = threading.Event()
+
+
+def slow_when_marked(path: str, max_chars: int) -> ExtractedText:
+    """Pool task for tests: hangs while ``<path>.hang`` exists"""
+    if Path(path + ".hang").exists():
+        time.sleep(60)
+    return ExtractedText("docx", f"text of {Path(path).name}")
+
+
+def blocks_until_released(path: str, max_chars: int) -> ExtractedText:
+    RELEASE.wait(10)
+    return ExtractedText("docx", "late")
+
+
+def missing_dependency(path: str, max_chars: int) -> ExtractedText:
+    return ExtractedText("pdf", "", note="install pypdf to extract PDF text", ok=False)
+
+
+def _docx(path: Path, paragraphs: list[str]) -> Path:
+    body = "".join(f"<w:p><w:r><w:t>{text}</w:t></w:r></w:p>" for text in paragraphs)
+    xml = f'<w:document xmlns:w="{WORD_NS}"><w:body>{body}</w:body></w:document>'
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("word/document.xml", xml)
+    return path
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    monkeypatch.setenv("EXTRACTION_WORKERS", "1")
+    monkeypatch.setenv("EXTRACTION_TIMEOUT", "3")
+    pipeline = ExtractionPipeline()
+    yield pipeline
+    pipeline.close()
+
+
+def test_chunk_text_prefers_paragraphs_and_respects_size():
+    text = "alpha\n\nbeta\n\n" + "g" * 25 + "\n\ndelta"
+    chunks = list(chunk_text(text, 12))
+
+    assert all(len(chunk) <= 12 for chunk in chunks)
+    assert chunks[0] == "alpha\n\nbeta"
+    assert "".join(chunks).replace("\n", "") == text.replace("\n", "")
+
+
+def test_chunk_text_of_empty_text_has_no_chunks():
+    assert list(chunk_text("", 100)) == []
+
+
+def test_chunk_stream_matches_chunk_text_however_the_text_is_split():
+    text = "alpha\n\nbeta\n" + "g" * 30 + "\nshort\n\n\n" + "h" * 13 + "\n\ndelta\n"
+    expected = list(chunk_text(text, 12))
+
+    for block in range(1, len(text) + 1):
+        blocks = [text[i : i + block] for i in range(0, len(text), block)]
+        assert list(chunk_stream(blocks, 12)) == expected
+
+
+def test_docx_paragraphs_are_extracted(tmp_path):
+    path = _docx(tmp_path / "memo.docx", ["Invoice 42", "Due Friday"])
+    result = extract_file(str(path), 1000)
+    assert result.ok and result.text == "Invoice 42\nDue Friday"
+
+
+def test_corrupt_file_is_a_failure(tmp_path):
+    path = tmp_path / "broken.docx"
+    path.write_bytes(b"not a zip")
+    result = extract_file(str(path), 1000)
+    assert not result.ok and result.note.startswith("extraction failed")
+
+
+async def test_successful_extraction_is_cached_by_content(pipeline, tmp_path):
+    first = _docx(tmp_path / "memo.docx", ["Invoice 42"])
+    document = await pipeline.extract(first)
+    renamed = first.rename(tmp_path / "renamed.docx")
+
+    again = await pipeline.extract(renamed)
+
+    assert again.digest == document.digest and again.path == str(renamed)
+    assert pipeline.stats == {"hits": 1, "extracted": 1, "failed": 0}
+    assert list(pipeline.iter_chunks(document.digest)) == ["Invoice 42"]
+
+
+async def test_missing_dependency_is_not_cached(pipeline, tmp_path, monkeypatch):
+    monkeypatch.setattr(pipeline_module, "extract_file", missing_dependency)
+    path = tmp_path / "report.pdf"
+    path.write_bytes(b"%PDF-1.4")
+
+    document = await pipeline.extract(path)
+
+    assert document.note == "install pypdf to extract PDF text"
+    assert pipeline.get(document.digest) is None
+
+
+async def test_timeout_is_retried_later_and_spares_other_tasks(pipeline, tmp_path, monkeypatch):
+    monkeypatch.setattr(pipeline_module, "extract_file", slow_when_marked)
+    slow = _docx(tmp_path / "slow.docx", ["slow"])
+    fast = _docx(tmp_path / "fast.docx", ["fast"])
+    marker = Path(str(slow) + ".hang")
+    marker.touch()
+
+    async def extract_fast_later():
+        # Queued behind the hanging task on the single pool process
+        await asyncio.sleep(0.5)
+        return await pipeline.extract(fast)
+
+    slow_doc, fast_doc = await asyncio.gather(pipeline.extract(slow), extract_fast_later())
+
+    assert slow_doc.note == "extraction timed out"
+    assert pipeline.get(slow_doc.digest) is None
+    # The queued task was resubmitted to the new pool instead of timing out too
+    assert fast_doc.note == "" and pipeline.read_text(fast_doc.digest) == "text of fast.docx"
+
+    marker.unlink()
+    skipped = await pipeline.extract(slow)
+    assert skipped.note == "extraction timed out recently"
+
+    monkeypatch.setattr(pipeline_module, "TIMEOUT_RETRY_AFTER", 0.0)
+    pipeline._timed_out.clear()
+    retried = await pipeline.extract(slow)
+    assert retried.note == "" and pipeline.get(retried.digest) is not None
+
+
+async def test_daemon_thread_fallback_still_times_out(pipeline, tmp_path, monkeypatch):
+    class DaemonProcess:
+        daemon = True
+
+    monkeypatch.setattr(pipeline_module.multiprocessing, "current_process", DaemonProcess)
+    monkeypatch.setattr(pipeline_module, "extract_file", blocks_until_released)
+    monkeypatch.setattr(pipeline.settings, "extraction_timeout", 0.2)
+    path = _docx(tmp_path / "stuck.docx", ["stuck"])
+
+    try:
+        document = await pipeline.extract(path)
+    finally:
+        RELEASE.set()
+
+    assert document.note == "extraction timed out"
+    assert pipeline.get(document.digest) is None
+    assert (await pipeline.extract(path)).note == "extraction timed out recently"
+
+
+async def test_cached_chunks_are_read_a_block_at_a_time(pipeline, tmp_path, monkeypatch):
+    pipeline.settings.extraction_chunk_chars = 40
+    paragraphs = [f"Paragraph {n} of the quarterly report" for n in range(50)]
+    document = await pipeline.extract(_docx(tmp_path / "report.docx", paragraphs))
+    reads = []
+    real_open = open
+
+    def recording_open(*args, **kwargs):
+        f = real_open(*args, **kwargs)
+        read = f.read
+        f.read = lambda size=-1: reads.append(size) or read(size)
+        return f
+
+    monkeypatch.setattr(pipeline_module, "open", recording_open, raising=False)
+    chunks = list(pipeline.iter_chunks(document.digest))
+
+    assert reads and all(0 < size <= 40 for size in reads)
+    assert len(chunks) == document.chunks > 1
+    assert chunks == list(chunk_text("\n".join(paragraphs), 40))
+    assert pipeline.read_chunk(document.digest, 1) == chunks[1]
+    assert pipeline.read_chunk(document.digest, document.chunks) is None
+
+
+async def test_mcp_read_returns_one_chunk_with_the_total(pipeline, tmp_path):
+    pipeline.settings.extraction_chunk_chars = 40
+    paragraphs = [f"Paragraph {n} of the quarterly report" for n in range(50)]
+    path = _docx(tmp_path / "report.docx", paragraphs)
+    server = FileMCPServer(extraction=pipeline)
+
+    first = await server.read_file(str(path))
+    second = await server.read_file(str(path), 1)
+    beyond = await server.read_file(str(path), first["total_chunks"])
+
+    assert first["chunk"] == 0 and first["total_chunks"] > 1
+    assert first["content"] == "Paragraph 0 of the quarterly report"
+    assert second["chunk"] == 1 and second["content"].startswith("Paragraph 1 ")
+    assert beyond["status"] == "error"
@@ -0,0 +1,83 @@
+"""Content-hash classification of filesystem changes"""
+
+import os
+
+import pytest
+
+from src.watchers import ChangeKind, FileIndex
+
+
+def _write(path, text: str, mtime_ns: int) -> None:
+    path.write_text(text)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def _kinds(changes) -> dict:
+    return {change.path.name: change.kind for change in changes}
+
+
+@pytest.fixture
+def watched(tmp_path):
+    directory = tmp_path / "watched"
+    directory.mkdir()
+    return directory
+
+
+def test_new_files_then_no_changes(watched):
+    index = FileIndex()
+    _write(watched / "a.txt", "alpha", 1_000_000_000)
+
+    assert _kinds(index.scan([watched])) == {"a.txt": ChangeKind.NEW}
+    assert index.scan([watched]) == []
+
+
+def test_touch_without_new_bytes_is_metadata_only(watched):
+    index = FileIndex()
+    path = watched / "a.txt"
+    _write(path, "alpha", 1_000_000_000)
+    index.scan([watched])
+
+    _write(path, "alpha", 2_000_000_000)
+    [change] = index.scan([watched])
+
+    assert change.kind is ChangeKind.METADATA
+    assert not change.is_content_change
+
+
+def test_modified_text_comes_with_a_diff_summary(watched):
+    index = FileIndex()
+    path = watched / "a.txt"
+    _write(path, "one\ntwo\n", 1_000_000_000)
+    index.scan([watched])
+
+    _write(path, "one\nthree\n", 2_000_000_000)
+    [change] = index.scan([watched])
+
+    assert change.kind is ChangeKind.MODIFIED
+    assert change.is_content_change
+    assert change.diff.splitlines()[0] == "+1 -1 lines"
+    assert "+three" in change.diff
+
+
+def test_moved_file_is_a_rename_and_forgets_the_old_path(watched):
+    index = FileIndex()
+    _write(watched / "old.txt", "same bytes", 1_000_000_000)
+    _write(watched / "other.txt", "unrelated", 1_000_000_000)
+    index.scan([watched])
+
+    os.rename(watched / "old.txt", watched / "new.txt")
+    [change] = index.scan([watched])
+
+    assert change.kind is ChangeKind.RENAMED
+    assert change.previous_path == watched / "old.txt"
+    assert set(index.states) == {watched / "new.txt", watched / "other.txt"}
+
+
+def test_new_copy_of_a_still_present_file_is_new(watched):
+    index = FileIndex()
+    _write(watched / "a.txt", "copied", 1_000_000_000)
+    index.scan([watched])
+
+    _write(watched / "b.txt", "copied", 2_000_000_000)
+
+    assert _kinds(index.scan([watched])) == {"b.txt": ChangeKind.NEW}
@@ -0,0 +1,43 @@
+"""Filesystem watcher events and their idempotency keys"""
+
+import os
+
+from src.events import idempotency_key
+from src.watchers import FileSystemWatcher
+
+
+async def _poll(watcher: FileSystemWatcher) -> list[dict]:
+    events: list[dict] = []
+
+    async def collect(event: dict) -> None:
+        events.append(event)
+
+    watcher.on_event = collect
+    await watcher.poll()
+    return events
+
+
+def _write(path, text: str, mtime_ns: int) -> None:
+    path.write_text(text)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+async def test_returning_to_earlier_content_is_a_new_event(isolated_paths):
+    path = isolated_paths / "inbox" / "todo.txt"
+    watcher = FileSystemWatcher()
+    keys = []
+    for step, text in enumerate(["A", "B", "A"], 1):
+        _write(path, text, step * 1_000_000_000)
+        [event] = await _poll(watcher)
+        keys.append(idempotency_key(event))
+
+    assert len(set(keys)) == 3
+
+
+async def test_rescan_after_restart_reuses_the_event_key(isolated_paths):
+    path = isolated_paths / "inbox" / "todo.txt"
+    _write(path, "A", 1_000_000_000)
+    [first] = await _poll(FileSystemWatcher())
+    [again] = await _poll(FileSystemWatcher())
+
+    assert idempotency_key(first) == idempotency_key(again)
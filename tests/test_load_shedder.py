@@ -0,0 +1,99 @@
+"""Load shedding decisions and deferral to Needs_Action"""
+
+import pytest
+
+from src.agents.load_shedder import DEFERRED_NAMESPACE, LoadShedder, ShedDecision
+from src.agents.memory_store import MemoryStore
+from src.circuit_breaker import CircuitState
+
+
+def _whatsapp(n: int, sender: str = "+15550100") -> dict:
+    return {
+        "id": f"whatsapp-{n}",
+        "source": "whatsapp",
+        "type": "message",
+        "timestamp": f"2026-01-01T00:00:0{n}",
+        "data": {"from": sender, "text": f"message {n}"},
+    }
+
+
+def _store(isolated_paths, refresh_interval: float = 1.0) -> MemoryStore:
+    return MemoryStore(isolated_paths / "data" / "memory.db", refresh_interval=refresh_interval)
+
+
+@pytest.fixture
+def shedder(isolated_paths):
+    memory = _store(isolated_paths)
+    yield LoadShedder(memory)
+    memory.close()
+
+
+@pytest.mark.parametrize(
+    ("source", "backlog", "state", "expected"),
+    [
+        ("gmail", 10_000, CircuitState.OPEN, ShedDecision.PROCESS),
+        ("whatsapp", 0, CircuitState.CLOSED, ShedDecision.PROCESS),
+        ("whatsapp", 0, CircuitState.HALF_OPEN, ShedDecision.PROCESS),
+        ("whatsapp", 0, CircuitState.OPEN, ShedDecision.DEFER),
+        ("whatsapp", 500, CircuitState.CLOSED, ShedDecision.DEFER),
+        ("filesystem", 0, CircuitState.HALF_OPEN, ShedDecision.DEFER),
+        ("filesystem", 50, CircuitState.CLOSED, ShedDecision.DEFER),
+        ("filesystem", 500, CircuitState.CLOSED, ShedDecision.DROP),
+    ],
+)
+def test_decisions_follow_priority_backlog_and_circuit(shedder, source, backlog, state, expected):
+    event = {"source": source, "type": "event", "data": {}}
+
+    assert shedder.decide(event, backlog, state) is expected
+
+
+def test_deferred_messages_from_one_sender_share_a_note(shedder):
+    note = shedder.defer(_whatsapp(1), reason="backlog")
+    shedder.defer(_whatsapp(2), reason="backlog")
+    shedder.defer(_whatsapp(2), reason="backlog")  # redelivered
+
+    assert note.name == "WHATSAPP_15550100.md"
+    assert "events: 2" in note.read_text()
+    assert shedder.pending_count() == 1
+    # The watcher's echo of the note is not a new task
+    echo = {"source": "filesystem", "type": "file_change", "data": {"path": str(note)}}
+    assert shedder.decide(echo, 0) is ShedDecision.SKIP
+
+
+def test_workers_deferring_into_one_note_keep_every_event(isolated_paths):
+    stores = [_store(isolated_paths, refresh_interval=3600) for _ in range(2)]
+    first, second = (LoadShedder(memory) for memory in stores)
+
+    first.defer(_whatsapp(1), reason="backlog")
+    second.defer(_whatsapp(2), reason="backlog")
+    first.defer(_whatsapp(3), reason="backlog")
+
+    events = second.take_deferred(10)
+    assert [event["id"] for event in events] == ["whatsapp-1", "whatsapp-2", "whatsapp-3"]
+    for memory in stores:
+        memory.close()
+
+
+def test_deferred_events_are_taken_once(isolated_paths):
+    stores = [_store(isolated_paths, refresh_interval=3600) for _ in range(2)]
+    first, second = (LoadShedder(memory) for memory in stores)
+    first.defer(_whatsapp(1, sender="+1"), reason="backlog")
+    first.defer(_whatsapp(2, sender="+2"), reason="backlog")
+    assert second.pending_count() == 2  # both listings are now cached
+
+    taken = first.take_deferred(1) + second.take_deferred(10) + first.take_deferred(10)
+
+    assert sorted(event["id"] for event in taken) == ["whatsapp-1", "whatsapp-2"]
+    assert not any(first.needs_action_path.iterdir())
+    for memory in stores:
+        memory.close()
+
+
+def test_deleting_a_note_discards_its_events(shedder):
+    shedder.defer(_whatsapp(1, sender="+1"), reason="backlog")
+    note = shedder.defer(_whatsapp(2, sender="+2"), reason="backlog")
+
+    note.unlink()
+
+    assert [event["id"] for event in shedder.take_deferred(10)] == ["whatsapp-1"]
+    assert shedder.memory.get_namespace(DEFERRED_NAMESPACE) == {}
@@ -0,0 +1,120 @@
+"""SQLite-backed MemoryStore caching, isolation and atomic updates"""
+
+import threading
+
+import pytest
+
+from src.agents.memory_store import MemoryStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = MemoryStore(tmp_path / "memory.db")
+    yield store
+    store.close()
+
+
+def test_mutating_a_read_does_not_change_the_store(store, tmp_path):
+    store.set("deferred", "note.md", {"events": [1]})
+
+    store.get("deferred", "note.md")["events"].append(2)
+    store.get_namespace("deferred")["note.md"]["events"].append(3)
+
+    assert store.get("deferred", "note.md") == {"events": [1]}
+    fresh = MemoryStore(tmp_path / "memory.db")
+    assert fresh.get("deferred", "note.md") == {"events": [1]}
+    fresh.close()
+
+
+def test_mutating_a_written_value_does_not_change_the_store(store):
+    value = {"events": [1]}
+    store.set("deferred", "note.md", value)
+    value["events"].append(2)
+
+    assert store.get("deferred", "note.md") == {"events": [1]}
+
+
+def test_writes_from_another_connection_are_seen_after_refresh(store, tmp_path):
+    assert store.get("facts", "owner") is None
+    other = MemoryStore(tmp_path / "memory.db")
+    other.set("facts", "owner", "Amara")
+    other.close()
+
+    store.refresh()
+
+    assert store.get("facts", "owner") == "Amara"
+    assert store.get_namespace("facts") == {"owner": "Amara"}
+
+
+def test_replace_drops_keys_not_given(store):
+    store.update("contexts", {"a": 1, "b": 2})
+    store.replace("contexts", {"c": 3})
+
+    assert store.get_namespace("contexts") == {"c": 3}
+    assert store.get("contexts", "a", "gone") == "gone"
+
+
+def _append(item):
+    def add(current):
+        return {**current, "items": [*current["items"], item]}
+
+    return add
+
+
+def test_modify_builds_on_writes_a_stale_cache_has_not_seen(store, tmp_path):
+    other = MemoryStore(tmp_path / "memory.db", refresh_interval=3600)
+    store.set("deferred", "note.md", {"items": []})
+    assert other.get("deferred", "note.md") == {"items": []}  # now cached in ``other``
+
+    store.modify("deferred", "note.md", _append(1))
+    other.modify("deferred", "note.md", _append(2))
+    store.modify("deferred", "note.md", _append(3))
+
+    assert store.get("deferred", "note.md") == {"items": [1, 2, 3]}
+    other.refresh()
+    assert other.get("deferred", "note.md") == {"items": [1, 2, 3]}
+    other.close()
+
+
+def test_concurrent_modify_from_two_connections_loses_nothing(store, tmp_path):
+    other = MemoryStore(tmp_path / "memory.db")
+    empty = {"items": []}
+
+    def append_many(target: MemoryStore, start: int) -> None:
+        for item in range(start, start + 50):
+            target.modify("deferred", "note.md", _append(item), default=empty)
+
+    threads = [
+        threading.Thread(target=append_many, args=(store, 0)),
+        threading.Thread(target=append_many, args=(other, 100)),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    store.refresh()
+    assert sorted(store.get("deferred", "note.md")["items"]) == [
+        *range(0, 50),
+        *range(100, 150),
+    ]
+    other.close()
+
+
+def test_modify_returning_none_deletes(store):
+    store.set("deferred", "note.md", {"items": [1]})
+
+    assert store.modify("deferred", "note.md", lambda current: None) is None
+
+    assert store.get("deferred", "note.md") is None
+
+
+def test_pop_hands_a_fact_to_one_caller_only(store, tmp_path):
+    other = MemoryStore(tmp_path / "memory.db", refresh_interval=3600)
+    store.set("deferred", "note.md", {"items": [1]})
+    assert other.get("deferred", "note.md") == {"items": [1]}
+
+    assert store.pop("deferred", "note.md") == {"items": [1]}
+    assert other.pop("deferred", "note.md", "gone") == "gone"
+    assert other.get("deferred", "note.md") is None
+    other.close()
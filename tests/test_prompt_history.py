@@ -0,0 +1,63 @@
+"""Conversation history handling between CoreAgent.think and PromptBuilder"""
+
+import pytest
+
+from src.agents.core_agent import CoreAgent
+from src.agents.prompt_builder import PromptBuilder
+from src.agents.skills_manager import SkillsManager
+from src.circuit_breaker import CircuitOpenError
+
+
+@pytest.fixture
+def agent(recording_client):
+    agent = CoreAgent(client=recording_client, durable_events=False)
+    agent.retry_base_delay = 0
+    yield agent
+    agent.stop()
+
+
+async def test_deferred_task_never_reaches_later_prompts(agent, recording_client):
+    await agent.think("first task")
+    agent.llm_breaker.trip(60)
+    with pytest.raises(CircuitOpenError):
+        await agent.think("DEFERRED TASK")
+    agent.llm_breaker.record_success()
+
+    await agent.think("NEW TASK")
+
+    prompt = recording_client.prompts[-1]
+    assert prompt.rstrip().endswith("user: NEW TASK")
+    assert "DEFERRED TASK" not in prompt
+    assert [m["content"] for m in agent.conversation_history if m["role"] == "user"] == [
+        "first task",
+        "NEW TASK",
+    ]
+
+
+async def test_failed_call_keeps_task_and_error_in_history(agent, recording_client):
+    recording_client.error_rate = 1.0
+    reply = await agent.think("flaky task")
+
+    assert reply.startswith("Error:")
+    assert agent.conversation_history == [
+        {"role": "user", "content": "flaky task"},
+        {"role": "assistant", "content": reply},
+    ]
+
+
+def test_replaced_last_entry_resets_cached_lines():
+    builder = PromptBuilder(SkillsManager())
+    history = [{"role": "user", "content": "a"}, {"role": "assistant", "content": "b"}]
+    assert builder.conversation(history) == "user: a\nassistant: b"
+
+    # Same length, different last entry: the cached line must not be reused
+    history[-1] = {"role": "assistant", "content": "c"}
+    assert builder.conversation(history) == "user: a\nassistant: c"
+
+
+def test_pending_turn_is_not_cached():
+    builder = PromptBuilder(SkillsManager())
+    history = [{"role": "user", "content": "a"}]
+    pending = {"role": "user", "content": "next"}
+    assert builder.conversation(history, pending) == "user: a\nuser: next"
+    assert builder.conversation(history) == "user: a"
@@ -0,0 +1,128 @@
+"""Static prompt prefix rebuilds and the context cache built from it"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.agents.core_agent import CoreAgent
+from src.agents.prompt_builder import MIN_CACHE_CHARS, PromptBuilder
+from src.agents.skills_manager import SkillsManager
+from src.agents.vault_cache import VaultCache
+
+
+def _builder() -> tuple[PromptBuilder, SkillsManager, VaultCache]:
+    cache = VaultCache()
+    skills = SkillsManager(cache)
+    return PromptBuilder(skills), skills, cache
+
+
+def test_new_skill_appears_in_prefix_while_watched():
+    builder, skills, cache = _builder()
+    (skills.skills_path / "alpha.md").write_text("# Alpha\n")
+    assert "Available skills: alpha" in builder.static_prefix()
+
+    cache.watched = True
+    (skills.skills_path / "beta.md").write_text("# Beta\n")
+    builder.static_prefix()
+    cache.revalidate()
+
+    assert "Available skills: alpha, beta" in builder.static_prefix()
+
+
+def test_handbook_edit_appears_in_prefix_while_watched():
+    builder, _, cache = _builder()
+    builder.handbook_path.write_text("Reply within a day.\n")
+    assert "Reply within a day." in builder.cacheable_prefix()
+
+    cache.watched = True
+    builder.handbook_path.write_text("Reply within the hour, always.\n")
+    builder.cacheable_prefix()
+    cache.revalidate()
+
+    assert "Reply within the hour, always." in builder.cacheable_prefix()
+
+
+class FakeCaches:
+    """The ``client.caches`` surface, recording what was uploaded"""
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.created: list[str] = []
+        self.deleted: list[str] = []
+
+    def create(self, model: str, config=None):
+        if self.fail:
+            raise RuntimeError("caching not supported for this model")
+        self.created.append(config.system_instruction)
+        return SimpleNamespace(name=f"cachedContents/{len(self.created)}")
+
+    def delete(self, name: str) -> None:
+        self.deleted.append(name)
+
+
+@pytest.fixture
+def caching(monkeypatch):
+    monkeypatch.setenv("GEMINI_CONTEXT_CACHE", "true")
+
+
+def _handbook(builder: PromptBuilder, rule: str) -> None:
+    builder.handbook_path.write_text(f"{rule}\n" + "Be kind to customers.\n" * 300)
+
+
+async def test_handbook_is_never_sent_inline(caching):
+    builder, _, _ = _builder()
+    builder.handbook_path.write_text("Reply within a day.\n")
+    client = SimpleNamespace(caches=FakeCaches())
+
+    assert await builder.context_cache(client, "model") is None
+    assert client.caches.created == []
+    assert "Reply within a day." not in builder.build([], {"role": "user", "content": "hi"})
+
+
+async def test_large_prefix_is_cached_once_and_replaced_on_change(caching):
+    builder, _, _ = _builder()
+    _handbook(builder, "Reply within a day.")
+    client = SimpleNamespace(caches=FakeCaches())
+
+    name = await builder.context_cache(client, "model")
+    assert name == "cachedContents/1"
+    assert await builder.context_cache(client, "model") == name
+    [uploaded] = client.caches.created
+    assert len(uploaded) >= MIN_CACHE_CHARS
+    assert uploaded.startswith(builder.static_prefix())
+    assert "Reply within a day." in uploaded
+
+    history = [{"role": "user", "content": "earlier"}, {"role": "assistant", "content": "ok"}]
+    suffix = builder.build_suffix(history, {"role": "user", "content": "now"})
+    assert suffix == "Conversation:\nuser: earlier\nassistant: ok\nuser: now"
+
+    _handbook(builder, "Reply within the hour.")
+    assert await builder.context_cache(client, "model") == "cachedContents/2"
+    assert "Reply within the hour." in client.caches.created[-1]
+    assert client.caches.deleted == ["cachedContents/1"]
+
+
+async def test_failed_cache_creation_is_not_retried_for_the_same_prefix(caching):
+    builder, _, _ = _builder()
+    _handbook(builder, "Reply within a day.")
+    caches = FakeCaches(fail=True)
+    client = SimpleNamespace(caches=caches)
+
+    assert await builder.context_cache(client, "model") is None
+    caches.fail = False
+    assert await builder.context_cache(client, "model") is None
+    assert caches.created == []
+
+
+async def test_agent_sends_only_the_conversation_when_cached(caching, recording_client):
+    recording_client.caches = FakeCaches()
+    agent = CoreAgent(client=recording_client, durable_events=False)
+    _handbook(agent.prompt_builder, "Reply within a day.")
+    try:
+        await agent.think("Sort the inbox")
+    finally:
+        agent.stop()
+
+    [prompt] = recording_client.prompts
+    assert prompt == "Conversation:\nuser: Sort the inbox"
+    assert len(recording_client.caches.created) == 1
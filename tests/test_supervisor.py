@@ -0,0 +1,104 @@
+"""Worker supervision, crash requeueing and the shared rate limit budget"""
+
+import asyncio
+import multiprocessing
+import os
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from src.agents.core_agent import CoreAgent
+from src.benchmarks.stub_model import StubClient
+from src.workers import Supervisor
+from src.workers.rate_limit import SharedRateLimiter
+
+SPAWN = multiprocessing.get_context("spawn")
+
+
+class CrashOnceClient(StubClient):
+    """Kills its worker process the first time it sees a prompt mentioning ``crash``"""
+
+    def _generate(self, model: str, contents: Any):
+        marker = Path(os.environ["CRASH_MARKER"])
+        if "crash" in str(contents) and not marker.exists():
+            marker.touch()
+            os._exit(1)
+        return super()._generate(model, contents)
+
+
+def crash_once_client() -> CrashOnceClient:
+    # Module level so spawned workers can import it
+    return CrashOnceClient()
+
+
+def reserve(limiter: SharedRateLimiter, count: int) -> None:
+    for _ in range(count):
+        assert limiter._reserve() == 0.0
+
+
+async def test_crashed_worker_is_restarted_and_its_events_requeued(isolated_paths, monkeypatch):
+    monkeypatch.setenv("CRASH_MARKER", str(isolated_paths / "crashed"))
+    supervisor = Supervisor(
+        num_workers=1,
+        client_factory=crash_once_client,
+        agent_options={"retry_base_delay": 0, "loop_delay": 0, "error_delay": 0},
+        rate_limiter=SharedRateLimiter(1000, 1000, context=SPAWN),
+    )
+    await supervisor.start()
+    try:
+        await asyncio.wait_for(supervisor.wait_ready(), 60)
+        for i, subject in enumerate(["hello", "please crash", "bye"]):
+            event = {"id": f"mail-{i}", "source": "gmail", "type": "email", "data": {"s": subject}}
+            await supervisor.submit_event(event)
+        await asyncio.wait_for(supervisor.drain(), 60)
+    finally:
+        await supervisor.shutdown()
+
+    assert (isolated_paths / "crashed").exists()
+    assert supervisor.workers[0].restarts == 1
+    assert supervisor.event_consumer.committed == 3
+    assert all(supervisor.event_consumer.is_duplicate({"id": f"mail-{i}"}) for i in range(3))
+
+
+def test_shared_rate_limit_counts_reservations_from_every_process():
+    limiter = SharedRateLimiter(max_requests_per_minute=3, max_requests_per_day=10, context=SPAWN)
+    worker = SPAWN.Process(target=reserve, args=(limiter, 2))
+    worker.start()
+    worker.join(60)
+    assert worker.exitcode == 0
+
+    # Two of this minute's three requests were made by the other process
+    reserve(limiter, 1)
+    assert limiter._reserve() > 0
+
+
+def test_shared_rate_limit_minute_and_day_windows(monkeypatch):
+    clock = {"now": 1_000_000.0}
+    monkeypatch.setattr("src.workers.rate_limit.time.time", lambda: clock["now"])
+    limiter = SharedRateLimiter(max_requests_per_minute=2, max_requests_per_day=3, context=SPAWN)
+
+    reserve(limiter, 2)
+    assert limiter._reserve() == pytest.approx(60.01)
+
+    clock["now"] += 30
+    assert limiter._reserve() == pytest.approx(30.01)
+    clock["now"] += 31
+    reserve(limiter, 1)
+    # The day budget is spent even though the minute window has room again
+    clock["now"] += 61
+    assert limiter._reserve() == pytest.approx(86400 - 122 + 0.01)
+    clock["now"] += 86400
+    reserve(limiter, 2)
+
+
+async def test_agent_without_event_log_refuses_log_paths(recording_client):
+    agent = CoreAgent(client=recording_client, durable_events=False)
+    try:
+        with pytest.raises(ValueError, match="durable_events"):
+            await agent.run()
+        with pytest.raises(ValueError, match="durable_events"):
+            await agent.submit_event({"source": "gmail", "type": "email", "data": {}})
+        assert await agent.resume_deferred() == 0
+    finally:
+        agent.stop()
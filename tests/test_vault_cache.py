@@ -0,0 +1,119 @@
+"""Vault note parsing and the byte-bounded note cache"""
+
+import os
+
+from src.agents.vault_cache import ENTRY_OVERHEAD, VaultCache, parse_document
+
+NOTE = """---
+type: approval_request
+amount: 120
+urgent: true
+ratio: 0.5
+owner: "Amara"
+tags: [billing, vendor]
+reviewers:
+  - ops
+  - finance
+expires: null
+---
+
+# Invoice 42
+
+**Vendor**: Acme Ltd
+- **Due**: 2026-02-01
+**Vendor**: ignored duplicate
+
+## Notes
+
+See [[Clients/Acme|Acme]] and [[Business_Goals#Q1]].
+
+```
+# Not a heading
+**Not**: a field
+```
+"""
+
+
+def test_frontmatter_fields_headings_and_links(tmp_path):
+    doc = parse_document(tmp_path / "invoice.md", NOTE, 1, len(NOTE))
+
+    assert doc.frontmatter == {
+        "type": "approval_request",
+        "amount": 120,
+        "urgent": True,
+        "ratio": 0.5,
+        "owner": "Amara",
+        "tags": ["billing", "vendor"],
+        "reviewers": ["ops", "finance"],
+        "expires": None,
+    }
+    assert doc.headings == [(1, "Invoice 42"), (2, "Notes")]
+    assert doc.title == "Invoice 42"
+    assert doc.fields == {"Vendor": "Acme Ltd", "Due": "2026-02-01"}
+    assert doc.links == ["Clients/Acme", "Business_Goals"]
+    assert doc.body.startswith("# Invoice 42")
+
+
+def test_unclosed_frontmatter_is_plain_text(tmp_path):
+    text = "---\nkey: value\n# Title\n"
+
+    doc = parse_document(tmp_path / "note.md", text, 1, len(text))
+
+    assert doc.frontmatter == {}
+    assert doc.body == text
+    assert doc.title == "Title"
+
+
+def _note(tmp_path, name: str, chars: int):
+    path = tmp_path / name
+    path.write_text("x" * chars)
+    return path
+
+
+def test_least_recently_used_notes_are_evicted_by_bytes(tmp_path):
+    entry = 2 * 1000 + ENTRY_OVERHEAD
+    cache = VaultCache(max_bytes=2 * entry + 10)
+    a, b, c = (_note(tmp_path, f"{name}.md", 1000) for name in "abc")
+
+    cache.get(a)
+    cache.get(b)
+    cache.get(a)  # b is now the least recently used
+    cache.get(c)
+
+    assert cache.stats()["entries"] == 2
+    assert cache.stats()["bytes"] == 2 * entry
+    assert cache.stats()["evictions"] == 1
+    hits = cache.hits
+    cache.get(a)
+    cache.get(c)
+    assert cache.hits == hits + 2
+    cache.get(b)
+    assert cache.misses == 4
+
+
+def test_notes_larger_than_the_budget_are_read_but_not_cached(tmp_path):
+    cache = VaultCache(max_bytes=1000)
+    big = _note(tmp_path, "big.md", 1000)
+
+    assert cache.get(big).text == "x" * 1000
+    assert cache.stats()["entries"] == 0
+    assert cache.stats()["bytes"] == 0
+
+
+def test_changed_note_is_reparsed_unless_watched(tmp_path):
+    cache = VaultCache()
+    path = tmp_path / "note.md"
+    path.write_text("# One\n")
+    os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+    assert cache.get(path).title == "One"
+
+    path.write_text("# Two\n")
+    os.utime(path, ns=(2_000_000_000, 2_000_000_000))
+    assert cache.get(path).title == "Two"
+
+    cache.watched = True
+    path.write_text("# Six\n")
+    os.utime(path, ns=(3_000_000_000, 3_000_000_000))
+    assert cache.get(path).title == "Two"
+    assert cache.revalidate() == 1
+    assert cache.get(path).title == "Six"
@@ -0,0 +1,110 @@
+"""Adaptive watcher scheduling in WatcherRuntime"""
+
+import asyncio
+
+import pytest
+
+from src.watchers import BaseWatcher, PollPolicy, WatcherRuntime
+
+
+class ScriptedWatcher(BaseWatcher):
+    """Returns (or raises) the scripted outcomes in order, then idles"""
+
+    source = "scripted"
+
+    def __init__(self, outcomes=(), base_interval: float = 10.0):
+        super().__init__()
+        self.outcomes = list(outcomes)
+        self.base_interval = base_interval
+        self.polled = 0
+
+    def poll_policy(self) -> PollPolicy:
+        return PollPolicy(
+            base_interval=self.base_interval,
+            min_interval=self.base_interval / 4,
+            max_interval=self.base_interval * 4,
+            max_backoff=self.base_interval * 5,
+        )
+
+    async def poll(self) -> int:
+        self.polled += 1
+        outcome = self.outcomes.pop(0) if self.outcomes else 0
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+@pytest.fixture
+def runtime():
+    runtime = WatcherRuntime()
+    runtime.is_running = True
+    return runtime
+
+
+def _add(runtime: WatcherRuntime, watcher: ScriptedWatcher) -> ScriptedWatcher:
+    runtime.add(watcher)
+    watcher.is_running = True
+    return watcher
+
+
+async def _delays(runtime: WatcherRuntime, watcher: ScriptedWatcher, polls: int) -> list:
+    delays = []
+    for _ in range(polls):
+        await runtime._poll(watcher)
+        delays.append(runtime.states[watcher].last_delay)
+    return delays
+
+
+async def test_busy_polls_tighten_and_idle_polls_relax(runtime):
+    watcher = _add(runtime, ScriptedWatcher([3, 2, 1, 5]))
+
+    assert await _delays(runtime, watcher, 4) == [5.0, 2.5, 2.5, 2.5]
+    assert await _delays(runtime, watcher, 3) == pytest.approx([3.125, 3.90625, 4.8828125])
+    await _delays(runtime, watcher, 20)
+    assert runtime.states[watcher].last_delay == 40.0
+
+
+async def test_errors_back_off_exponentially_with_jitter(runtime, monkeypatch):
+    monkeypatch.setattr("src.watchers.runtime.random.uniform", lambda low, high: high)
+    watcher = _add(runtime, ScriptedWatcher([RuntimeError("down")] * 4 + [1]))
+
+    assert await _delays(runtime, watcher, 5) == [10.0, 20.0, 40.0, 50.0, 5.0]
+    state = runtime.states[watcher]
+    assert (state.failures, state.errors, state.polls, state.found) == (4, 0, 1, 1)
+
+
+async def test_push_watchers_poll_at_the_maximum_interval(runtime):
+    watcher = _add(runtime, ScriptedWatcher([4]))
+    watcher.push_enabled = True
+
+    assert await _delays(runtime, watcher, 1) == [40.0]
+
+
+async def test_wake_during_a_poll_polls_again_immediately(runtime):
+    watcher = _add(runtime, ScriptedWatcher())
+    runtime.states[watcher].polling = True
+    runtime.wake(watcher)
+    runtime.states[watcher].polling = False
+
+    await runtime._poll(watcher)
+
+    assert runtime.states[watcher].last_delay == 0.0
+    assert runtime.states[watcher].wakeups == 1
+
+
+async def test_run_polls_on_wake_and_stops_cleanly():
+    watcher = ScriptedWatcher(base_interval=3600)
+    runtime = WatcherRuntime([watcher])
+    task = asyncio.create_task(runtime.run())
+    for _ in range(50):
+        await asyncio.sleep(0)
+    assert watcher.polled == 1
+
+    watcher.request_poll()
+    for _ in range(50):
+        await asyncio.sleep(0)
+    assert watcher.polled == 2
+
+    runtime.stop()
+    await asyncio.wait_for(task, 1)
+    assert not watcher.is_running